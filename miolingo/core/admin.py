@@ -1,12 +1,81 @@
+import io
+
+from django import forms
+from django.conf import settings
 from django.contrib import admin
-from django.urls import reverse
-from django.utils.html import format_html
+from django.contrib.auth import get_user_model
+from django.core.exceptions import PermissionDenied
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+from django.utils.decorators import method_decorator
+from django.utils.html import format_html, format_html_join
+from django.utils.text import slugify
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+
+from miolingo.core.models import (
+    Job,
+    Lesson,
+    Stat,
+    Training,
+    Translation,
+    TranslationMemory,
+)
+from miolingo.core.paginations import EstimatedCountPaginator
+from miolingo.core.sharding import get_user_shard, use_shard
+from miolingo.core.transfers import bulk_import_translations
+
+User = get_user_model()
+
+# Max trans listed per translation in the changelist.
+TRANS_LINK_LIMIT = 10
+
+
+# Search terms starting with it look up any part of the search fields.
+SUBSTRING_SEARCH_PREFIX = "*"
+
+
+class SlugSearchMixin:
+    """
+    Search translations by slug prefix (i.e: LIKE 'slug%'), which can use the
+    slug index, unlike the default icontains lookups. Those are still done on
+    the search fields for terms starting with "*" (e.g: "*pueblo" finds
+    "el pueblo"), scanning the whole table.
+    """
+
+    slug_search_field = "slug"
+    search_help_text = 'Start of the text, or "*" then any part of it (slower).'
 
-from miolingo.core.models import Lesson, Stat, Training, Translation
+    def get_search_results(self, request, queryset, search_term):
+        if search_term.startswith(SUBSTRING_SEARCH_PREFIX):
+            search_term = search_term.removeprefix(SUBSTRING_SEARCH_PREFIX)
+            return super().get_search_results(request, queryset, search_term)
+
+        slug = slugify(search_term)
+        if slug:
+            queryset = queryset.filter(
+                **{f"{self.slug_search_field}__startswith": slug}
+            )
+        return queryset, False
+
+
+class TranslationImportForm(forms.Form):
+    user = forms.ModelChoiceField(
+        queryset=User.objects.all(), to_field_name="username", widget=forms.TextInput
+    )
+    src = forms.ChoiceField(choices=settings.MIOLINGO_LANGUAGES)
+    tgt = forms.ChoiceField(choices=settings.MIOLINGO_LANGUAGES)
+    file = forms.FileField(help_text='Lines "source;translation", UTF-8 encoded.')
 
 
 @admin.register(Translation)
-class TranslationAdmin(admin.ModelAdmin):
+class TranslationAdmin(SlugSearchMixin, admin.ModelAdmin):
+    # Large tables: don't count rows exactly.
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
     list_display = [
         "id",
         "lang",
@@ -19,25 +88,105 @@ class TranslationAdmin(admin.ModelAdmin):
     list_filter = ["lang"]
     ordering = ["lang", "text"]
     search_fields = ["text"]
+    autocomplete_fields = ["trans"]
+    raw_id_fields = ["user"]
 
     def get_queryset(self, request):
         qs = super().get_queryset(request)
-        qs = qs.prefetch_related("trans")
+        # One more than listed, to know if there are more.
+        qs = qs.prefetch_related(
+            Prefetch(
+                "trans",
+                queryset=Translation.objects.order_by("pk")[: TRANS_LINK_LIMIT + 1],
+                to_attr="trans_preview",
+            )
+        )
         qs = qs.select_related("user")  # Just in case list_select_related fail
         return qs
 
     def trans_link(self, obj):
-        if obj.trans.all().count() > 0:
-            output = "<ul>"
-            for translation in obj.trans.all():
-                url = reverse("admin:core_translation_change", args=(translation.pk,))
-                output += f'<li><a href="{url}">{translation}</a></li>'
-            output += "</ul>"
+        translations = getattr(obj, "trans_preview", None)
+        if translations is None:  # pragma: no cover
+            translations = obj.trans.order_by("pk")[: TRANS_LINK_LIMIT + 1]
 
-            return format_html(output)
+        if translations:
+            items = format_html_join(
+                "",
+                '<li><a href="{}">{}</a></li>',
+                (
+                    (reverse("admin:core_translation_change", args=(t.pk,)), t)
+                    for t in translations[:TRANS_LINK_LIMIT]
+                ),
+            )
+            more = "<li>…</li>" if len(translations) > TRANS_LINK_LIMIT else ""
+            return format_html("<ul>{}{}</ul>", items, format_html(more))
 
     trans_link.short_description = "Trans"
 
+    def get_urls(self):
+        return [
+            path(
+                "import/",
+                # CSRF is checked once upload handlers are set.
+                self.admin_site.admin_view(csrf_exempt(self.import_view)),
+                name="core_translation_import",
+            ),
+        ] + super().get_urls()
+
+    def import_view(self, request):
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+        # Whatever its size, the upload is written to a temporary file, then
+        # read lazily instead of being loaded into memory.
+        request.upload_handlers = [TemporaryFileUploadHandler(request)]
+        return self._import_view(request)
+
+    @method_decorator(csrf_protect)
+    def _import_view(self, request):
+        form = TranslationImportForm(request.POST or None, request.FILES or None)
+        if form.is_valid():
+            return StreamingHttpResponse(
+                self.import_stream(**form.cleaned_data),
+                content_type="text/plain; charset=utf-8",
+            )
+
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": "Import translations",
+            "form": form,
+        }
+        return TemplateResponse(request, "admin/core/translation/import.html", context)
+
+    def import_stream(self, user, src, tgt, file):
+        """
+        Import the uploaded file by batches, yielding the progress then the
+        same report as the importtrans command.
+        """
+        db = get_user_shard(user)
+        csvfile = io.TextIOWrapper(file.file, encoding="utf-8", newline="")
+        batches = bulk_import_translations(user, csvfile, src, tgt)
+        report = {"created": 0, "duplicate": 0, "errors": []}
+        try:
+            while True:
+                # Per batch, as the stream may be consumed in other contexts.
+                with use_shard(db):
+                    counts = next(batches, None)
+                if counts is None:
+                    break
+                report = counts
+                yield f"{counts['lines']} lines done.\n"
+        except UnicodeDecodeError:
+            yield "The file is not UTF-8 encoded, import stopped.\n"
+        finally:
+            file.close()
+
+        for line, error in report["errors"]:
+            yield f"An error occured on line {line} with: {error}.\n"
+        if report["duplicate"]:
+            yield f"{report['duplicate']} duplicate(s) detected.\n"
+        yield f"{report['created']} translations are imported successfully.\n"
+
 
 @admin.register(Lesson)
 class LessonAdmin(admin.ModelAdmin):
@@ -53,10 +202,15 @@ class LessonAdmin(admin.ModelAdmin):
     list_filter = ["is_active"]
     ordering = ["-modified_at"]
     search_fields = ["name"]
+    autocomplete_fields = ["translations"]
+    raw_id_fields = ["user"]
 
 
 @admin.register(Training)
 class TrainingAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
     list_display = [
         "id",
         "lesson_link",
@@ -69,6 +223,8 @@ class TrainingAdmin(admin.ModelAdmin):
     list_select_related = ["lesson", "user"]
     ordering = ["-finished_at"]
     search_fields = ["lesson__name"]
+    autocomplete_fields = ["lesson"]
+    raw_id_fields = ["user"]
 
     def lesson_link(self, obj):
         url = reverse("admin:core_lesson_change", args=(obj.lesson.pk,))
@@ -78,7 +234,10 @@ class TrainingAdmin(admin.ModelAdmin):
 
 
 @admin.register(Stat)
-class StatAdmin(admin.ModelAdmin):
+class StatAdmin(SlugSearchMixin, admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
     list_display = [
         "id",
         "training_link",
@@ -89,7 +248,10 @@ class StatAdmin(admin.ModelAdmin):
     list_select_related = ["training", "translation"]
     list_filter = ["succeed"]
     ordering = ["-created_at"]
-    search_fields = ["training__lesson__name", "translation__slug"]
+    search_fields = ["training__lesson__name", "translation__text"]
+    slug_search_field = "translation__slug"
+    autocomplete_fields = ["translation"]
+    raw_id_fields = ["training"]
 
     def training_link(self, obj):
         url = reverse("admin:core_training_change", args=(obj.training.pk,))
@@ -102,3 +264,34 @@ class StatAdmin(admin.ModelAdmin):
         return format_html(f'<a href="{url}">{obj.translation}</a>')
 
     translation_link.short_description = "Translation"
+
+
+@admin.register(TranslationMemory)
+class TranslationMemoryAdmin(admin.ModelAdmin):
+    list_display = [
+        "text",
+        "source_lang",
+        "target_lang",
+        "result",
+        "created_at",
+    ]
+    list_filter = ["source_lang", "target_lang"]
+    ordering = ["-created_at"]
+    search_fields = ["text"]
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = [
+        "id",
+        "kind",
+        "status",
+        "attempts",
+        "progress",
+        "total",
+        "created_at",
+        "user",
+    ]
+    list_select_related = ["user"]
+    list_filter = ["kind", "status"]
+    ordering = ["-created_at"]
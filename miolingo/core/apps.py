@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class BaseConfig(AppConfig):
     name = "miolingo.core"
     verbose_name = "Core"
+
+    def ready(self):
+        from miolingo.core import checks, signals  # noqa
@@ -0,0 +1,252 @@
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.db.models import prefetch_related_objects
+from django.http import Http404
+from django.urls import path
+from django.views import View
+
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import exception_handler
+
+from asgiref.sync import sync_to_async
+
+from miolingo.core.authentication import CachedJWTAuthentication
+from miolingo.core.models import Lesson, Training, Translation, User
+from miolingo.core.readers import TRANS_PREFETCH, prefetch_translations
+from miolingo.core.serializers import (
+    LessonSerializer,
+    TrainingSerializer,
+    TranslationSerializer,
+    UserSerializer,
+)
+from miolingo.core.sharding import aget_user_shard, use_shard
+from miolingo.core.views import LessonViewset, TranslationViewset
+
+
+async def aprefetch_related_objects(instances, *lookups):
+    # Not provided by the async ORM of Django 4.2.
+    await sync_to_async(prefetch_related_objects)(instances, *lookups)
+
+
+class AsyncReadView(View):
+    """
+    Native async GET of a route, for ASGI deployments. Authentication (JWT),
+    filtering and pagination are done with the async ORM and cache. Other
+    methods fall back on the sync view of the same route (i.e: the viewset).
+    """
+
+    authentication_classes = [CachedJWTAuthentication]
+    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES
+    content_negotiation_class = api_settings.DEFAULT_CONTENT_NEGOTIATION_CLASS
+    serializer_class = None
+    prefetch_lookups = []
+    fallback = None
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        # Like DRF, only session authentication would enforce CSRF.
+        view.csrf_exempt = True
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        if request.method in ["GET", "HEAD"]:
+            return await self.get(request, *args, **kwargs)
+        if self.fallback is None:
+            return await self.http_method_not_allowed(request, *args, **kwargs)
+        return await sync_to_async(self.fallback)(request, *args, **kwargs)
+
+    async def get(self, request, *args, **kwargs):
+        self.request = Request(request)
+        try:
+            await self.aauthenticate(self.request)
+            with use_shard(await aget_user_shard(self.request.user)):
+                response = await self.aread(self.request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        return self.finalize_response(self.request, response, *args, **kwargs)
+
+    async def aread(self, request, *args, **kwargs):  # pragma: no cover
+        raise NotImplementedError
+
+    async def aauthenticate(self, request):
+        for authenticator in self.get_authenticators():
+            user_auth = await authenticator.aauthenticate(request)
+            if user_auth is not None:
+                request.user, request.auth = user_auth
+                return
+
+        raise exceptions.NotAuthenticated()
+
+    async def aprefetch(self, objs):
+        await aprefetch_related_objects(objs, *self.prefetch_lookups)
+
+    def get_authenticators(self):
+        return [auth() for auth in self.authentication_classes]
+
+    def get_serializer(self, *args, **kwargs):
+        context = {"request": self.request, "format": None, "view": self}
+        return self.serializer_class(*args, context=context, **kwargs)
+
+    def get_exception_handler_context(self):
+        return {"view": self, "args": self.args, "kwargs": self.kwargs}
+
+    def handle_exception(self, exc):
+        if isinstance(
+            exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)
+        ):
+            authenticators = self.get_authenticators()
+            exc.auth_header = authenticators[0].authenticate_header(self.request)
+
+        response = exception_handler(exc, self.get_exception_handler_context())
+        if response is None:
+            raise exc
+        response.exception = True
+        return response
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        renderers = [renderer() for renderer in self.renderer_classes]
+        negotiator = self.content_negotiation_class()
+        try:
+            renderer, media_type = negotiator.select_renderer(request, renderers)
+        except exceptions.NotAcceptable as exc:
+            renderer, media_type = renderers[0], renderers[0].media_type
+            response = self.handle_exception(exc)
+
+        request.accepted_renderer = renderer
+        request.accepted_media_type = media_type
+
+        response.accepted_renderer = renderer
+        response.accepted_media_type = media_type
+        response.renderer_context = {
+            "view": self,
+            "args": args,
+            "kwargs": kwargs,
+            "request": request,
+            "response": response,
+        }
+        return response
+
+
+class AsyncListView(AsyncReadView):
+    filter_backends = api_settings.DEFAULT_FILTER_BACKENDS
+    pagination_class = api_settings.DEFAULT_PAGINATION_CLASS
+
+    def filter_queryset(self, queryset):
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(self.request, queryset, self)
+        return queryset
+
+    async def aread(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        paginator = self.pagination_class()
+
+        objs = await paginator.apaginate_queryset(queryset, request, view=self)
+        await self.aprefetch(objs)
+
+        serializer = self.get_serializer(objs, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+
+class AsyncRetrieveView(AsyncReadView):
+    async def aread(self, request, pk):
+        try:
+            instance = await self.get_queryset().aget(pk=pk)
+        except (ObjectDoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404
+
+        await self.aprefetch([instance])
+        return Response(self.get_serializer(instance).data)
+
+
+class TranslationReadMixin:
+    serializer_class = TranslationSerializer
+    prefetch_lookups = [TRANS_PREFETCH]
+    filterset_fields = TranslationViewset.filterset_fields
+    ordering_fields = TranslationViewset.ordering_fields
+    ordering = TranslationViewset.ordering
+
+    def get_queryset(self):
+        return Translation.objects.filter(user=self.request.user.pk)
+
+
+class TranslationListView(TranslationReadMixin, AsyncListView):
+    pass
+
+
+class TranslationDetailView(TranslationReadMixin, AsyncRetrieveView):
+    pass
+
+
+class LessonReadMixin:
+    serializer_class = LessonSerializer
+    filterset_fields = LessonViewset.filterset_fields
+    ordering_fields = LessonViewset.ordering_fields
+    ordering = LessonViewset.ordering
+
+    def get_queryset(self):
+        return Lesson.objects.filter(user=self.request.user.pk)
+
+    async def aprefetch(self, objs):
+        await sync_to_async(prefetch_translations)(objs)
+
+
+class LessonListView(LessonReadMixin, AsyncListView):
+    pass
+
+
+class LessonDetailView(LessonReadMixin, AsyncRetrieveView):
+    pass
+
+
+class TrainingDeckView(AsyncRetrieveView):
+    """
+    The training with the translations of its lesson to learn, only those of
+    its deck if drawn.
+    """
+
+    serializer_class = TrainingSerializer
+
+    def get_queryset(self):
+        return Training.objects.filter(user=self.request.user.pk).select_related(
+            "lesson"
+        )
+
+    async def aprefetch(self, objs):
+        await sync_to_async(prefetch_translations)(
+            [obj.lesson for obj in objs], decks=[obj.deck for obj in objs]
+        )
+
+
+class UserMeView(AsyncReadView):
+    serializer_class = UserSerializer
+
+    async def aread(self, request):
+        # Authenticated user is already loaded, unless stateless.
+        user = request.user
+        if not isinstance(user, User):
+            user = await User.objects.aget(pk=user.pk)
+        return Response(self.get_serializer(user).data)
+
+
+def get_async_urls(router):
+    """
+    Return async routes to put in front of the router ones, which are used as
+    fallback for methods other than GET.
+    """
+    callbacks = {url.name: url.callback for url in router.urls}
+    routes = [
+        ("translations/", TranslationListView, "translations-list"),
+        ("translations/<int:pk>/", TranslationDetailView, "translations-detail"),
+        ("lessons/", LessonListView, "lessons-list"),
+        ("lessons/<int:pk>/", LessonDetailView, "lessons-detail"),
+        ("trainings/<int:pk>/", TrainingDeckView, "trainings-detail"),
+        ("users/me/", UserMeView, "users-me"),
+    ]
+    return [
+        path(route, view.as_view(fallback=callbacks[name]), name=f"async-{name}")
+        for route, view, name in routes
+    ]
@@ -0,0 +1,115 @@
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import SAFE_METHODS
+
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from miolingo.core.cache import aget_user_version, get_cache, get_user_version
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    Resolve the user of a JWT from the cache, until the user is saved or the
+    cache entry expires (MIOLINGO_AUTH_USER_CACHE_TIMEOUT, 0 to disable).
+
+    If MIOLINGO_AUTH_STATELESS_READS is enabled, safe methods get a stateless
+    user built from the token claims instead, without any lookup.
+
+    Async views use aauthenticate(), with the async cache and ORM.
+    """
+
+    def authenticate(self, request):
+        # Authenticators are instantiated per request.
+        self.is_safe_method = request.method in SAFE_METHODS
+        return super().authenticate(request)
+
+    async def aauthenticate(self, request):
+        self.is_safe_method = request.method in SAFE_METHODS
+
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    def get_user_id(self, validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+    def get_user(self, validated_token):
+        user_id = self.get_user_id(validated_token)
+
+        if settings.MIOLINGO_AUTH_STATELESS_READS and self.is_safe_method:
+            return api_settings.TOKEN_USER_CLASS(validated_token)
+
+        timeout = settings.MIOLINGO_AUTH_USER_CACHE_TIMEOUT
+        if not timeout:
+            return super().get_user(validated_token)
+
+        cache = get_cache()
+        key = f"miolingo:auth:{user_id}:{get_user_version(user_id)}"
+
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache.set(key, user, timeout=timeout)
+            return user
+
+        # Cached users are still checked against the token.
+        return self.check_user(user, validated_token)
+
+    async def aget_user(self, validated_token):
+        user_id = self.get_user_id(validated_token)
+
+        if settings.MIOLINGO_AUTH_STATELESS_READS and self.is_safe_method:
+            return api_settings.TOKEN_USER_CLASS(validated_token)
+
+        timeout = settings.MIOLINGO_AUTH_USER_CACHE_TIMEOUT
+        if not timeout:
+            return await self.aget_user_from_db(user_id, validated_token)
+
+        cache = get_cache()
+        key = f"miolingo:auth:{user_id}:{await aget_user_version(user_id)}"
+
+        user = await cache.aget(key)
+        if user is None:
+            user = await self.aget_user_from_db(user_id, validated_token)
+            await cache.aset(key, user, timeout=timeout)
+            return user
+
+        return self.check_user(user, validated_token)
+
+    async def aget_user_from_db(self, user_id, validated_token):
+        try:
+            user = await self.user_model.objects.aget(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        return self.check_user(user, validated_token)
+
+    def check_user(self, user, validated_token):
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
@@ -0,0 +1,187 @@
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from django.conf import settings
+
+import deepl
+
+from miolingo.core.bulk import link_translations
+from miolingo.core.models import Translation, TranslationMemory
+from miolingo.core.utils import hash_slug
+
+# Target languages without a regional variant are deprecated by DeepL.
+TARGET_LANGS = {
+    "en": "EN-US",
+}
+
+
+class AutotranslateError(Exception):
+    pass
+
+
+def chunks(items, size):
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class RateLimiter:
+    """
+    Space out the calls of all threads, to at most `rate` per second.
+    """
+
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate else 0
+        self.next_at = 0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_at - now
+            self.next_at = max(now, self.next_at) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+def get_translator():
+    if not settings.MIOLINGO_DEEPL_AUTH_KEY:
+        raise AutotranslateError("DeepL API key is not configured.")
+    return deepl.Translator(
+        settings.MIOLINGO_DEEPL_AUTH_KEY,
+        server_url=settings.MIOLINGO_DEEPL_SERVER_URL,
+    )
+
+
+class AutoTranslator:
+    """
+    Translate texts with DeepL, through the translation memory. Texts not
+    memorized yet are sent by batches, concurrently but rate limited.
+    """
+
+    def __init__(
+        self, translator=None, batch_size=None, workers=None, rate=None, progress=None
+    ):
+        self.translator = translator or get_translator()
+        self.batch_size = batch_size or settings.MIOLINGO_AUTOTRANSLATE_BATCH_SIZE
+        self.workers = workers or settings.MIOLINGO_AUTOTRANSLATE_WORKERS
+        if rate is None:
+            rate = settings.MIOLINGO_AUTOTRANSLATE_RATE
+        self.limiter = RateLimiter(rate)
+        # Number of texts sent to DeepL, reported to progress after each batch.
+        self.requested = 0
+        self.progress = progress
+
+    def translate(self, texts, src, tgt):
+        """
+        Return a dict of the texts with their translation.
+        """
+        texts = set(texts)
+        results = self.recall(texts, src, tgt)
+        batches = list(chunks(sorted(texts - set(results)), self.batch_size))
+
+        # Only requests are done in threads, database queries are not.
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            responses = executor.map(lambda b: self.request(b, src, tgt), batches)
+            for batch, translated in zip(batches, responses):
+                # Memorized as soon as received, even if next batches fail.
+                self.remember(batch, translated, src, tgt)
+                results.update(zip(batch, translated))
+                self.requested += len(batch)
+                if self.progress is not None:
+                    self.progress(self.requested)
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+        return results
+
+    def request(self, texts, src, tgt):
+        self.limiter.wait()
+        try:
+            results = self.translator.translate_text(
+                texts,
+                source_lang=src.upper(),
+                target_lang=TARGET_LANGS.get(tgt, tgt).upper(),
+            )
+        except deepl.DeepLException as exc:
+            raise AutotranslateError(f"DeepL request failed: {exc}") from exc
+        return [result.text for result in results]
+
+    def recall(self, texts, src, tgt):
+        results = {}
+        for batch in chunks(texts, 500):
+            queryset = TranslationMemory.objects.filter(
+                source_lang=src,
+                target_lang=tgt,
+                text_hash__in=[hash_slug(text) for text in batch],
+            ).values_list("text", "result")
+            # Hashes may collide, texts never.
+            results.update((text, result) for text, result in queryset if text in texts)
+        return results
+
+    def remember(self, texts, results, src, tgt):
+        TranslationMemory.objects.bulk_create(
+            [
+                # Bulk insert skip save(), so compute hashes here.
+                TranslationMemory(
+                    source_lang=src,
+                    target_lang=tgt,
+                    text=text,
+                    text_hash=hash_slug(text),
+                    result=result,
+                )
+                for text, result in zip(texts, results)
+            ],
+            ignore_conflicts=True,
+        )
+
+
+def get_untranslated(user, lang, src=None):
+    """
+    Return translations of the user without any trans in the given lang.
+    """
+    queryset = (
+        Translation.objects.filter(user=user.pk)
+        .exclude(lang=lang)
+        .exclude(trans__lang=lang)
+    )
+    if src:
+        queryset = queryset.filter(lang=src)
+    return queryset.order_by("pk")
+
+
+def autotranslate(user, lang, src=None, limit=None, translator=None):
+    """
+    Translate the user translations without trans in lang, then link them to
+    the results (created unless existing). Return the counts.
+    """
+    translator = translator or AutoTranslator()
+
+    rows = get_untranslated(user, lang, src).values_list("pk", "lang", "text")
+    if limit:
+        rows = rows[:limit]
+
+    texts = defaultdict(list)
+    for pk, src_lang, text in rows:
+        texts[src_lang].append((pk, text))
+
+    links = []
+    for src_lang, items in texts.items():
+        results = translator.translate([text for pk, text in items], src_lang, lang)
+        links += [
+            (pk, lang, results[text].strip())
+            for pk, text in items
+            if results.get(text, "").strip()
+        ]
+
+    created, linked = link_translations(user, links)
+    return {
+        "translations": sum(len(items) for items in texts.values()),
+        "requested": translator.requested,
+        "created": created,
+        "linked": linked,
+    }
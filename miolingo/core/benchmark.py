@@ -0,0 +1,276 @@
+import json
+import math
+import random
+from time import perf_counter
+
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from miolingo.core.factories import (
+    LessonFactory,
+    TrainingFactory,
+    TranslationFactory,
+    UserFactory,
+)
+from miolingo.core.models import Lesson, Training, Translation
+from miolingo.core.renderers import FastJSONRenderer, MessagePackRenderer, msgpack
+from miolingo.core.serializers import LessonSerializer
+
+PERCENTILES = (50, 95, 99)
+
+
+def seed(translations=2000, lessons=10, words=200, trainings=20, random_seed=0):
+    """
+    Create a user with a realistic volume of data and return it.
+    """
+    # Seeded within the transaction of the run, but as if committed before:
+    # version bumps must not be pending (i.e: coalesced with those of requests).
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        rand = random.Random(random_seed)
+        user = UserFactory()
+
+        # Each translation is created with its own trans.
+        TranslationFactory.create_bulk(
+            translations // 2, user=user, lang="fr", trans__num=1, trans__lang="es"
+        )
+
+        pks = list(Translation.objects.filter(user=user).values_list("pk", flat=True))
+        for lesson in LessonFactory.create_bulk(
+            lessons, user=user, translations__num=0
+        ):
+            lesson.translations.set(rand.sample(pks, min(words, len(pks))))
+
+        lesson_list = list(Lesson.objects.filter(user=user))
+        for i in range(0, trainings):
+            TrainingFactory.create_bulk(
+                1,
+                user=user,
+                lesson=rand.choice(lesson_list),
+                stats=True,
+                stats__num=rand.randint(0, words),
+            )
+        # Answers can only be given to trainings not finished yet.
+        TrainingFactory(user=user, lesson=rand.choice(lesson_list), finished_at=None)
+
+    return user
+
+
+def get_scenarios(user):
+    """
+    Return a list of (name, method, callable) where callable returns the url
+    and the payload of the request for a given iteration.
+    """
+    lesson = Lesson.objects.filter(user=user).order_by("pk").first()
+    training = Training.objects.filter(user=user).order_by("pk").first()
+    ongoing = (
+        Training.objects.filter(user=user, finished_at=None).order_by("pk").first()
+    )
+    answer = ongoing.lesson.translations.order_by("pk").first()
+    translation = (
+        Translation.objects.filter(user=user, lang="fr").order_by("pk").first()
+    )
+    trans_pks = list(lesson.translations.values_list("pk", flat=True)[:10])
+
+    def detail(basename, obj):
+        return reverse(f"{basename}-detail", kwargs={"pk": obj.pk})
+
+    return [
+        ("users-me", "get", lambda i: (reverse("users-me"), None)),
+        (
+            "users-update",
+            "patch",
+            lambda i: (detail("users", user), {"first_name": f"bench{i}"}),
+        ),
+        ("translations-list", "get", lambda i: (reverse("translations-list"), None)),
+        (
+            "translations-retrieve",
+            "get",
+            lambda i: (detail("translations", translation), None),
+        ),
+        (
+            "translations-create",
+            "post",
+            lambda i: (
+                reverse("translations-list"),
+                {
+                    "lang": "fr",
+                    "text": f"benchmark {i}",
+                    "trans": [{"lang": "es", "text": f"benchmark trans {i}"}],
+                },
+            ),
+        ),
+        (
+            "translations-update",
+            "patch",
+            lambda i: (
+                detail("translations", translation),
+                {
+                    "priority": i % 10,
+                    "trans": [{"lang": "es", "text": f"bench {i}", "priority": 0}],
+                },
+            ),
+        ),
+        ("lessons-list", "get", lambda i: (reverse("lessons-list"), None)),
+        ("lessons-retrieve", "get", lambda i: (detail("lessons", lesson), None)),
+        (
+            "lessons-create",
+            "post",
+            lambda i: (
+                reverse("lessons-list"),
+                {"name": f"benchmark {i}", "translations": trans_pks},
+            ),
+        ),
+        (
+            "lessons-update",
+            "patch",
+            lambda i: (detail("lessons", lesson), {"priority": i % 10}),
+        ),
+        (
+            "trainings-create",
+            "post",
+            lambda i: (reverse("trainings-list"), {"lesson": lesson.pk}),
+        ),
+        (
+            "trainings-update",
+            "patch",
+            lambda i: (detail("trainings", training), {"finished_at": now()}),
+        ),
+        (
+            "stats-create",
+            "post",
+            lambda i: (
+                reverse("stats-list"),
+                {"training": ongoing.pk, "translation": answer.pk, "succeed": True},
+            ),
+        ),
+    ]
+
+
+def percentile(values, p):
+    # Nearest-rank method.
+    values = sorted(values)
+    index = max(0, math.ceil(p / 100 * len(values)) - 1)
+    return values[index]
+
+
+def count_queries(captured_queries):
+    """
+    Count the queries, without savepoints which are transaction control, like
+    BEGIN and COMMIT which are not captured.
+    """
+    return sum(
+        1
+        for query in captured_queries
+        if not query["sql"].startswith(("SAVEPOINT", "RELEASE SAVEPOINT"))
+    )
+
+
+def run(user, iterations=20):
+    client = APIClient()
+    client.force_authenticate(user)
+
+    results = {}
+    for name, method, build in get_scenarios(user):
+        durations = []
+        queries = 0
+
+        for i in range(0, iterations):
+            url, data = build(i)
+            # Rolled back, like a request in its own transaction would be
+            # committed: its version bumps are not coalesced with the next.
+            with transaction.atomic():
+                with CaptureQueriesContext(connection) as ctx:
+                    start = perf_counter()
+                    response = getattr(client, method)(url, data=data)
+                    durations.append((perf_counter() - start) * 1000)
+                transaction.set_rollback(True)
+
+            if response.status_code >= 400:
+                raise RuntimeError(
+                    f"Scenario {name} failed ({response.status_code}): {response.content!r}"
+                )
+            queries = max(queries, count_queries(ctx.captured_queries))
+
+        results[name] = {
+            f"p{p}": round(percentile(durations, p), 2) for p in PERCENTILES
+        }
+        results[name]["queries"] = queries
+
+    return results
+
+
+def get_renderers():
+    renderers = [JSONRenderer, FastJSONRenderer]
+    if msgpack is not None:  # pragma: no cover
+        renderers.append(MessagePackRenderer)
+    return renderers
+
+
+def run_renderers(user, iterations=20):
+    """
+    Render the lessons of the user with each renderer, against JSONRenderer.
+    """
+    lessons = Lesson.objects.filter(user=user).prefetch_related("translations__trans")
+    data = LessonSerializer(lessons, many=True).data
+
+    results = {}
+    for renderer_class in get_renderers():
+        renderer = renderer_class()
+        durations = []
+        for i in range(0, iterations):
+            start = perf_counter()
+            content = renderer.render(data)
+            durations.append((perf_counter() - start) * 1000)
+
+        results[renderer_class.__name__] = {
+            f"p{p}": round(percentile(durations, p), 2) for p in PERCENTILES
+        }
+        results[renderer_class.__name__]["size"] = len(content)
+
+    return results
+
+
+def compare(results, baseline, tolerance=1.5):
+    """
+    Return regressions of results against the baseline. Query counts must not
+    increase, latencies must not exceed the baseline times tolerance (unless 0).
+    """
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if not expected:
+            continue
+
+        if result["queries"] > expected["queries"]:
+            regressions.append(
+                f"{name}: {result['queries']} queries (baseline: {expected['queries']})"
+            )
+
+        if not tolerance:
+            continue
+
+        for p in PERCENTILES:
+            key = f"p{p}"
+            if result[key] > expected[key] * tolerance:
+                regressions.append(
+                    f"{name}: {key} = {result[key]}ms (baseline: {expected[key]}ms)"
+                )
+
+    return regressions
+
+
+def load_baseline(path):
+    with open(path) as fp:
+        return json.load(fp)
+
+
+def dump_baseline(results, path):
+    with open(path, "w") as fp:
+        json.dump(results, fp, indent=2, sort_keys=True)
+        fp.write("\n")
@@ -0,0 +1,185 @@
+import fcntl
+import json
+import logging
+import os
+import re
+import time
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DatabaseError, router, transaction
+
+from miolingo.core.models import Stat
+
+logger = logging.getLogger(__name__)
+
+SUFFIX = ".log"
+# Logs claimed by a flush, until their stats are inserted.
+FLUSHING_SUFFIX = ".flushing"
+# Logs whose stats cannot be inserted (e.g: translation deleted since), set
+# aside to be looked at instead of being retried forever.
+FAILED_SUFFIX = ".failed"
+
+# {db}.{training_id}.log, optionally claimed: .{uuid}.flushing
+LOG_NAME = re.compile(
+    rf"^(?P<db>[^.]+)\.(?P<training_id>\d+){re.escape(SUFFIX)}"
+    rf"(?P<claimed>\.[0-9a-f]{{32}}{re.escape(FLUSHING_SUFFIX)})?$"
+)
+
+
+class StatBuffer:
+    """
+    Write-behind buffer of training answers: each stat is appended to a log
+    per training in a directory shared by the workers (MIOLINGO_STATS_BUFFER_DIR)
+    then inserted in bulk when the batch is full, when the training is finished
+    or by the flushstats command.
+
+    Logs are files, so answers survive the restarts of workers. A flush first
+    renames the log, so it is claimed once and new answers go to a new log. If
+    a worker dies while inserting, the claimed log is flushed again by the
+    command: answers are never lost, but may be inserted twice then. Logs
+    which cannot be inserted are set aside and reported, not retried.
+    """
+
+    def __init__(self, directory, batch_size):
+        self.directory = Path(directory)
+        self.batch_size = batch_size
+        # Paths of the logs set aside by this buffer.
+        self.failed = []
+
+    def get_path(self, db, training_id):
+        return self.directory / f"{db}.{training_id}{SUFFIX}"
+
+    def append(self, training, translation, succeed):
+        """
+        Buffer an answer, and flush the log of the training if full.
+        """
+        db = router.db_for_write(Stat, instance=training)
+        path = self.get_path(db, training.pk)
+        line = json.dumps({"translation": translation.pk, "succeed": succeed})
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        while True:
+            with open(path, "a+") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                # Claimed by a flush while waiting for the lock?
+                try:
+                    if os.stat(path).st_ino != os.fstat(f.fileno()).st_ino:
+                        continue
+                except FileNotFoundError:
+                    continue
+                f.write(line + "\n")
+                f.flush()
+                f.seek(0)
+                count = f.read().count("\n")
+            break
+
+        if count >= self.batch_size:
+            self.flush(db, training.pk)
+
+    def flush(self, db, training_id):
+        """
+        Insert the buffered answers of a training, return their count.
+        """
+        path = self.get_path(db, training_id)
+        try:
+            with open(path) as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                # Claimed by another flush while waiting for the lock?
+                if os.stat(path).st_ino != os.fstat(f.fileno()).st_ino:
+                    return 0
+                claimed = self.claim(path)
+        except FileNotFoundError:
+            return 0
+        return self.insert(db, training_id, claimed)
+
+    def claim(self, path):
+        """
+        Rename the log, which only one worker can do, and return its new path.
+        """
+        name = path.name.split(".")[0:3]
+        claimed = path.with_name(".".join([*name, uuid.uuid4().hex]) + FLUSHING_SUFFIX)
+        os.rename(path, claimed)
+        # Claimed from now, to be flushed again if lost.
+        os.utime(claimed)
+        return claimed
+
+    def insert(self, db, training_id, path):
+        """
+        Insert the stats of a claimed log, or set it aside if they cannot be.
+        Return the count of stats inserted.
+        """
+        stats = [
+            Stat(
+                training_id=training_id,
+                translation_id=answer["translation"],
+                succeed=answer["succeed"],
+            )
+            for answer in map(json.loads, path.read_text().splitlines())
+        ]
+        try:
+            with transaction.atomic(using=db):
+                Stat.objects.using(db).bulk_create(stats)
+        except DatabaseError:
+            failed = path.with_name(
+                path.name.removesuffix(FLUSHING_SUFFIX) + FAILED_SUFFIX
+            )
+            os.rename(path, failed)
+            self.failed.append(failed)
+            logger.exception(
+                "Stats of training %s cannot be inserted, set aside in %s.",
+                training_id,
+                failed,
+            )
+            return 0
+        path.unlink()
+        return len(stats)
+
+    def flush_all(self, max_age=0):
+        """
+        Flush the logs not written for max_age seconds at least, and those
+        left claimed by a dead worker for long. Return the count of answers.
+        """
+        if not self.directory.exists():
+            return 0
+
+        count = 0
+        now = time.time()
+        for path in self.directory.iterdir():
+            try:
+                age = now - path.stat().st_mtime
+            except FileNotFoundError:  # pragma: no cover
+                continue
+            # Set aside or stray files are left alone.
+            match = LOG_NAME.match(path.name)
+            if match is None:
+                continue
+
+            db, training_id = match["db"], int(match["training_id"])
+            if match["claimed"]:
+                if age >= settings.MIOLINGO_STATS_BUFFER_LOST_AFTER:
+                    count += self.flush_lost(db, training_id, path)
+            elif age >= max_age:
+                count += self.flush(db, training_id)
+        return count
+
+    def flush_lost(self, db, training_id, path):
+        """
+        Claim again a log left by a dead worker and insert its answers.
+        """
+        try:
+            claimed = self.claim(path)
+        except FileNotFoundError:  # pragma: no cover
+            return 0
+        return self.insert(db, training_id, claimed)
+
+
+def get_stat_buffer():
+    """
+    Return the buffer of stats, or None if they are inserted one by one.
+    """
+    directory = settings.MIOLINGO_STATS_BUFFER_DIR
+    if not directory:
+        return None
+    return StatBuffer(directory, settings.MIOLINGO_STATS_BUFFER_SIZE)
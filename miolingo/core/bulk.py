@@ -0,0 +1,80 @@
+from django.db import router, transaction
+from django.utils.text import slugify
+
+from miolingo.core.cache import bump_data_version
+from miolingo.core.models import Translation
+from miolingo.core.utils import hash_slug
+
+
+def get_or_create_translations(user, items, batch_size=1000):
+    """
+    Get translations of a user given by (lang, text), which are created unless
+    they already exist, with bulk inserts only. Return the number of
+    translations created and their pks by (lang, slug_hash).
+    """
+    targets = {}
+    for lang, text in items:
+        slug = slugify(text)
+        targets.setdefault((lang, hash_slug(slug)), (text, slug))
+    if not targets:
+        return 0, {}
+
+    with transaction.atomic(using=router.db_for_write(Translation)):
+        existing = _get_pks(user, targets)
+        Translation.objects.bulk_create(
+            [
+                # Bulk insert skip save(), so compute slugs here.
+                Translation(
+                    user_id=user.pk, lang=lang, text=text, slug=slug, slug_hash=h
+                )
+                for (lang, h), (text, slug) in targets.items()
+                if (lang, h) not in existing
+            ],
+            batch_size=batch_size,
+        )
+        created = len(targets) - len(existing)
+        if created:
+            existing = _get_pks(user, targets)
+
+    return created, existing
+
+
+def link_translations(user, links, batch_size=1000):
+    """
+    Link translations of a user to others given by (translation pk, lang, text),
+    which are created unless they already exist, with bulk inserts only.
+    Return the number of translations created and of links.
+    """
+    if not links:
+        return 0, 0
+
+    with transaction.atomic(using=router.db_for_write(Translation)):
+        created, existing = get_or_create_translations(
+            user, [(lang, text) for pk, lang, text in links], batch_size=batch_size
+        )
+
+        Through = Translation.trans.through
+        pairs = {
+            (pk, existing[(lang, hash_slug(slugify(text)))]) for pk, lang, text in links
+        }
+        Through.objects.bulk_create(
+            # Self M2M is symmetrical, so we need both directions.
+            [
+                Through(from_translation_id=a, to_translation_id=b)
+                for src, tgt in pairs
+                for a, b in ((src, tgt), (tgt, src))
+            ],
+            batch_size=batch_size,
+            ignore_conflicts=True,
+        )
+
+    # Bulk inserts skip signals.
+    bump_data_version(user.pk, using=router.db_for_write(Translation))
+    return created, len(pairs)
+
+
+def _get_pks(user, keys):
+    queryset = Translation.objects.filter(
+        user=user.pk, slug_hash__in={h for lang, h in keys}
+    ).values_list("lang", "slug_hash", "pk")
+    return {(lang, h): pk for lang, h, pk in queryset if (lang, h) in keys}
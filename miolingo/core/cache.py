@@ -0,0 +1,266 @@
+import hashlib
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import router, transaction
+from django.db.models import Count, F, Max, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+from rest_framework.response import Response
+
+from miolingo.core.models import DataVersion
+
+CACHED_HEADERS = ["ETag", "Last-Modified", "Cache-Control", "Vary"]
+
+
+def get_cache():
+    return caches[settings.MIOLINGO_RESPONSE_CACHE_ALIAS]
+
+
+def _get_version(key):
+    cache = get_cache()
+    version = cache.get(key)
+    if version is None:
+        # Never restart from a known value, cached values may still exist.
+        version = time.time_ns()
+        cache.add(key, version, timeout=None)
+        version = cache.get(key, version)
+    return version
+
+
+async def _aget_version(key):
+    cache = get_cache()
+    version = await cache.aget(key)
+    if version is None:
+        version = time.time_ns()
+        await cache.aadd(key, version, timeout=None)
+        version = await cache.aget(key, version)
+    return version
+
+
+def _bump_version(key):
+    cache = get_cache()
+    version = cache.get(key, 0)
+    cache.set(key, max(time.time_ns(), version + 1), timeout=None)
+
+
+def get_data_version(user_id):
+    """
+    Return the user data version, which is the timestamp (ns) of its last change.
+    """
+    return _get_version(f"miolingo:version:{user_id}")
+
+
+class _VersionBump:
+    """
+    Callback bumping a cached version on commit, which also marks the bump as
+    pending until then.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.pending = True
+
+    def __call__(self):
+        self.pending = False
+        _bump_version(self.key)
+
+
+def _is_bump_pending(key, using):
+    # Callbacks of savepoints rolled back are discarded along.
+    connection = transaction.get_connection(using)
+    return connection.in_atomic_block and any(
+        isinstance(func, _VersionBump) and func.pending and func.key == key
+        for _, func, *_ in connection.run_on_commit
+    )
+
+
+def bump_data_version(user_id, using=None):
+    """
+    Bump the user data version once the current transaction of the database is
+    committed (at once outside of transactions), so that concurrent reads
+    never cache data older than the changes under the new version.
+
+    The version stored in the database (see DataVersion) is bumped within the
+    transaction, it is committed with the changes. Both are bumped once per
+    transaction, by its first change of the user data.
+    """
+    using = using or router.db_for_write(DataVersion)
+    key = f"miolingo:version:{user_id}"
+    if _is_bump_pending(key, using):
+        return
+
+    _bump_db_version(user_id, using)
+    transaction.on_commit(_VersionBump(key), using=using)
+
+
+def _bump_db_version(user_id, using):
+    queryset = DataVersion.objects.using(using).filter(user_id=user_id)
+    version = Greatest(F("version") + 1, Value(time.time_ns()))
+    if queryset.update(version=version):
+        return
+
+    _, created = DataVersion.objects.using(using).get_or_create(
+        user_id=user_id, defaults={"version": time.time_ns()}
+    )
+    if not created:  # pragma: no cover
+        queryset.update(version=version)
+
+
+def get_data_version_subquery(user_id):
+    """
+    Return the user data version stored in the database, as a subquery.
+    """
+    queryset = DataVersion.objects.filter(user_id=user_id).values("version")
+    return Subquery(queryset[:1])
+
+
+def get_user_version(user_id):
+    return _get_version(f"miolingo:user-version:{user_id}")
+
+
+async def aget_user_version(user_id):
+    return await _aget_version(f"miolingo:user-version:{user_id}")
+
+
+def bump_user_version(user_id, using=None):
+    key = f"miolingo:user-version:{user_id}"
+    transaction.on_commit(lambda: _bump_version(key), using=using)
+
+
+def conditional_response(request, etag=None, last_modified=None):
+    """
+    Return a 304 (or 412) response if the request conditions match, else None.
+    Last-Modified is either a datetime or an HTTP date string.
+    """
+    if isinstance(last_modified, str):
+        last_modified = parse_http_date_safe(last_modified)
+    elif last_modified is not None:
+        last_modified = int(last_modified.timestamp())
+
+    return get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+
+class CachedResponseMixin:
+    """
+    Cache successful responses of read actions per user, until any of its
+    data is changed (see signals).
+    """
+
+    cached_actions = ["list", "retrieve"]
+
+    def get_cache_key(self, request, *args, **kwargs):
+        params = sorted(request.query_params.lists())
+        value = repr((params, sorted(kwargs.items()), request.accepted_renderer.format))
+        digest = hashlib.md5(value.encode()).hexdigest()
+        version = get_data_version(request.user.pk)
+        return f"miolingo:response:{request.user.pk}:{version}:{self.basename}:{self.action}:{digest}"  # fmt: skip
+
+    def cached(self, func, request, *args, **kwargs):
+        timeout = settings.MIOLINGO_RESPONSE_CACHE_TIMEOUT
+        if not timeout or self.action not in self.cached_actions:
+            return func(request, *args, **kwargs)
+
+        cache = get_cache()
+        key = self.get_cache_key(request, *args, **kwargs)
+
+        cached = cache.get(key)
+        if cached is not None:
+            data, headers = cached
+            response = conditional_response(
+                request, headers.get("ETag"), headers.get("Last-Modified")
+            )
+            if response is not None:
+                return response
+            return Response(data, headers=headers)
+
+        response = func(request, *args, **kwargs)
+        if response.status_code == 200:
+            headers = {h: response[h] for h in CACHED_HEADERS if h in response}
+            cache.set(key, (response.data, headers), timeout=timeout)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached(super().retrieve, request, *args, **kwargs)
+
+
+class ConditionalResponseMixin:
+    """
+    Handle ETag and Last-Modified of read actions on models with a
+    modified_at field. Responses not modified are returned before any
+    serialization.
+    """
+
+    conditional_actions = ["list", "retrieve"]
+
+    def get_fingerprint(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.action == "retrieve":
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = queryset.filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+
+        # The data version is read along, from the database: a version cached
+        # per process would differ between workers, and so would the ETag.
+        version = get_data_version_subquery(request.user.pk)
+        fingerprint = queryset.order_by().aggregate(
+            count=Count("pk"),
+            last_modified=Max("modified_at"),
+            version=Coalesce(Max(version), version, 0),
+        )
+
+        # Relations changes (M2M) don't touch modified_at, but the data version.
+        version = fingerprint.pop("version")
+        changed_at = datetime.fromtimestamp(version / 10**9, tz=timezone.utc)
+        if (
+            fingerprint["last_modified"] is None
+            or fingerprint["last_modified"] < changed_at
+        ):
+            fingerprint["last_modified"] = changed_at
+
+        value = repr(
+            (
+                version,
+                fingerprint["count"],
+                fingerprint["last_modified"].isoformat(),
+                request.accepted_renderer.format,
+                sorted(request.query_params.lists()),
+            )
+        )
+        fingerprint["etag"] = quote_etag(hashlib.md5(value.encode()).hexdigest())
+        return fingerprint
+
+    def conditional(self, func, request, *args, **kwargs):
+        if self.action not in self.conditional_actions:
+            return func(request, *args, **kwargs)
+
+        fingerprint = self.get_fingerprint(request, *args, **kwargs)
+        # Let not found objects raise a 404.
+        if fingerprint["count"] or self.action == "list":
+            response = conditional_response(
+                request, fingerprint["etag"], fingerprint["last_modified"]
+            )
+            if response is not None:
+                return response
+
+        response = func(request, *args, **kwargs)
+        if response.status_code == 200:
+            response["ETag"] = fingerprint["etag"]
+            response["Last-Modified"] = http_date(
+                fingerprint["last_modified"].timestamp()
+            )
+            response["Cache-Control"] = "private, no-cache"
+            patch_vary_headers(response, ["Accept", "Authorization"])
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional(super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Error, Tags, register
+
+from miolingo.core.cache import get_cache
+
+SHARED_CACHE_SETTINGS = [
+    "MIOLINGO_RESPONSE_CACHE_TIMEOUT",
+    "MIOLINGO_DECK_CACHE_TIMEOUT",
+    "MIOLINGO_AUTH_USER_CACHE_TIMEOUT",
+]
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Versions bumped by a process are not seen by others with a local memory
+    cache, which would then serve stale data.
+    """
+    if not isinstance(get_cache(), LocMemCache):
+        return []
+    return [
+        Error(
+            f"{name} requires a cache shared by all the processes.",
+            hint=(
+                "Set MIOLINGO_RESPONSE_CACHE_ALIAS to a shared cache (e.g: Redis), "
+                f"or {name} to 0."
+            ),
+            obj=name,
+            id="miolingo.E001",
+        )
+        for name in SHARED_CACHE_SETTINGS
+        if getattr(settings, name)
+    ]
+
+
+@register(Tags.caches)
+def check_replica_cache(app_configs, **kwargs):
+    """
+    Clients which just wrote are marked in the cache to read from the primary,
+    which other processes do not see with a local memory cache.
+    """
+    if not settings.MIOLINGO_REPLICA_DATABASES:
+        return []
+    if not isinstance(get_cache(), LocMemCache):
+        return []
+    return [
+        Error(
+            "MIOLINGO_REPLICA_DATABASES requires a cache shared by all the "
+            "processes, for clients to read their own writes.",
+            hint="Set MIOLINGO_RESPONSE_CACHE_ALIAS to a shared cache (e.g: Redis).",
+            obj="MIOLINGO_REPLICA_DATABASES",
+            id="miolingo.E002",
+        )
+    ]
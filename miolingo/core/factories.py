@@ -1,4 +1,5 @@
 from datetime import timedelta
+from itertools import islice
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
@@ -11,11 +12,38 @@ from factory import fuzzy
 from factory.django import DjangoModelFactory
 
 from miolingo.core.models import Lesson, Stat, Training, Translation
+from miolingo.core.utils import hash_slug
 
 User = get_user_model()
 current_locale = to_locale(get_language())
 
 
+class BulkFactoryMixin:
+    """
+    Add create_bulk(), like create_batch() but building the instances in
+    memory then inserting them with bulk_create(). Save methods, signals and
+    get or create are skipped, so related objects must be given saved.
+    """
+
+    @classmethod
+    def create_bulk(cls, size, **kwargs):
+        objs = cls.build_batch(size, **cls._pop_bulk_kwargs(kwargs))
+        return cls._meta.model.objects.bulk_create(objs)
+
+    @classmethod
+    def _pop_bulk_kwargs(cls, kwargs, name=None):
+        """
+        Return kwargs without the post generation ones, which are ignored when
+        building, or only those of name (without prefix) if given.
+        """
+        if name is None:
+            return {k: v for k, v in kwargs.items() if "__" not in k}
+        prefix = f"{name}__"
+        return {
+            k.removeprefix(prefix): v for k, v in kwargs.items() if k.startswith(prefix)
+        }
+
+
 class UserFactory(DjangoModelFactory):
     class Meta:
         model = User
@@ -42,13 +70,14 @@ class UserFactory(DjangoModelFactory):
             return int(u.username.split("_")[1]) + 1
 
 
-class TranslationLeafFactory(DjangoModelFactory):
+class TranslationLeafFactory(BulkFactoryMixin, DjangoModelFactory):
     class Meta:
         model = Translation
-        django_get_or_create = ("lang", "slug", "user")
+        django_get_or_create = ("lang", "slug_hash", "user")
 
     lang = fuzzy.FuzzyChoice(settings.MIOLINGO_LANGUAGES, getter=lambda c: c[0])
     slug = factory.LazyAttribute(lambda o: slugify(o.text))
+    slug_hash = factory.LazyAttribute(lambda o: hash_slug(o.slug))
 
     priority = fuzzy.FuzzyInteger(0, 10)
 
@@ -58,6 +87,13 @@ class TranslationLeafFactory(DjangoModelFactory):
     def text(self):
         return factory.Faker._get_faker(self.lang).format("text")
 
+    @classmethod
+    def create_bulk(cls, size, **kwargs):
+        objs = cls.build_batch(size, **cls._pop_bulk_kwargs(kwargs))
+        # Random texts may collide, which get or create would have merged.
+        objs = {(o.user_id, o.lang, o.slug_hash): o for o in objs}
+        return Translation.objects.bulk_create(objs.values())
+
 
 class TranslationFactory(TranslationLeafFactory):
     @factory.post_generation
@@ -74,8 +110,35 @@ class TranslationFactory(TranslationLeafFactory):
             if trans:
                 self.trans.set(trans)
 
-
-class LessonFactory(DjangoModelFactory):
+    @classmethod
+    def create_bulk(cls, size, **kwargs):
+        """
+        Also create num trans for each translation, with their through rows.
+        """
+        translations = super().create_bulk(size, **kwargs)
+        trans_kwargs = cls._pop_bulk_kwargs(kwargs, "trans")
+        num = trans_kwargs.pop("num", 0)
+
+        Through = Translation.trans.through
+        throughs = []
+        for group in _group_by_user(translations):
+            trans = iter(
+                TranslationLeafFactory.create_bulk(
+                    len(group) * num, user=group[0].user, **trans_kwargs
+                )
+            )
+            for translation in group:
+                for leaf in islice(trans, num):
+                    # Self M2M is symmetrical, so we need both directions.
+                    throughs += [
+                        Through(from_translation=translation, to_translation=leaf),
+                        Through(from_translation=leaf, to_translation=translation),
+                    ]
+        Through.objects.bulk_create(throughs)
+        return translations
+
+
+class LessonFactory(BulkFactoryMixin, DjangoModelFactory):
     class Meta:
         model = Lesson
 
@@ -96,8 +159,34 @@ class LessonFactory(DjangoModelFactory):
             # In theory, we should got ALWAYS translations for a lesson!
             self.translations.set(translations)
 
+    @classmethod
+    def create_bulk(cls, size, **kwargs):
+        """
+        Also create num translations (3 by default) for each lesson, with their
+        through rows.
+        """
+        lessons = super().create_bulk(size, **kwargs)
+        translations_kwargs = cls._pop_bulk_kwargs(kwargs, "translations")
+        num = translations_kwargs.pop("num", 3)
+
+        Through = Lesson.translations.through
+        throughs = []
+        for group in _group_by_user(lessons):
+            translations = iter(
+                TranslationFactory.create_bulk(
+                    len(group) * num, user=group[0].user, **translations_kwargs
+                )
+            )
+            for lesson in group:
+                throughs += [
+                    Through(lesson=lesson, translation=translation)
+                    for translation in islice(translations, num)
+                ]
+        Through.objects.bulk_create(throughs)
+        return lessons
+
 
-class TrainingFactory(DjangoModelFactory):
+class TrainingFactory(BulkFactoryMixin, DjangoModelFactory):
     class Meta:
         model = Training
 
@@ -125,8 +214,40 @@ class TrainingFactory(DjangoModelFactory):
                 )
                 count -= 1
 
-
-class StatFactory(DjangoModelFactory):
+    @classmethod
+    def create_bulk(cls, size, **kwargs):
+        """
+        Also create stats for the lesson translations of each training if
+        stats=True, the first num ones succeed.
+        """
+        trainings = super().create_bulk(size, **kwargs)
+        if kwargs.get("stats"):
+            count = cls._pop_bulk_kwargs(kwargs, "stats").get("num", 0)
+
+            Through = Lesson.translations.through
+            translations = {}
+            for lesson_id, translation_id in Through.objects.filter(
+                lesson__in={training.lesson_id for training in trainings}
+            ).values_list("lesson_id", "translation_id"):
+                translations.setdefault(lesson_id, []).append(translation_id)
+
+            Stat.objects.bulk_create(
+                [
+                    Stat(
+                        training=training,
+                        translation_id=translation_id,
+                        succeed=bool(i < count),
+                    )
+                    for training in trainings
+                    for i, translation_id in enumerate(
+                        translations.get(training.lesson_id, [])
+                    )
+                ]
+            )
+        return trainings
+
+
+class StatFactory(BulkFactoryMixin, DjangoModelFactory):
     class Meta:
         model = Stat
 
@@ -134,3 +255,10 @@ class StatFactory(DjangoModelFactory):
     translation = factory.SubFactory(TranslationFactory)
 
     succeed = fuzzy.FuzzyChoice([True, False])
+
+
+def _group_by_user(objs):
+    groups = {}
+    for obj in objs:
+        groups.setdefault(obj.user_id, []).append(obj)
+    return groups.values()
@@ -0,0 +1,69 @@
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+
+from django.db import connections
+
+_current = ContextVar("miolingo_timings", default=None)
+
+
+class RequestTimings:
+    """
+    Collect durations (in seconds) and SQL queries count for a single request.
+    """
+
+    def __init__(self):
+        self.durations = defaultdict(float)
+        self.queries = 0
+
+    def add(self, name, duration):
+        self.durations[name] += duration
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.add("db", perf_counter() - start)
+
+    def as_header(self):
+        metrics = []
+        for name, duration in self.durations.items():
+            metric = f"{name};dur={duration * 1000:.2f}"
+            if name == "db":
+                metric += f';desc="{self.queries} queries"'
+            metrics.append(metric)
+        return ", ".join(metrics)
+
+
+def get_timings():
+    return _current.get()
+
+
+@contextmanager
+def collect_timings():
+    timings = RequestTimings()
+    token = _current.set(timings)
+    try:
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(timings.execute_wrapper))
+            yield timings
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def track(name):
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, perf_counter() - start)
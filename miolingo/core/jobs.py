@@ -0,0 +1,165 @@
+import io
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import F, Q
+from django.utils.timezone import now
+
+from miolingo.core.autotranslate import AutoTranslator, autotranslate
+from miolingo.core.models import Job
+from miolingo.core.sharding import get_user_shard, use_shard
+from miolingo.core.transfers import bulk_import_translations, export_translations
+
+logger = logging.getLogger(__name__)
+
+# Functions of each kind of job, called with the job and returning its result.
+JOBS = {}
+
+
+def register(kind):
+    def decorator(func):
+        JOBS[kind] = func
+        return func
+
+    return decorator
+
+
+def enqueue(kind, user, **payload):
+    if kind not in JOBS:
+        raise ValueError(f"Unknown job '{kind}'.")
+    return Job.objects.create(
+        kind=kind,
+        user=user,
+        payload=payload,
+        max_attempts=settings.MIOLINGO_JOBS_MAX_ATTEMPTS,
+    )
+
+
+def get_claimable():
+    """
+    Return jobs to run (pending, or running on a lost worker, i.e: without
+    heartbeat for too long), oldest first.
+    """
+    timeout = now() - timedelta(seconds=settings.MIOLINGO_JOBS_TIMEOUT)
+    return Job.objects.filter(
+        Q(status=Job.Status.PENDING, run_at__lte=now())
+        | Q(status=Job.Status.RUNNING, heartbeat_at__lt=timeout)
+    ).order_by("run_at", "pk")
+
+
+def claim(worker):
+    """
+    Claim the next job to run for the worker, or return None. Concurrent
+    workers skip the rows locked by others, or without SKIP LOCKED (SQLite),
+    only claim a job if it is still in the state they read.
+    """
+    db = router.db_for_write(Job)
+    queryset = get_claimable().using(db)
+    values = {
+        "status": Job.Status.RUNNING,
+        "worker": worker,
+        "started_at": now(),
+        "heartbeat_at": now(),
+        "attempts": F("attempts") + 1,
+    }
+
+    if connections[db].features.has_select_for_update_skip_locked:
+        with transaction.atomic(using=db):
+            pk = queryset.select_for_update(skip_locked=True).values_list(
+                "pk", flat=True
+            )[:1]
+            pk = next(iter(pk), None)
+            if pk is None:
+                return None
+            Job.objects.using(db).filter(pk=pk).update(**values)
+    else:
+        candidates = queryset.values_list("pk", "status", "heartbeat_at")[:10]
+        for pk, status, heartbeat_at in candidates:
+            updated = (
+                Job.objects.using(db)
+                .filter(pk=pk, status=status, heartbeat_at=heartbeat_at)
+                .update(**values)
+            )
+            if updated:
+                break
+        else:
+            return None
+
+    return Job.objects.using(db).get(pk=pk)
+
+
+def run(job):
+    """
+    Run a claimed job on the user shard, then save its result, or its error
+    and the next attempt if any, unless the job was claimed again meanwhile
+    (i.e: by another worker, the heartbeat being late). Return the job.
+    """
+    try:
+        if job.attempts > job.max_attempts:
+            raise TimeoutError("Job timed out.")
+        with use_shard(get_user_shard(job.user)):
+            result = JOBS[job.kind](job)
+
+    except Exception as exc:
+        logger.exception("Job %s failed (attempt %s).", job.pk, job.attempts)
+        job.error = f"{type(exc).__name__}: {exc}"
+        if job.attempts < job.max_attempts:
+            delay = settings.MIOLINGO_JOBS_RETRY_DELAY * 2 ** (job.attempts - 1)
+            job.status = Job.Status.PENDING
+            job.run_at = now() + timedelta(seconds=delay)
+        else:
+            job.status = Job.Status.FAILED
+            job.finished_at = now()
+
+    else:
+        job.status = Job.Status.SUCCEEDED
+        job.result = result
+        job.error = ""
+        job.finished_at = now()
+        if job.total is not None:
+            job.progress = job.total
+
+    fields = ["status", "result", "error", "progress", "run_at", "finished_at"]
+    updated = (
+        Job.objects.using(job._state.db)
+        .filter(pk=job.pk, worker=job.worker, attempts=job.attempts)
+        .update(**{field: getattr(job, field) for field in fields})
+    )
+    if not updated:
+        logger.warning(
+            "Job %s was claimed again, attempt %s is discarded.", job.pk, job.attempts
+        )
+    return job
+
+
+@register("import")
+def import_job(job):
+    content = job.payload["content"]
+    job.set_progress(0, total=len(content.splitlines()))
+
+    counts = {"created": 0, "duplicate": 0, "errors": []}
+    for counts in bulk_import_translations(
+        job.user, io.StringIO(content), job.payload["src"], job.payload["tgt"]
+    ):
+        job.set_progress(counts["lines"])
+    return {
+        "created": counts["created"],
+        "duplicate": counts["duplicate"],
+        "errors": [{"line": line, "error": error} for line, error in counts["errors"]],
+    }
+
+
+@register("export")
+def export_job(job):
+    content, count = export_translations(
+        job.user, job.payload["src"], job.payload["tgt"]
+    )
+    return {"count": count, "content": content}
+
+
+@register("autotranslate")
+def autotranslate_job(job):
+    translator = AutoTranslator(progress=job.set_progress)
+    return autotranslate(job.user, translator=translator, **job.payload)
@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from miolingo.core.autotranslate import (
+    AutotranslateError,
+    AutoTranslator,
+    autotranslate,
+)
+from miolingo.core.sharding import get_user_shard, use_shard
+
+User = get_user_model()
+
+LANGUAGES = list(dict(settings.MIOLINGO_LANGUAGES).keys())
+
+
+class Command(BaseCommand):
+    help = (
+        "Translate with DeepL the translations of a user without any trans in "
+        "the given language, and link them to the results."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("username")
+        parser.add_argument("lang", choices=LANGUAGES)
+        parser.add_argument("--src", choices=LANGUAGES)
+        parser.add_argument("--limit", type=int)
+        parser.add_argument("--batch-size", type=int)
+        parser.add_argument("--workers", type=int)
+
+    def handle(self, *args, **options):
+        user = User.objects.get(username=options["username"])
+
+        try:
+            translator = AutoTranslator(
+                batch_size=options["batch_size"], workers=options["workers"]
+            )
+            with use_shard(get_user_shard(user)):
+                counts = autotranslate(
+                    user,
+                    options["lang"],
+                    src=options["src"],
+                    limit=options["limit"],
+                    translator=translator,
+                )
+        except AutotranslateError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{counts['translations']} translations translated "
+                f"({counts['requested']} requested), {counts['created']} created "
+                f"and {counts['linked']} linked."
+            )
+        )
@@ -0,0 +1,100 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+
+try:
+    from miolingo.core.benchmark import (
+        compare,
+        dump_baseline,
+        load_baseline,
+        run,
+        run_renderers,
+        seed,
+    )
+except ImportError:  # pragma: no cover
+    # Data are seeded with the factories of tests (factory-boy), a test
+    # dependency not installed in production.
+    seed = None
+
+BASELINE = settings.PROJECT_DIR / "core" / "data" / "benchmark.json"
+
+
+class Command(BaseCommand):
+    help = "Measure latency and queries count of each API route."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--translations", type=int, default=2000)
+        parser.add_argument("--lessons", type=int, default=10)
+        parser.add_argument("--words", type=int, default=200)
+        parser.add_argument("--trainings", type=int, default=20)
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--baseline", default=BASELINE)
+        parser.add_argument("--update-baseline", action="store_true")
+        parser.add_argument(
+            "--renderers",
+            action="store_true",
+            help="Only compare renderers on the lessons payload.",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=1.5,
+            help="Max latency ratio against the baseline, 0 to only check queries.",
+        )
+
+    def handle(self, *args, **options):
+        if seed is None:
+            raise CommandError(
+                "factory-boy is required to seed data, install the test "
+                "dependencies (poetry install --with test)."
+            )
+
+        # Seeded data are always rolled back.
+        with transaction.atomic(), override_settings(ALLOWED_HOSTS=["testserver"]):
+            self.stdout.write("Seeding data...")
+            user = seed(
+                translations=options["translations"],
+                lessons=options["lessons"],
+                words=options["words"],
+                trainings=options["trainings"],
+                random_seed=options["seed"],
+            )
+
+            if options["renderers"]:
+                self.stdout.write("Running renderers...")
+                renderers = run_renderers(user, iterations=options["iterations"])
+            else:
+                self.stdout.write("Running scenarios...")
+                results = run(user, iterations=options["iterations"])
+            transaction.set_rollback(True)
+
+        if options["renderers"]:
+            for name, result in renderers.items():
+                self.stdout.write(
+                    f"{name:<25} p50={result['p50']:>8.2f}ms "
+                    f"p95={result['p95']:>8.2f}ms size={result['size']}"
+                )
+            return
+
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<25} p50={result['p50']:>8.2f}ms p95={result['p95']:>8.2f}ms "
+                f"p99={result['p99']:>8.2f}ms queries={result['queries']}"
+            )
+
+        if options["update_baseline"]:
+            dump_baseline(results, options["baseline"])
+            self.stdout.write(self.style.SUCCESS("Baseline updated successfully."))
+            return
+
+        regressions = compare(
+            results, load_baseline(options["baseline"]), options["tolerance"]
+        )
+        if regressions:
+            for regression in regressions:
+                self.stdout.write(self.style.ERROR(regression))
+            raise CommandError(f"{len(regressions)} regression(s) detected.")
+
+        self.stdout.write(self.style.SUCCESS("No regression detected."))
@@ -0,0 +1,46 @@
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from miolingo.core.buffers import get_stat_buffer
+
+
+class Command(BaseCommand):
+    help = (
+        "Insert the buffered answers of trainings not answered for a while, "
+        "once or every interval until stopped (SIGINT or SIGTERM)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--max-age",
+            type=float,
+            default=settings.MIOLINGO_STATS_BUFFER_MAX_AGE,
+            help="Seconds since the last answer of a training.",
+        )
+        parser.add_argument(
+            "--interval", type=float, help="Seconds between flushes, once if not set."
+        )
+
+    def handle(self, *args, **options):
+        buffer = get_stat_buffer()
+        if buffer is None:
+            raise CommandError("MIOLINGO_STATS_BUFFER_DIR is not set.")
+
+        stopping = threading.Event()
+        if options["interval"]:  # pragma: no cover
+            for signum in [signal.SIGINT, signal.SIGTERM]:
+                signal.signal(signum, lambda *args: stopping.set())
+
+        while True:
+            count = buffer.flush_all(max_age=options["max_age"])
+            self.stdout.write(self.style.SUCCESS(f"{count} answers inserted."))
+            for path in buffer.failed:
+                self.stderr.write(
+                    f"Answers which cannot be inserted set aside in {path}."
+                )
+            buffer.failed.clear()
+            if not options["interval"] or stopping.wait(options["interval"]):
+                break
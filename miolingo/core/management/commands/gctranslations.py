@@ -0,0 +1,111 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef
+from django.utils.timezone import now
+
+from miolingo.core.models import Lesson, Stat, Translation
+from miolingo.core.sharding import get_user_shard
+
+User = get_user_model()
+
+
+def get_orphans(db, min_age):
+    """
+    Return translations without any trans, lesson or stat (anti-joins), not
+    modified for min_age at least.
+    """
+    TranslationThrough = Translation.trans.through
+    LessonThrough = Lesson.translations.through
+    return Translation.objects.using(db).filter(
+        ~Exists(
+            TranslationThrough.objects.using(db).filter(from_translation=OuterRef("pk"))
+        ),
+        ~Exists(LessonThrough.objects.using(db).filter(translation=OuterRef("pk"))),
+        ~Exists(Stat.objects.using(db).filter(translation=OuterRef("pk"))),
+        modified_at__lt=now() - min_age,
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete orphan translations (without trans, lessons and stats) by chunks, "
+        "each in its own short transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--username", help="Only the translations of a user.")
+        parser.add_argument(
+            "--min-age",
+            type=float,
+            default=24,
+            help="Hours since the last change, to spare translations being edited.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--sleep", type=float, default=0, help="Seconds to wait between chunks."
+        )
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        self.options = options
+        min_age = timedelta(hours=options["min_age"])
+
+        if options["username"]:
+            user = User.objects.get(username=options["username"])
+            db = get_user_shard(user)
+            querysets = [get_orphans(db, min_age).filter(user_id=user.pk)]
+        else:
+            dbs = settings.MIOLINGO_SHARD_DATABASES or ["default"]
+            querysets = [get_orphans(db, min_age) for db in dbs]
+
+        count = 0
+        skipped = 0
+        for queryset in querysets:
+            for chunk in self.chunks(queryset):
+                if options["dry_run"]:
+                    count += len(chunk)
+                    continue
+
+                try:
+                    with transaction.atomic(using=queryset.db):
+                        # Still orphans, or linked meanwhile?
+                        _, deleted = queryset.filter(pk__in=chunk).delete()
+                except IntegrityError:
+                    # Linked by a concurrent write, retried on the next run.
+                    skipped += len(chunk)
+                else:
+                    deleted = deleted.get(Translation._meta.label, 0)
+                    count += deleted
+                    skipped += len(chunk) - deleted
+
+                if options["sleep"]:
+                    time.sleep(options["sleep"])
+
+        if options["dry_run"]:
+            self.stdout.write(self.style.SUCCESS(f"{count} orphan translations found."))
+            return
+
+        if skipped:
+            self.stdout.write(
+                self.style.WARNING(f"{skipped} translations linked meanwhile skipped.")
+            )
+        self.stdout.write(self.style.SUCCESS(f"{count} orphan translations deleted."))
+
+    def chunks(self, queryset):
+        """
+        Yield pks of the queryset by chunks, without loading them all.
+        """
+        size = self.options["batch_size"]
+        last = 0
+        while True:
+            pks = queryset.filter(pk__gt=last).order_by("pk")
+            pks = list(pks.values_list("pk", flat=True)[:size])
+            if not pks:
+                break
+            yield pks
+            last = pks[-1]
@@ -0,0 +1,147 @@
+from time import perf_counter
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from miolingo.core.buffers import get_stat_buffer
+from miolingo.core.models import DataVersion, Lesson, Stat, Training, Translation
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Move the data of a user to another shard. Rows get new primary keys on "
+        "the target shard, references between them are renumbered along. "
+        "Ids stored by clients (e.g: of lessons or trainings) are broken then. "
+        "Writes of the user during the move are lost, deactivate it before."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("username")
+        parser.add_argument("shard")
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        start = perf_counter()
+        self.batch_size = options["batch_size"]
+
+        user = User.objects.get(username=options["username"])
+        src = user.shard or "default"
+        dst = options["shard"]
+
+        if dst not in settings.MIOLINGO_SHARD_DATABASES:
+            raise CommandError(f"'{dst}' is not a shard.")
+        if src == dst:
+            raise CommandError(f"User data are already on '{dst}'.")
+
+        if not connections[dst].features.can_return_rows_from_bulk_insert:
+            raise CommandError(f"'{dst}' cannot return primary keys of bulk inserts.")
+
+        trainings = Training.objects.using(src).filter(user_id=user.pk)
+        # Buffered answers reference the trainings on the source shard.
+        buffer = get_stat_buffer()
+        if buffer is not None:
+            for training_id in trainings.values_list("pk", flat=True):
+                buffer.flush(src, training_id)
+
+        TranslationThrough = Translation.trans.through
+        LessonThrough = Lesson.translations.through
+        with transaction.atomic(using=dst):
+            translations = self.copy(
+                Translation.objects.using(src).filter(user_id=user.pk), dst
+            )
+            self.copy(
+                TranslationThrough.objects.using(src).filter(
+                    from_translation__user_id=user.pk
+                ),
+                dst,
+                from_translation_id=translations,
+                to_translation_id=translations,
+            )
+            lessons = self.copy(Lesson.objects.using(src).filter(user_id=user.pk), dst)
+            self.copy(
+                LessonThrough.objects.using(src).filter(lesson__user_id=user.pk),
+                dst,
+                lesson_id=lessons,
+                translation_id=translations,
+            )
+            trainings = self.copy(trainings, dst, lesson_id=lessons, deck=translations)
+            stats = self.copy(
+                Stat.objects.using(src).filter(training__user_id=user.pk),
+                dst,
+                training_id=trainings,
+                translation_id=translations,
+            )
+
+        # From now on, the user data are read and written on the target shard.
+        user.shard = dst
+        user.save(update_fields=["shard"])
+
+        with transaction.atomic(using=src):
+            # Cascades delete everything else.
+            Lesson.objects.using(src).filter(user_id=user.pk).delete()
+            Translation.objects.using(src).filter(user_id=user.pk).delete()
+            # Created again by the next change on the target shard.
+            DataVersion.objects.using(src).filter(user_id=user.pk).delete()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(translations)} translations, {len(lessons)} lessons, "
+                f"{len(trainings)} trainings and {len(stats)} stats moved "
+                f"from '{src}' to '{dst}' in {perf_counter() - start:.2f}s."
+            )
+        )
+
+    def chunks(self, iterable):
+        batch = []
+        for item in iterable:
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def copy(self, queryset, dst, **remap):
+        """
+        Copy the rows to the target shard under new primary keys, with the
+        foreign keys given as keyword arguments (attname=mapping) renumbered,
+        or lists of them (i.e: decks). Return the mapping of old to new pks.
+        Timestamps set on save (auto_now, auto_now_add) are kept as they were.
+        """
+        model = queryset.model
+        timestamps = [
+            field.attname
+            for field in model._meta.concrete_fields
+            if getattr(field, "auto_now", False)
+            or getattr(field, "auto_now_add", False)
+        ]
+
+        pks = {}
+        objs = queryset.order_by("pk").iterator(self.batch_size)
+        for batch in self.chunks(objs):
+            old_pks = [obj.pk for obj in batch]
+            values = [[getattr(obj, name) for name in timestamps] for obj in batch]
+            for obj in batch:
+                obj.pk = None
+                for attname, mapping in remap.items():
+                    value = getattr(obj, attname)
+                    if isinstance(value, list):
+                        # Translations deleted since are left out.
+                        value = [mapping[pk] for pk in value if pk in mapping]
+                    elif value is not None:
+                        value = mapping[value]
+                    setattr(obj, attname, value)
+            model.objects.using(dst).bulk_create(batch)
+            if timestamps:
+                # Overwritten with now by bulk_create, unlike by bulk_update.
+                for obj, row in zip(batch, values):
+                    for name, value in zip(timestamps, row):
+                        setattr(obj, name, value)
+                model.objects.using(dst).bulk_update(batch, timestamps)
+            pks.update(zip(old_pks, (obj.pk for obj in batch)))
+
+        return pks
@@ -0,0 +1,77 @@
+import os
+import signal
+import socket
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from miolingo.core.jobs import claim, run
+from miolingo.core.models import Job
+
+
+class Command(BaseCommand):
+    help = (
+        "Run background jobs with a pool of threads, until stopped (SIGINT or "
+        "SIGTERM). Many workers can run concurrently, even on other hosts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=4)
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=settings.MIOLINGO_JOBS_POLL_INTERVAL,
+            help="Seconds to wait when no job is pending.",
+        )
+        parser.add_argument(
+            "--burst", action="store_true", help="Stop once no job is pending."
+        )
+
+    def handle(self, *args, **options):
+        self.interval = options["interval"]
+        self.burst = options["burst"]
+        self.stopping = threading.Event()
+        self.lock = threading.Lock()
+        self.counts = Counter()
+
+        if not self.burst:  # pragma: no cover
+            for signum in [signal.SIGINT, signal.SIGTERM]:
+                signal.signal(signum, lambda *args: self.stopping.set())
+
+        name = f"{socket.gethostname()}:{os.getpid()}"
+        threads = [
+            threading.Thread(target=self.work, args=[f"{name}:{i}"])
+            for i in range(0, options["threads"])
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{self.counts[Job.Status.SUCCEEDED]} jobs succeeded, "
+                f"{self.counts[Job.Status.FAILED]} failed and "
+                f"{self.counts[Job.Status.PENDING]} to retry."
+            )
+        )
+
+    def work(self, worker):
+        try:
+            while not self.stopping.is_set():
+                job = claim(worker)
+                if job is None:
+                    if self.burst:
+                        break
+                    self.stopping.wait(self.interval)  # pragma: no cover
+                    continue  # pragma: no cover
+
+                job = run(job)
+                with self.lock:
+                    self.counts[job.status] += 1
+        finally:
+            # Connections are per thread.
+            connections.close_all()
@@ -0,0 +1,227 @@
+import random
+from datetime import timedelta
+from time import perf_counter
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.text import slugify
+from django.utils.timezone import now
+
+try:
+    from faker import Faker
+except ImportError:  # pragma: no cover
+    # A test dependency, not installed in production.
+    Faker = None
+
+from miolingo.core.models import Lesson, Stat, Training, Translation
+from miolingo.core.sharding import pick_shard, use_shard
+from miolingo.core.utils import hash_slug
+
+User = get_user_model()
+
+LANGUAGES = list(dict(settings.MIOLINGO_LANGUAGES).keys())
+LOCALES = {
+    "fr": "fr_FR",
+    "en": "en_US",
+    "es": "es_ES",
+}
+POOL_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = "Generate a large synthetic dataset with bulk inserts."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10)
+        parser.add_argument("--words", type=int, default=1000, help="Per user.")
+        parser.add_argument("--lessons", type=int, default=10, help="Per user.")
+        parser.add_argument("--lesson-size", type=int, default=100)
+        parser.add_argument("--trainings", type=int, default=20, help="Per user.")
+        parser.add_argument("--password", default="test")
+        parser.add_argument("--prefix", default="seed")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        if Faker is None:
+            raise CommandError(
+                "Faker is required to seed data, install the test dependencies "
+                "(poetry install --with test)."
+            )
+
+        start = perf_counter()
+        self.batch_size = options["batch_size"]
+        self.rand = random.Random(options["seed"])
+        self.fake = Faker(list(LOCALES.values()))
+        self.fake.seed_instance(options["seed"])
+
+        prefix = options["prefix"]
+        if User.objects.filter(username__startswith=f"{prefix}_").exists():
+            raise CommandError(f"Users with prefix '{prefix}' already exist.")
+
+        # Pre-generate Faker values once, then only pick into them.
+        pools = {
+            lang: self.fake[locale].words(nb=POOL_SIZE)
+            for lang, locale in LOCALES.items()
+            if lang in LANGUAGES
+        }
+        first_names = [self.fake.first_name() for i in range(0, POOL_SIZE)]
+        last_names = [self.fake.last_name() for i in range(0, POOL_SIZE)]
+
+        password = make_password(options["password"])  # Hashing is slow, once.
+        users = User.objects.bulk_create(
+            [
+                User(
+                    username=f"{prefix}_{i}",
+                    email=f"{prefix}_{i}@example.com",
+                    password=password,
+                    first_name=self.rand.choice(first_names),
+                    last_name=self.rand.choice(last_names),
+                    source_lang=self.rand.choice(LANGUAGES),
+                    shard=pick_shard(f"{prefix}_{i}"),  # Bulk insert skip signals.
+                )
+                for i in range(0, options["users"])
+            ],
+            batch_size=self.batch_size,
+        )
+        if users and users[0].pk is None:  # pragma: no cover
+            users = list(User.objects.filter(username__startswith=f"{prefix}_"))
+
+        counts = {"translations": 0, "lessons": 0, "trainings": 0, "stats": 0}
+        for user in users:
+            with use_shard(user.shard), transaction.atomic(using=user.shard):
+                self.seed_user(user, pools, options, counts)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(users)} users, {counts['translations']} translations, "
+                f"{counts['lessons']} lessons, {counts['trainings']} trainings and "
+                f"{counts['stats']} stats generated in {perf_counter() - start:.2f}s."
+            )
+        )
+
+    def seed_user(self, user, pools, options, counts):
+        src = user.source_lang
+        tgt = self.rand.choice([lang for lang in LANGUAGES if lang != src])
+
+        # Words come by pairs: source and its translation.
+        num = options["words"] // 2
+        sources = self.create_translations(user, src, pools[src], num)
+        targets = self.create_translations(user, tgt, pools[tgt], num)
+
+        Through = Translation.trans.through
+        self.bulk_create(
+            Through,
+            # Self M2M is symmetrical, so we need both directions.
+            (
+                Through(from_translation_id=a.pk, to_translation_id=b.pk)
+                for s, t in zip(sources, targets)
+                for a, b in ((s, t), (t, s))
+            ),
+        )
+        counts["translations"] += len(sources) + len(targets)
+
+        source_pks = [t.pk for t in sources]
+        lessons = Lesson.objects.bulk_create(
+            [
+                Lesson(
+                    name=" ".join(self.rand.choices(pools[src], k=2)),
+                    priority=self.rand.randint(0, 10),
+                    user=user,
+                )
+                for i in range(0, options["lessons"])
+            ],
+            batch_size=self.batch_size,
+        )
+        lesson_pks = {}
+        for lesson in lessons:
+            size = min(options["lesson_size"], len(source_pks))
+            lesson_pks[lesson.pk] = self.rand.sample(source_pks, size)
+
+        Through = Lesson.translations.through
+        self.bulk_create(
+            Through,
+            (
+                Through(lesson_id=lesson_pk, translation_id=translation_pk)
+                for lesson_pk, pks in lesson_pks.items()
+                for translation_pk in pks
+            ),
+        )
+        counts["lessons"] += len(lessons)
+
+        if not lessons:
+            return
+
+        started_at = now()
+        trainings = []
+        results = []
+        for i in range(0, options["trainings"]):
+            lesson_pk = self.rand.choice(list(lesson_pks))
+            succeed = [self.rand.random() < 0.7 for pk in lesson_pks[lesson_pk]]
+            results.append((lesson_pk, succeed))
+            trainings.append(
+                Training(
+                    lesson_id=lesson_pk,
+                    user=user,
+                    finished_at=started_at
+                    + timedelta(seconds=self.rand.randint(60, 900)),
+                    score=sum(succeed),
+                )
+            )
+        trainings = Training.objects.bulk_create(trainings, batch_size=self.batch_size)
+        counts["trainings"] += len(trainings)
+
+        counts["stats"] += self.bulk_create(
+            Stat,
+            (
+                Stat(training_id=training.pk, translation_id=pk, succeed=success)
+                for training, (lesson_pk, succeed) in zip(trainings, results)
+                for pk, success in zip(lesson_pks[lesson_pk], succeed)
+            ),
+        )
+
+    def create_translations(self, user, lang, pool, num):
+        translations = []
+        slugs = set()
+        while len(translations) < num:
+            text = " ".join(self.rand.choices(pool, k=self.rand.randint(1, 3)))
+            slug = slugify(text)
+            while slug in slugs:
+                text = f"{text} {len(translations)}"
+                slug = slugify(text)
+            slugs.add(slug)
+
+            # Bulk insert skip save(), so compute slugs here.
+            translations.append(
+                Translation(
+                    lang=lang,
+                    text=text,
+                    slug=slug,
+                    slug_hash=hash_slug(slug),
+                    priority=self.rand.randint(0, 10),
+                    user=user,
+                )
+            )
+        return Translation.objects.bulk_create(translations, batch_size=self.batch_size)
+
+    def bulk_create(self, model, objs):
+        """
+        Insert objects from a generator by chunks, to bound memory usage.
+        """
+        count = 0
+        batch = []
+        for obj in objs:
+            batch.append(obj)
+            if len(batch) >= self.batch_size:
+                model.objects.bulk_create(batch, batch_size=self.batch_size)
+                count += len(batch)
+                batch = []
+
+        if batch:
+            model.objects.bulk_create(batch, batch_size=self.batch_size)
+            count += len(batch)
+
+        return count
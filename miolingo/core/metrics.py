@@ -0,0 +1,168 @@
+import atexit
+import json
+import os
+import threading
+from collections import defaultdict
+from pathlib import Path
+from time import monotonic
+
+from django.conf import settings
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class MetricsRegistry:
+    """
+    Per route/method requests counters, latency histograms and DB time.
+
+    In multi-process mode (MIOLINGO_METRICS_DIR), each process dumps its own
+    metrics into the shared directory and collect() sums them all.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.pid = os.getpid()
+        self.last_flush = monotonic()
+        self.requests = defaultdict(int)
+        self.latency = defaultdict(lambda: [0] * (len(BUCKETS) + 1))
+        self.latency_sum = defaultdict(float)
+        self.db = defaultdict(float)
+
+    @property
+    def directory(self):
+        directory = settings.MIOLINGO_METRICS_DIR
+        return Path(directory) if directory else None
+
+    def observe(self, route, method, status, duration, db_duration=0.0):
+        with self.lock:
+            if self.pid != os.getpid():
+                # Forked worker: parent metrics belong to the parent process.
+                self.reset()
+
+            self.requests[(route, method, str(status))] += 1
+            self.latency[(route, method)][self._bucket(duration)] += 1
+            self.latency_sum[(route, method)] += duration
+            self.db[(route, method)] += db_duration
+
+            interval = settings.MIOLINGO_METRICS_FLUSH_INTERVAL
+            if self.directory and monotonic() - self.last_flush >= interval:
+                self._flush()
+
+    def _bucket(self, duration):
+        for i, bound in enumerate(BUCKETS):
+            if duration <= bound:
+                return i
+        return len(BUCKETS)
+
+    def dump(self):
+        return {
+            "requests": [[*k, v] for k, v in self.requests.items()],
+            "latency": [[*k, v] for k, v in self.latency.items()],
+            "latency_sum": [[*k, v] for k, v in self.latency_sum.items()],
+            "db": [[*k, v] for k, v in self.db.items()],
+        }
+
+    def flush(self):
+        with self.lock:
+            self._flush()
+
+    def _flush(self):
+        directory = self.directory
+        if not directory or self.pid != os.getpid():
+            return
+
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{self.pid}.json"
+        tmp_path = directory / f".{self.pid}.json.tmp"
+        tmp_path.write_text(json.dumps(self.dump()))
+        os.replace(tmp_path, path)  # Atomic, readers never see partial files.
+        self.last_flush = monotonic()
+
+    def collect(self):
+        if not self.directory:
+            with self.lock:
+                return self.dump()
+
+        self.flush()
+        dumps = []
+        for path in self.directory.glob("*.json"):
+            try:
+                dumps.append(json.loads(path.read_text()))
+            except (OSError, ValueError):  # pragma: no cover
+                continue
+        return merge(dumps)
+
+
+def merge(dumps):
+    requests = defaultdict(int)
+    latency = defaultdict(lambda: [0] * (len(BUCKETS) + 1))
+    latency_sum = defaultdict(float)
+    db = defaultdict(float)
+
+    for dump in dumps:
+        for *key, value in dump["requests"]:
+            requests[tuple(key)] += value
+        for *key, counts in dump["latency"]:
+            latency[tuple(key)] = [a + b for a, b in zip(latency[tuple(key)], counts)]
+        for *key, value in dump["latency_sum"]:
+            latency_sum[tuple(key)] += value
+        for *key, value in dump["db"]:
+            db[tuple(key)] += value
+
+    return {
+        "requests": [[*k, v] for k, v in requests.items()],
+        "latency": [[*k, v] for k, v in latency.items()],
+        "latency_sum": [[*k, v] for k, v in latency_sum.items()],
+        "db": [[*k, v] for k, v in db.items()],
+    }
+
+
+def _labels(**labels):
+    values = ",".join(f'{k}="{v}"' for k, v in labels.items())
+    return f"{{{values}}}"
+
+
+def render_prometheus(data):
+    """
+    Render collected metrics with the Prometheus text exposition format.
+    """
+    lines = [
+        "# HELP miolingo_http_requests_total Total number of HTTP requests.",
+        "# TYPE miolingo_http_requests_total counter",
+    ]
+    for route, method, status, value in sorted(data["requests"]):
+        labels = _labels(route=route, method=method, status=status)
+        lines.append(f"miolingo_http_requests_total{labels} {value}")
+
+    name = "miolingo_http_request_duration_seconds"
+    lines += [
+        f"# HELP {name} HTTP request latency in seconds.",
+        f"# TYPE {name} histogram",
+    ]
+    sums = {(route, method): value for route, method, value in data["latency_sum"]}
+    for route, method, counts in sorted(data["latency"]):
+        cumulative = 0
+        for bound, count in zip(BUCKETS + ("+Inf",), counts):
+            cumulative += count
+            labels = _labels(route=route, method=method, le=bound)
+            lines.append(f"{name}_bucket{labels} {cumulative}")
+        labels = _labels(route=route, method=method)
+        lines.append(f"{name}_sum{labels} {sums.get((route, method), 0.0)}")
+        lines.append(f"{name}_count{labels} {cumulative}")
+
+    name = "miolingo_http_request_db_seconds_total"
+    lines += [
+        f"# HELP {name} Time spent in SQL queries in seconds.",
+        f"# TYPE {name} counter",
+    ]
+    for route, method, value in sorted(data["db"]):
+        lines.append(f"{name}{_labels(route=route, method=method)} {value}")
+
+    return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+atexit.register(registry.flush)
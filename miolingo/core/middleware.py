@@ -0,0 +1,216 @@
+import hashlib
+import logging
+from time import perf_counter
+
+from django.conf import settings
+
+from rest_framework.permissions import SAFE_METHODS
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from miolingo.core.cache import get_cache
+from miolingo.core.instrumentation import collect_timings
+from miolingo.core.metrics import registry
+from miolingo.core.routers import use_primary
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncCapableMiddleware:
+    """
+    Run natively in both WSGI and ASGI, to not push async views into a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.handle(request)
+
+    async def __acall__(self, request):
+        return await self.ahandle(request)
+
+
+class ServerTimingMiddleware(AsyncCapableMiddleware):
+    """
+    Measure time spent in SQL, view, serialization and rendering, then log it.
+    It is also exposed with the Server-Timing header to staff users, in DEBUG
+    or to all clients if MIOLINGO_SERVER_TIMING is enabled.
+
+    In async views, queries run in threads and are not measured.
+    """
+
+    def handle(self, request):
+        start = perf_counter()
+
+        with collect_timings() as timings:
+            request._timings = timings
+            response = self.get_response(request)
+
+        return self.finish(request, response, timings, start)
+
+    async def ahandle(self, request):
+        start = perf_counter()
+
+        with collect_timings() as timings:
+            request._timings = timings
+            response = await self.get_response(request)
+
+        return self.finish(request, response, timings, start)
+
+    def finish(self, request, response, timings, start):
+        if hasattr(request, "_view_started_at") and "view" not in timings.durations:
+            timings.add("view", perf_counter() - request._view_started_at)
+        timings.add("total", perf_counter() - start)
+
+        if self.is_exposed(request):
+            response["Server-Timing"] = timings.as_header()
+        self.log(request, response, timings)
+
+        return response
+
+    def is_exposed(self, request):
+        if settings.DEBUG or settings.MIOLINGO_SERVER_TIMING:
+            return True
+        # Authenticated by the view (i.e: DRF), or by the session.
+        user = getattr(request, "user", None)
+        return bool(user and user.is_staff)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._view_started_at = perf_counter()
+
+    def process_template_response(self, request, response):
+        timings = request._timings
+        render_started_at = perf_counter()
+
+        if hasattr(request, "_view_started_at"):
+            timings.add("view", render_started_at - request._view_started_at)
+
+        def rendered(response):
+            timings.add("render", perf_counter() - render_started_at)
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    def log(self, request, response, timings):
+        durations = " ".join(
+            f"{name}={duration * 1000:.2f}ms"
+            for name, duration in timings.durations.items()
+        )
+        logger.info(
+            f"method={request.method} path={request.path} "
+            f"status={response.status_code} queries={timings.queries} {durations}",
+            extra={
+                "method": request.method,
+                "path": request.path,
+                "status_code": response.status_code,
+                "queries": timings.queries,
+                "durations": dict(timings.durations),
+            },
+        )
+
+        budget = settings.MIOLINGO_QUERY_BUDGET
+        if budget and timings.queries > budget:
+            logger.warning(
+                f"Query budget exceeded for {request.method} {request.path}: "
+                f"{timings.queries} queries (budget: {budget}).",
+            )
+
+
+class MetricsMiddleware(AsyncCapableMiddleware):
+    """
+    Record requests count, latency and DB time per route and method.
+    """
+
+    def handle(self, request):
+        start = perf_counter()
+        response = self.get_response(request)
+        return self.observe(request, response, start)
+
+    async def ahandle(self, request):
+        start = perf_counter()
+        response = await self.get_response(request)
+        return self.observe(request, response, start)
+
+    def observe(self, request, response, start):
+        duration = perf_counter() - start
+
+        match = request.resolver_match
+        route = match.view_name if match else "unmatched"
+
+        timings = getattr(request, "_timings", None)
+        db_duration = timings.durations.get("db", 0.0) if timings else 0.0
+
+        registry.observe(
+            route, request.method, response.status_code, duration, db_duration
+        )
+        return response
+
+
+class ReplicaRoutingMiddleware(AsyncCapableMiddleware):
+    """
+    Let reads of safe methods of the API go to replicas, except for clients
+    which just wrote something: they stick to the primary to read their own
+    writes. Other routes (i.e: the admin) always use the primary.
+    """
+
+    prefix = "/api/"
+
+    def handle(self, request):
+        if not self.is_routed(request):
+            return self.get_response(request)
+
+        key = self.get_sticky_key(request)
+        is_write = request.method not in SAFE_METHODS
+        is_sticky = bool(key and get_cache().get(key))
+
+        with use_primary(is_write or is_sticky):
+            response = self.get_response(request)
+
+        if is_write and key:
+            get_cache().set(key, True, timeout=settings.MIOLINGO_REPLICA_STICKINESS)
+
+        return response
+
+    async def ahandle(self, request):
+        if not self.is_routed(request):
+            return await self.get_response(request)
+
+        key = self.get_sticky_key(request)
+        is_write = request.method not in SAFE_METHODS
+        is_sticky = bool(key and await get_cache().aget(key))
+
+        with use_primary(is_write or is_sticky):
+            response = await self.get_response(request)
+
+        if is_write and key:
+            await get_cache().aset(
+                key, True, timeout=settings.MIOLINGO_REPLICA_STICKINESS
+            )
+
+        return response
+
+    def is_routed(self, request):
+        return bool(settings.MIOLINGO_REPLICA_DATABASES) and (
+            request.path_info.startswith(self.prefix)
+        )
+
+    def get_sticky_key(self, request):
+        """
+        Identify the client by its credentials: JWT or session.
+        """
+        credentials = request.headers.get("Authorization") or request.COOKIES.get(
+            settings.SESSION_COOKIE_NAME
+        )
+        if not credentials:
+            return None
+
+        digest = hashlib.md5(credentials.encode()).hexdigest()
+        return f"miolingo:primary:{digest}"
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.6 on 2026-10-19 05:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='translation',
+            name='slug_hash',
+            field=models.BigIntegerField(editable=False, null=True),
+        ),
+    ]
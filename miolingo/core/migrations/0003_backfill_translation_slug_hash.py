@@ -0,0 +1,41 @@
+# Generated by Django 4.2.6 on 2026-10-19 05:10
+
+from django.db import migrations, transaction
+
+from miolingo.core.utils import hash_slug
+
+BATCH_SIZE = 2000
+
+
+def backfill_slug_hash(apps, schema_editor):
+    Translation = apps.get_model('core', 'Translation')
+    db_alias = schema_editor.connection.alias
+
+    qs = Translation.objects.using(db_alias).filter(slug_hash__isnull=True).order_by('pk')
+    last_pk = 0
+    while True:
+        batch = list(qs.filter(pk__gt=last_pk).only('pk', 'slug')[:BATCH_SIZE])
+        if not batch:
+            break
+
+        for obj in batch:
+            obj.slug_hash = hash_slug(obj.slug)
+
+        # One short transaction per batch to avoid locking the whole table.
+        with transaction.atomic(using=db_alias):
+            Translation.objects.using(db_alias).bulk_update(batch, ['slug_hash'])
+
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('core', '0002_translation_slug_hash'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_slug_hash, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.6 on 2026-10-19 05:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_backfill_translation_slug_hash'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='translation',
+            name='slug_hash',
+            field=models.BigIntegerField(editable=False),
+        ),
+        migrations.AlterUniqueTogether(
+            name='translation',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='translation',
+            constraint=models.UniqueConstraint(fields=('user', 'lang', 'slug_hash'), name='core_translation_unique_slug_hash'),
+        ),
+    ]
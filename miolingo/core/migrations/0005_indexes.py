@@ -0,0 +1,43 @@
+# Generated by Django 4.2.6 on 2026-10-19 05:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0004_translation_unique_slug_hash"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="lesson",
+            index=models.Index(
+                fields=["user", "-priority", "name"], name="core_lesson_user_prio_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="lesson",
+            index=models.Index(
+                fields=["user", "is_active", "-priority", "name"],
+                name="core_lesson_user_active_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="stat",
+            index=models.Index(
+                fields=["training", "succeed"], name="core_stat_training_succeed_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="translation",
+            index=models.Index(
+                fields=["user", "-priority"], name="core_trans_user_prio_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="translation",
+            index=models.Index(
+                fields=["user", "text"], name="core_trans_user_text_idx"
+            ),
+        ),
+    ]
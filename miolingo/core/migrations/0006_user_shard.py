@@ -0,0 +1,60 @@
+# Generated by Django 4.2.6 on 2026-10-19 05:25
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def assign_default_shard(apps, schema_editor):
+    # Existing users data are all stored on the default database.
+    User = apps.get_model("core", "User")
+    User.objects.using(schema_editor.connection.alias).update(shard="default")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0005_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="shard",
+            field=models.CharField(editable=False, max_length=64, null=True),
+        ),
+        migrations.RunPython(
+            assign_default_shard,
+            migrations.RunPython.noop,
+            hints={"model_name": "user"},
+        ),
+        migrations.AlterField(
+            model_name="lesson",
+            name="user",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="lessons",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="training",
+            name="user",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="trainings",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="translation",
+            name="user",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="translations",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+    ]
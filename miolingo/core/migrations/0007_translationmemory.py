@@ -0,0 +1,59 @@
+# Generated by Django 4.2.6 on 2026-10-19 05:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0006_user_shard"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TranslationMemory",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "source_lang",
+                    models.CharField(
+                        choices=[
+                            ("fr", "French"),
+                            ("en", "English"),
+                            ("es", "Spanish"),
+                        ],
+                        max_length=2,
+                    ),
+                ),
+                (
+                    "target_lang",
+                    models.CharField(
+                        choices=[
+                            ("fr", "French"),
+                            ("en", "English"),
+                            ("es", "Spanish"),
+                        ],
+                        max_length=2,
+                    ),
+                ),
+                ("text", models.CharField(max_length=2048)),
+                ("text_hash", models.BigIntegerField(editable=False)),
+                ("result", models.CharField(max_length=2048)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="translationmemory",
+            constraint=models.UniqueConstraint(
+                fields=("source_lang", "target_lang", "text_hash"),
+                name="core_memory_unique_text_hash",
+            ),
+        ),
+    ]
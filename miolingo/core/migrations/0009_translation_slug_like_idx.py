@@ -0,0 +1,20 @@
+# Generated by Django 4.2.6 on 2026-10-19 05:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0008_job"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="translation",
+            index=models.Index(
+                fields=["slug"],
+                name="core_trans_slug_like_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.6 on 2026-10-19 06:27
+
+from django.db import migrations, models
+
+
+def backfill_heartbeat_at(apps, schema_editor):
+    Job = apps.get_model("core", "Job")
+    db_alias = schema_editor.connection.alias
+
+    # Running jobs are reclaimed on their heartbeat from now on.
+    Job.objects.using(db_alias).filter(status="running").update(
+        heartbeat_at=models.F("started_at")
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0010_dataversion"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="heartbeat_at",
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.RunPython(
+            backfill_heartbeat_at,
+            migrations.RunPython.noop,
+            hints={"model_name": "job"},
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.6 on 2026-10-19 06:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0011_job_heartbeat_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="training",
+            name="deck",
+            field=models.JSONField(editable=False, null=True),
+        ),
+    ]
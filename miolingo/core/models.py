@@ -2,6 +2,9 @@ from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.utils.text import slugify
+from django.utils.timezone import now
+
+from miolingo.core.utils import hash_slug
 
 
 class User(AbstractUser):
@@ -12,12 +15,16 @@ class User(AbstractUser):
         blank=True,
     )
 
+    # Database alias holding the user data, assigned on creation.
+    shard = models.CharField(max_length=64, null=True, editable=False)
+
 
 class Translation(models.Model):
     lang = models.CharField(max_length=2, choices=settings.MIOLINGO_LANGUAGES)
 
     text = models.CharField(max_length=2048)
     slug = models.SlugField(max_length=2048, null=True, editable=False)
+    slug_hash = models.BigIntegerField(editable=False)
 
     priority = models.PositiveSmallIntegerField(default=0)
 
@@ -28,12 +35,35 @@ class Translation(models.Model):
         User,
         on_delete=models.CASCADE,
         related_name="translations",
+        # Users are on the default DB, not on shards, so no foreign key can be
+        # enforced there. The schema cannot depend on a setting, so it is left
+        # out of every deployment, sharded or not: deletes of users cascade in
+        # Django only (and on shards by the delete_sharded_data signal), rows
+        # deleted by raw SQL leave orphans behind. Same for lessons, trainings
+        # and data versions.
+        db_constraint=False,
     )
 
     trans = models.ManyToManyField("self")
 
     class Meta:
-        unique_together = ("lang", "slug", "user")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "lang", "slug_hash"],
+                name="core_translation_unique_slug_hash",
+            ),
+        ]
+        indexes = [
+            # TranslationViewset: filter by user, order by -priority or text.
+            models.Index(fields=["user", "-priority"], name="core_trans_user_prio_idx"),
+            models.Index(fields=["user", "text"], name="core_trans_user_text_idx"),
+            # Admin: search by slug prefix (LIKE 'slug%'), whatever the collation.
+            models.Index(
+                fields=["slug"],
+                name="core_trans_slug_like_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ]
 
     def __str__(self):
         return f"{self.text} ({self.lang})"
@@ -41,6 +71,7 @@ class Translation(models.Model):
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.text)
+        self.slug_hash = hash_slug(self.slug)
         return super().save(*args, **kwargs)
 
 
@@ -53,14 +84,49 @@ class Lesson(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     modified_at = models.DateTimeField(auto_now=True)
 
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="lessons")
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="lessons",
+        db_constraint=False,
+    )
 
     translations = models.ManyToManyField(Translation, related_name="lessons")
 
+    class Meta:
+        indexes = [
+            # LessonViewset: filter by user (and is_active), order by -priority, name.
+            models.Index(
+                fields=["user", "-priority", "name"],
+                name="core_lesson_user_prio_idx",
+            ),
+            models.Index(
+                fields=["user", "is_active", "-priority", "name"],
+                name="core_lesson_user_active_idx",
+            ),
+        ]
+
     def __str__(self):
         return self.name
 
 
+class DataVersion(models.Model):
+    """
+    Version of the user data, i.e: the timestamp (ns) of its last change,
+    stored with them so that all workers read the same one.
+    """
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="data_version",
+        db_constraint=False,
+    )
+
+    version = models.BigIntegerField(default=0)
+
+
 class Training(models.Model):
     lesson = models.ForeignKey(
         Lesson,
@@ -72,12 +138,15 @@ class Training(models.Model):
         User,
         on_delete=models.CASCADE,
         related_name="trainings",
+        db_constraint=False,
     )
 
     started_at = models.DateTimeField(auto_now_add=True)
     finished_at = models.DateTimeField(null=True)
 
     score = models.PositiveSmallIntegerField(null=True, editable=False)
+    # Ids of the translations drawn from the lesson, None for all of them.
+    deck = models.JSONField(null=True, editable=False)
 
 
 class Stat(models.Model):
@@ -96,3 +165,100 @@ class Stat(models.Model):
     )
 
     succeed = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            # TrainingUpdateSerializer: count succeed stats of a training.
+            models.Index(
+                fields=["training", "succeed"],
+                name="core_stat_training_succeed_idx",
+            ),
+        ]
+
+
+class TranslationMemory(models.Model):
+    """
+    Machine translations of texts, shared by all users, so the same text is
+    never requested twice to the provider.
+    """
+
+    source_lang = models.CharField(max_length=2, choices=settings.MIOLINGO_LANGUAGES)
+    target_lang = models.CharField(max_length=2, choices=settings.MIOLINGO_LANGUAGES)
+
+    text = models.CharField(max_length=2048)
+    text_hash = models.BigIntegerField(editable=False)
+    result = models.CharField(max_length=2048)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["source_lang", "target_lang", "text_hash"],
+                name="core_memory_unique_text_hash",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.text} ({self.source_lang} > {self.target_lang})"
+
+    def save(self, *args, **kwargs):
+        self.text_hash = hash_slug(self.text)
+        return super().save(*args, **kwargs)
+
+
+class Job(models.Model):
+    """
+    Background job of a user, run by the workers (see runworker command).
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending"
+        RUNNING = "running"
+        SUCCEEDED = "succeeded"
+        FAILED = "failed"
+
+    kind = models.CharField(max_length=64)
+    payload = models.JSONField(default=dict)
+
+    status = models.CharField(
+        max_length=16, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=1)
+    progress = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(null=True)
+    result = models.JSONField(null=True)
+    error = models.TextField(blank=True)
+    worker = models.CharField(max_length=256, blank=True)
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="jobs")
+
+    run_at = models.DateTimeField(default=now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True)
+    # Last sign of life of the worker running the job.
+    heartbeat_at = models.DateTimeField(null=True)
+    finished_at = models.DateTimeField(null=True)
+
+    class Meta:
+        indexes = [
+            # Workers: claim pending jobs by run_at.
+            models.Index(fields=["status", "run_at"], name="core_job_status_run_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
+
+    def set_progress(self, progress, total=None):
+        """
+        Save the progress, which is a heartbeat too, unless the job was claimed
+        again by another worker meanwhile.
+        """
+        self.progress = progress
+        if total is not None:
+            self.total = total
+        self.heartbeat_at = now()
+        Job.objects.filter(pk=self.pk, worker=self.worker).update(
+            progress=self.progress, total=self.total, heartbeat_at=self.heartbeat_at
+        )
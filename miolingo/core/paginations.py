@@ -1,8 +1,99 @@
+import json
+
 from django.conf import settings
+from django.core.paginator import InvalidPage, Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
 
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
 
+from asgiref.sync import sync_to_async
+
+
+def get_estimated_count(queryset):
+    """
+    Return the rows estimate of the PostgreSQL planner for the queryset (from
+    the tables statistics), or None if not available.
+    """
+    if not isinstance(queryset, QuerySet):
+        return None
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    sql, params = queryset.order_by().query.get_compiler(queryset.db).as_sql()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):  # pragma: no cover
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Count with the planner estimate if above the threshold, which is way faster
+    than COUNT(*) on large tables, else exactly. Last pages may then be empty,
+    or missing.
+    """
+
+    @property
+    def threshold(self):
+        # Read at runtime, so it can be overridden like any setting.
+        return settings.MIOLINGO_PAGINATION_ESTIMATE_THRESHOLD
+
+    @cached_property
+    def count(self):
+        estimate = get_estimated_count(self.object_list)
+        if estimate is not None and estimate >= self.threshold:
+            return estimate
+        return super().count
+
 
 class MiolingoPageNumberPagination(PageNumberPagination):
     page_size_query_param = "page_size"
     max_page_size = settings.MIOLINGO_PAGINATION_MAX_PAGE_SIZE
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Same as paginate_queryset(), but count and fetch the page with the async
+        ORM.
+        """
+        page_size = self.get_page_size(request)
+        if not page_size:  # pragma: no cover
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await self.acount(paginator)  # Instead of cached property.
+        page_number = self.get_page_number(request, paginator)
+
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            )
+            raise NotFound(msg)
+
+        self.request = request
+        self.page.object_list = [obj async for obj in self.page.object_list.aiterator()]
+        return list(self.page)
+
+    async def acount(self, paginator):
+        return await paginator.object_list.acount()
+
+
+class EstimatedPageNumberPagination(MiolingoPageNumberPagination):
+    """
+    Opt-in pagination of large querysets, with an estimated count.
+    """
+
+    django_paginator_class = EstimatedCountPaginator
+
+    async def acount(self, paginator):
+        estimate = await sync_to_async(get_estimated_count)(paginator.object_list)
+        if estimate is not None and estimate >= paginator.threshold:
+            return estimate
+        return await super().acount(paginator)
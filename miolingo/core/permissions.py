@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.utils.crypto import constant_time_compare
+
+from rest_framework.permissions import BasePermission
+
+
+class HasMetricsToken(BasePermission):
+    """
+    Allow scrapers sending the MIOLINGO_METRICS_TOKEN as a bearer token.
+    """
+
+    def has_permission(self, request, view):
+        token = settings.MIOLINGO_METRICS_TOKEN
+        if not token:
+            return False
+
+        header = request.headers.get("Authorization", "")
+        return constant_time_compare(header, f"Bearer {token}")
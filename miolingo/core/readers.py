@@ -0,0 +1,201 @@
+from collections import defaultdict
+
+from django.db.models import Prefetch
+
+from rest_framework.fields import DateTimeField
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
+
+from miolingo.core.instrumentation import track
+from miolingo.core.models import Lesson, Translation
+
+# Same fields, in the same order, than the serializers.
+TRANSLATION_FIELDS = ["id", "lang", "text", "slug", "priority"]
+LESSON_FIELDS = ["id", "name", "created_at", "modified_at", "priority", "is_active"]
+
+# Nested translations are ordered by pk, whatever the read path. Only the
+# serialized columns are loaded.
+TRANS_PREFETCH = Prefetch(
+    "trans", queryset=Translation.objects.only(*TRANSLATION_FIELDS).order_by("pk")
+)
+
+
+def _get_or_build(identity, db, values):
+    instance = identity.get(values[0])
+    if instance is None:
+        # Values of TRANSLATION_FIELDS, which are in the model fields order.
+        instance = Translation.from_db(db, TRANSLATION_FIELDS, values)
+        identity[instance.pk] = instance
+    return instance
+
+
+def _set_prefetched(instance, name, objs):
+    """
+    Set objs as the prefetched objects of the relation, like prefetch_related()
+    does (see django.db.models.query.prefetch_one_level). No public API does it
+    from rows already loaded: these private attributes are pinned by a test
+    against Django upgrades, and only set here.
+    """
+    queryset = getattr(instance, name).all()
+    queryset._result_cache = objs
+    queryset._prefetch_done = True
+    if not hasattr(instance, "_prefetched_objects_cache"):
+        instance._prefetched_objects_cache = {}
+    instance._prefetched_objects_cache[name] = queryset
+
+
+def prefetch_trans(translations, identity=None):
+    """
+    Lean prefetch of translations trans, with one pass on the through table
+    joined to the serialized columns. Instances are shared with the identity
+    map (pk: instance), which is completed.
+    """
+    if not translations:
+        return
+    if identity is None:
+        identity = {translation.pk: translation for translation in translations}
+
+    db = translations[0]._state.db
+    fields = [f"to_translation__{field}" for field in TRANSLATION_FIELDS]
+    rows = (
+        Translation.trans.through.objects.using(db)
+        .filter(
+            from_translation_id__in=[translation.pk for translation in translations]
+        )
+        .order_by("to_translation_id")
+        .values_list("from_translation_id", *fields)
+    )
+
+    trans = defaultdict(list)
+    for pk, *values in rows:
+        trans[pk].append(_get_or_build(identity, db, values))
+    for translation in translations:
+        _set_prefetched(translation, "trans", trans.get(translation.pk, []))
+
+
+def prefetch_translations(lessons, decks=None):
+    """
+    Lean prefetch of lessons translations and their trans (2 queries), where
+    translations shared by lessons and trans are a single instance.
+
+    Translations can be restricted to decks (e.g: of trainings), a list of
+    translation ids per lesson, or None for all of them.
+    """
+    if not lessons:
+        return
+    if decks is None:
+        decks = [None] * len(lessons)
+
+    db = lessons[0]._state.db
+    fields = [f"translation__{field}" for field in TRANSLATION_FIELDS]
+    rows = Lesson.translations.through.objects.using(db).filter(
+        lesson_id__in=[lesson.pk for lesson in lessons]
+    )
+    if None not in decks:
+        rows = rows.filter(translation_id__in={pk for deck in decks for pk in deck})
+    rows = rows.order_by("translation_id").values_list("lesson_id", *fields)
+
+    identity = {}
+    translations = defaultdict(list)
+    for pk, *values in rows:
+        translations[pk].append(_get_or_build(identity, db, values))
+    for lesson, deck in zip(lessons, decks):
+        objs = translations.get(lesson.pk, [])
+        if deck is not None:
+            deck = set(deck)
+            objs = [obj for obj in objs if obj.pk in deck]
+        _set_prefetched(lesson, "translations", objs)
+
+    prefetch_trans(list(identity.values()), identity)
+
+
+def _leaves(queryset, key, prefix):
+    """
+    Map the key of each through row to its translation leaves, in one query.
+    """
+    fields = [f"{prefix}__{field}" for field in TRANSLATION_FIELDS]
+    rows = queryset.order_by(f"{prefix}_id").values_list(key, *fields)
+
+    leaves = defaultdict(list)
+    for pk, *values in rows:
+        leaves[pk].append(dict(zip(TRANSLATION_FIELDS, values)))
+    return leaves
+
+
+def get_trans(ids):
+    Through = Translation.trans.through
+    queryset = Through.objects.filter(from_translation_id__in=ids)
+    return _leaves(queryset, "from_translation_id", "to_translation")
+
+
+def build_translations(rows):
+    """
+    Same data than TranslationSerializer, from values() of TRANSLATION_FIELDS.
+    """
+    trans = get_trans([row["id"] for row in rows])
+    for row in rows:
+        row["trans"] = trans.get(row["id"], [])
+    return rows
+
+
+def build_lessons(rows):
+    """
+    Same data than LessonSerializer, from values() of LESSON_FIELDS.
+    """
+    Through = Lesson.translations.through
+    queryset = Through.objects.filter(lesson_id__in=[row["id"] for row in rows])
+    translations = _leaves(queryset, "lesson_id", "translation")
+
+    # Translations shared by lessons are only built once.
+    identity = {}
+    for leaves in translations.values():
+        for i, leaf in enumerate(leaves):
+            leaves[i] = identity.setdefault(leaf["id"], leaf)
+    trans = get_trans(list(identity))
+    for translation in identity.values():
+        translation["trans"] = trans.get(translation["id"], [])
+
+    field = DateTimeField()
+    for row in rows:
+        row["created_at"] = field.to_representation(row["created_at"])
+        row["modified_at"] = field.to_representation(row["modified_at"])
+        row["translations"] = translations.get(row["id"], [])
+    return rows
+
+
+class ValuesReadMixin:
+    """
+    Serve list and retrieve from values() and plain dicts, without any model
+    instance neither serializer. Output is identical to the serializers.
+    """
+
+    values_fields = []
+
+    def build(self, rows):  # pragma: no cover
+        raise NotImplementedError
+
+    def get_values_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        return queryset.prefetch_related(None).values(*self.values_fields)
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.get_values_queryset()
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            with track("serialize"):
+                data = self.build(page)
+            return self.get_paginated_response(data)
+
+        with track("serialize"):
+            data = self.build(list(queryset))
+        return Response(data)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        filter_kwargs = {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        row = get_object_or_404(self.get_values_queryset(), **filter_kwargs)
+
+        with track("serialize"):
+            data = self.build([row])[0]
+        return Response(data)
@@ -0,0 +1,91 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+from miolingo.core.sharding import (
+    SHARDED_MODELS,
+    get_current_shard,
+    get_shards,
+    is_sharded,
+)
+
+# Outside of a request (commands, shell, etc), always use the primary.
+_use_primary = ContextVar("miolingo_use_primary", default=True)
+
+
+@contextmanager
+def use_primary(value=True):
+    token = _use_primary.set(value)
+    try:
+        yield
+    finally:
+        _use_primary.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Send reads to one of MIOLINGO_REPLICA_DATABASES, unless the current
+    request must use the primary (see ReplicaRoutingMiddleware).
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.MIOLINGO_REPLICA_DATABASES
+        if not replicas or _use_primary.get():
+            return None
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data than the primary.
+        aliases = {"default", *settings.MIOLINGO_REPLICA_DATABASES}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+
+class ShardRouter:
+    """
+    Store learner data (see SHARDED_MODELS) on the shard of their user, among
+    MIOLINGO_SHARD_DATABASES. Everything else (auth, admin, sessions, etc)
+    stays on the default database.
+    """
+
+    def _db_for_model(self, model, **hints):
+        shards = get_shards()
+        if not shards:
+            return None
+
+        instance = hints.get("instance")
+        if not is_sharded(model):
+            # Related objects of a sharded instance are not on its shard.
+            if instance is not None and is_sharded(type(instance)):
+                return "default"
+            return None
+
+        if instance is not None:
+            if is_sharded(type(instance)) and instance._state.db:
+                return instance._state.db
+            # Related objects of a user are on its shard.
+            if getattr(instance, "shard", None):
+                return instance.shard
+        return get_current_shard() or "default"
+
+    db_for_read = _db_for_model
+    db_for_write = _db_for_model
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if not get_shards():
+            return None
+        if is_sharded(type(obj1)) and is_sharded(type(obj2)):
+            return obj1._state.db == obj2._state.db
+        # Sharded rows reference users of the default database.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == "default" or db not in get_shards():
+            return None
+        return app_label == "core" and model_name in SHARDED_MODELS
@@ -0,0 +1,110 @@
+import heapq
+import random
+
+from django.conf import settings
+
+from miolingo.core.cache import get_cache, get_data_version
+from miolingo.core.models import Lesson
+
+WEIGHTED = "weighted"
+UNIFORM = "uniform"
+STRATEGIES = [WEIGHTED, UNIFORM]
+
+# Draws of the alias table per word of the deck, before falling back to a
+# sort of the remaining words (e.g: a few words with most of the weight).
+MAX_DRAWS_FACTOR = 4
+
+
+class AliasTable:
+    """
+    Walker's alias method (Vose's variant): built in O(n) from ids and their
+    weights, then each draw is O(1), whatever the number of ids.
+    """
+
+    def __init__(self, ids, weights):
+        self.ids = list(ids)
+        self.weights = list(weights)
+        count = len(self.ids)
+        total = sum(self.weights)
+
+        self.prob = [0.0] * count
+        self.alias = [0] * count
+        scaled = [weight * count / total for weight in self.weights] if total else []
+        small = [i for i, p in enumerate(scaled) if p < 1]
+        large = [i for i, p in enumerate(scaled) if p >= 1]
+
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.prob[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1 - scaled[less]
+            (small if scaled[more] < 1 else large).append(more)
+
+        # Left overs are 1, give or take rounding errors.
+        for i in small + large:
+            self.prob[i] = 1.0
+
+    def __len__(self):
+        return len(self.ids)
+
+    def draw(self, rand=random):
+        i = rand.randrange(len(self.ids))
+        return i if rand.random() < self.prob[i] else self.alias[i]
+
+
+def get_alias_table(lesson):
+    """
+    Return the alias table of the lesson translations weighted by priority,
+    cached until the user data changes.
+    """
+    timeout = settings.MIOLINGO_DECK_CACHE_TIMEOUT
+    if not timeout:
+        return build_alias_table(lesson)
+
+    cache = get_cache()
+    key = f"miolingo:deck:{lesson.user_id}:{get_data_version(lesson.user_id)}:{lesson.pk}"  # fmt: skip
+    table = cache.get(key)
+    if table is None:
+        table = build_alias_table(lesson)
+        cache.set(key, table, timeout=timeout)
+    return table
+
+
+def build_alias_table(lesson):
+    Through = Lesson.translations.through
+    rows = list(
+        Through.objects.filter(lesson=lesson.pk)
+        .order_by("translation_id")
+        .values_list("translation_id", "translation__priority")
+    )
+    # Translations without priority can still be drawn.
+    return AliasTable(
+        [pk for pk, priority in rows], [priority + 1 for pk, priority in rows]
+    )
+
+
+def sample_deck(lesson, size, strategy=WEIGHTED, rand=random):
+    """
+    Return the ids of size distinct translations of the lesson, at random
+    (with the priority as weight unless uniform), in O(size) on average.
+    """
+    table = get_alias_table(lesson)
+    if size >= len(table):
+        deck = list(table.ids)
+        rand.shuffle(deck)
+        return deck
+
+    if strategy == UNIFORM:
+        return rand.sample(table.ids, size)
+
+    picked = {}
+    for _ in range(0, size * MAX_DRAWS_FACTOR):
+        picked.setdefault(table.draw(rand), None)
+        if len(picked) == size:
+            return [table.ids[i] for i in picked]
+
+    # Weighted sampling without replacement (Efraimidis-Spirakis) of the rest.
+    left = (i for i in range(0, len(table)) if i not in picked)
+    keys = ((rand.random() ** (1 / table.weights[i]), i) for i in left)
+    rest = heapq.nlargest(size - len(picked), keys)
+    return [table.ids[i] for i in picked] + [table.ids[i] for _, i in rest]
@@ -1,22 +1,55 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.utils.text import slugify
-
-from rest_framework.fields import CurrentUserDefault, HiddenField
-from rest_framework.serializers import ModelSerializer
+from django.db import IntegrityError, router, transaction
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.fields import (
+    ChoiceField,
+    CurrentUserDefault,
+    FileField,
+    HiddenField,
+    IntegerField,
+    ListField,
+)
+from rest_framework.serializers import ListSerializer, ModelSerializer, Serializer
 
+from miolingo.core.buffers import get_stat_buffer
 from miolingo.core.fields import PrimaryKeyOwnerRelatedField
-from miolingo.core.models import Lesson, Stat, Training, Translation
+from miolingo.core.instrumentation import track
+from miolingo.core.models import Job, Lesson, Stat, Training, Translation
+from miolingo.core.sampling import STRATEGIES, WEIGHTED, sample_deck
+from miolingo.core.utils import hash_text
 from miolingo.core.validators import (
     IsActiveLessonValidator,
-    UniqueTogetherTranslationValidator,
+    IsUnfinishedTrainingValidator,
+    TrainingDeckValidator,
+    UniqueTogetherTranslationListValidator,
+    is_unique_translation_violation,
+    unique_translation_error,
 )
 
 User = get_user_model()
 
 
-class UserSerializer(ModelSerializer):
+class TimedSerializerMixin:
+    @property
+    def data(self):
+        with track("serialize"):
+            return super().data
+
+
+class TimedListSerializer(TimedSerializerMixin, ListSerializer):
+    pass
+
+
+class MiolingoModelSerializer(TimedSerializerMixin, ModelSerializer):
+    pass
+
+
+class UserSerializer(MiolingoModelSerializer):
     class Meta:
         model = User
+        list_serializer_class = TimedListSerializer
         fields = [
             "id",
             "username",
@@ -32,9 +65,10 @@ class UserSaveSerializer(UserSerializer):
         fields = ["email", "first_name", "last_name", "source_lang"]
 
 
-class TranslationLeafSerializer(ModelSerializer):
+class TranslationLeafSerializer(MiolingoModelSerializer):
     class Meta:
         model = Translation
+        list_serializer_class = TimedListSerializer
         fields = ["id", "lang", "text", "slug", "priority"]
         extra_kwargs = {
             "slug": {
@@ -53,27 +87,54 @@ class TranslationSerializer(TranslationLeafSerializer):
         fields = TranslationLeafSerializer.Meta.fields + ["trans"]
 
 
+class TranslationSaveListSerializer(TimedListSerializer):
+    def to_internal_value(self, data):
+        items = super().to_internal_value(data)
+        # Once for all, instead of on insert.
+        UniqueTogetherTranslationListValidator()(items, self)
+        return items
+
+    def create(self, validated_data):
+        with transaction.atomic(using=router.db_for_write(Translation)):
+            return super().create(validated_data)
+
+
 class TranslationSaveSerializer(TranslationLeafSerializer):
     trans = TranslationLeafSerializer(many=True, required=False, allow_null=True)
     user = HiddenField(default=CurrentUserDefault())
 
     class Meta(TranslationLeafSerializer.Meta):
+        list_serializer_class = TranslationSaveListSerializer
         fields = TranslationLeafSerializer.Meta.fields + ["trans", "user"]
-        validators = [
-            UniqueTogetherTranslationValidator(),
-        ]
+        # Uniqueness is enforced by the database, no need to check it first.
+        validators = []
+
+    def save(self, **kwargs):
+        # One transaction with its trans: the user data version is bumped once.
+        with transaction.atomic(using=router.db_for_write(Translation)):
+            return super().save(**kwargs)
+
+    def save_unique(self, save, *args):
+        try:
+            # Savepoint, so that the transaction is still usable on failure.
+            with transaction.atomic(using=router.db_for_write(Translation)):
+                return save(*args)
+        except IntegrityError as exc:
+            if is_unique_translation_violation(exc):
+                raise unique_translation_error()
+            raise
 
     def create(self, validated_data):
         trans_data = validated_data.pop("trans", [])
 
-        instance = super().create(validated_data)
+        instance = self.save_unique(super().create, validated_data)
 
         translations = []
         for data in trans_data:
             trans, created = Translation.objects.get_or_create(
                 user=instance.user,
                 lang=data["lang"],
-                slug=slugify(data["text"]),
+                slug_hash=hash_text(data["text"]),
                 defaults={
                     "text": data["text"],
                     "priority": data["priority"],
@@ -89,7 +150,10 @@ class TranslationSaveSerializer(TranslationLeafSerializer):
     def update(self, instance, validated_data):
         trans_data = validated_data.pop("trans", None)
 
-        instance = super().update(instance, validated_data)
+        if "text" in validated_data:
+            # Slug (and its hash) are computed again on save.
+            instance.slug = None
+        instance = self.save_unique(super().update, instance, validated_data)
 
         if trans_data is not None:
             translations = []
@@ -97,7 +161,7 @@ class TranslationSaveSerializer(TranslationLeafSerializer):
                 trans, updated = Translation.objects.update_or_create(
                     user=instance.user,
                     lang=data["lang"],
-                    slug=slugify(data["text"]),
+                    slug_hash=hash_text(data["text"]),
                     defaults={
                         "text": data["text"],
                         "priority": data["priority"],
@@ -105,7 +169,7 @@ class TranslationSaveSerializer(TranslationLeafSerializer):
                 )
                 translations.append(trans)
 
-            # @TODO - it may be orphans words/trans... cleanup with cron command?
+            # Trans left orphans are deleted by the gctranslations command.
             if translations:
                 instance.trans.set(translations)
             else:
@@ -114,11 +178,12 @@ class TranslationSaveSerializer(TranslationLeafSerializer):
         return instance
 
 
-class LessonSerializer(ModelSerializer):
+class LessonSerializer(MiolingoModelSerializer):
     translations = TranslationSerializer(many=True, read_only=True)
 
     class Meta:
         model = Lesson
+        list_serializer_class = TimedListSerializer
         fields = [
             "id",
             "name",
@@ -144,18 +209,25 @@ class LessonSaveSerializer(LessonSerializer):
     class Meta(LessonSerializer.Meta):
         fields = LessonSerializer.Meta.fields + ["user"]
 
+    def save(self, **kwargs):
+        # One transaction with its translations, like TranslationSaveSerializer.
+        with transaction.atomic(using=router.db_for_write(Lesson)):
+            return super().save(**kwargs)
+
 
-class TrainingSerializer(ModelSerializer):
+class TrainingSerializer(MiolingoModelSerializer):
     lesson = LessonSerializer(read_only=True)
 
     class Meta:
         model = Training
+        list_serializer_class = TimedListSerializer
         fields = [
             "id",
             "lesson",
             "started_at",
             "finished_at",
             "score",
+            "deck",
         ]
 
 
@@ -166,9 +238,38 @@ class TrainingCreateSerializer(TrainingSerializer):
         validators=[IsActiveLessonValidator()],  # For explicit error message
     )
     user = HiddenField(default=CurrentUserDefault())
+    size = IntegerField(
+        write_only=True,
+        required=False,
+        min_value=1,
+        max_value=settings.MIOLINGO_DECK_MAX_SIZE,
+        help_text="Number of words to draw from the lesson, all by default.",
+    )
+    strategy = ChoiceField(choices=STRATEGIES, write_only=True, default=WEIGHTED)
+    deck = ListField(
+        child=IntegerField(),
+        read_only=True,
+        allow_null=True,
+        help_text="Ids of the translations drawn, null for the whole lesson.",
+    )
 
     class Meta(TrainingSerializer.Meta):
-        fields = ["id", "lesson", "user"]
+        fields = ["id", "lesson", "user", "size", "strategy", "deck"]
+
+    def validate(self, attrs):
+        if attrs.get("size") is not None and not attrs["lesson"].translations.exists():
+            raise ValidationError({"size": "The lesson has no translations to draw."})
+        return attrs
+
+    def create(self, validated_data):
+        size = validated_data.pop("size", None)
+        strategy = validated_data.pop("strategy")
+
+        if size is not None:
+            validated_data["deck"] = sample_deck(
+                validated_data["lesson"], size, strategy
+            )
+        return super().create(validated_data)
 
 
 class TrainingUpdateSerializer(TrainingSerializer):
@@ -176,23 +277,90 @@ class TrainingUpdateSerializer(TrainingSerializer):
         fields = ["id", "finished_at"]
 
     def update(self, instance, validated_data):
+        buffer = get_stat_buffer()
+        if buffer is not None:
+            buffer.flush(instance._state.db, instance.pk)
         instance.score = instance.stats.filter(succeed=True).count()
         return super().update(instance, validated_data)
 
 
-class StatSerializer(ModelSerializer):
+class StatSerializer(MiolingoModelSerializer):
     training = TrainingSerializer()
     translation = TranslationSerializer()
 
     class Meta:
         model = Stat
+        list_serializer_class = TimedListSerializer
         fields = ["id", "created_at", "training", "translation", "succeed"]
 
 
 class StatSaveSerializer(StatSerializer):
     training = PrimaryKeyOwnerRelatedField(
-        required=True, queryset=Training.objects.all()
+        required=True,
+        queryset=Training.objects.all(),
+        validators=[IsUnfinishedTrainingValidator()],
     )
     translation = PrimaryKeyOwnerRelatedField(
         required=True, queryset=Translation.objects.all()
     )
+
+    class Meta(StatSerializer.Meta):
+        validators = [TrainingDeckValidator()]
+
+
+class AutotranslateSerializer(Serializer):
+    lang = ChoiceField(choices=settings.MIOLINGO_LANGUAGES)
+    src = ChoiceField(choices=settings.MIOLINGO_LANGUAGES, required=False)
+    limit = IntegerField(
+        min_value=1,
+        max_value=settings.MIOLINGO_AUTOTRANSLATE_LIMIT,
+        default=settings.MIOLINGO_AUTOTRANSLATE_LIMIT,
+    )
+
+
+class JobSerializer(MiolingoModelSerializer):
+    class Meta:
+        model = Job
+        list_serializer_class = TimedListSerializer
+        fields = [
+            "id",
+            "kind",
+            "status",
+            "attempts",
+            "progress",
+            "total",
+            "result",
+            "error",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+
+
+class JobListSerializer(JobSerializer):
+    """
+    Jobs without their result (e.g: the content of an export), to retrieve.
+    """
+
+    class Meta(JobSerializer.Meta):
+        fields = [field for field in JobSerializer.Meta.fields if field != "result"]
+
+
+class ExportJobSerializer(Serializer):
+    src = ChoiceField(choices=settings.MIOLINGO_LANGUAGES)
+    tgt = ChoiceField(choices=settings.MIOLINGO_LANGUAGES)
+
+
+class ImportJobSerializer(ExportJobSerializer):
+    file = FileField()
+
+    def validate_file(self, value):
+        try:
+            return value.read().decode("utf-8")
+        except UnicodeDecodeError:
+            raise ValidationError("File must be UTF-8 encoded.")
+
+    def validate(self, attrs):
+        # Jobs payload are JSON.
+        attrs["content"] = attrs.pop("file")
+        return attrs
@@ -0,0 +1,97 @@
+import hashlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+# Models whose rows are stored on the shard of their user, including the
+# auto-created M2M through tables.
+SHARDED_MODELS = {
+    "translation",
+    "translation_trans",
+    "lesson",
+    "lesson_translations",
+    "training",
+    "stat",
+    "dataversion",
+}
+
+_current_shard = ContextVar("miolingo_current_shard", default=None)
+
+
+def is_sharded(model):
+    return model._meta.app_label == "core" and model._meta.model_name in SHARDED_MODELS
+
+
+def get_shards():
+    return settings.MIOLINGO_SHARD_DATABASES
+
+
+def get_current_shard():
+    return _current_shard.get()
+
+
+@contextmanager
+def use_shard(alias):
+    token = _current_shard.set(alias)
+    try:
+        yield
+    finally:
+        _current_shard.reset(token)
+
+
+def pick_shard(username):
+    """
+    Placement of a new user: a stable hash of its username over the shards.
+    """
+    shards = get_shards() or ["default"]
+    digest = hashlib.md5(username.encode()).hexdigest()
+    return shards[int(digest, 16) % len(shards)]
+
+
+def get_user_shard(user):
+    """
+    Return the database alias holding the user data.
+    """
+    if not user or not user.is_authenticated:
+        return "default"
+
+    from miolingo.core.models import User
+
+    if isinstance(user, User):
+        return user.shard or "default"
+
+    # Stateless users (TokenUser) don't have the shard loaded.
+    shard = User.objects.filter(pk=user.pk).values_list("shard", flat=True).first()
+    return shard or "default"
+
+
+async def aget_user_shard(user):
+    from miolingo.core.models import User
+
+    if not user or not user.is_authenticated:
+        return "default"
+    if isinstance(user, User):
+        return user.shard or "default"
+
+    queryset = User.objects.filter(pk=user.pk).values_list("shard", flat=True)
+    return await queryset.afirst() or "default"
+
+
+class ShardedViewMixin:
+    """
+    Route queries on sharded models to the shard of the authenticated user,
+    once the request is authenticated.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if get_shards():
+            self._shard_token = _current_shard.set(get_user_shard(request.user))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, "_shard_token", None)
+        if token is not None:
+            _current_shard.reset(token)
+            self._shard_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
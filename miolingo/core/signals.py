@@ -0,0 +1,49 @@
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from miolingo.core.cache import bump_data_version, bump_user_version
+from miolingo.core.models import DataVersion, Lesson, Translation, User
+from miolingo.core.sharding import pick_shard
+
+
+@receiver(post_save, sender=Translation)
+@receiver(post_save, sender=Lesson)
+@receiver(post_delete, sender=Translation)
+@receiver(post_delete, sender=Lesson)
+def invalidate_user_data(sender, instance, using, **kwargs):
+    bump_data_version(instance.user_id, using=using)
+
+
+@receiver(m2m_changed, sender=Translation.trans.through)
+@receiver(m2m_changed, sender=Lesson.translations.through)
+def invalidate_user_relations(sender, instance, action, using, **kwargs):
+    if action in ["post_add", "post_remove", "post_clear"]:
+        bump_data_version(instance.user_id, using=using)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user(sender, instance, using, **kwargs):
+    bump_user_version(instance.pk, using=using)
+
+
+@receiver(pre_save, sender=User)
+def assign_shard(sender, instance, **kwargs):
+    if instance.shard is None:
+        instance.shard = pick_shard(instance.username)
+
+
+@receiver(pre_delete, sender=User)
+def delete_sharded_data(sender, instance, using, **kwargs):
+    # Cascades are emulated on the user database only.
+    shard = instance.shard or "default"
+    if shard != using:
+        Lesson.objects.using(shard).filter(user_id=instance.pk).delete()
+        Translation.objects.using(shard).filter(user_id=instance.pk).delete()
+        DataVersion.objects.using(shard).filter(user_id=instance.pk).delete()
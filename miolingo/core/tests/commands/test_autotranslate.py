@@ -0,0 +1,45 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from miolingo.core.factories import TranslationFactory, UserFactory
+from miolingo.core.tests.stubs import DeepLStubServer
+
+
+class AutotranslateCommandTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = cls.enterClassContext(DeepLStubServer())
+        cls.enterClassContext(
+            override_settings(
+                MIOLINGO_DEEPL_AUTH_KEY=cls.server.auth_key,
+                MIOLINGO_DEEPL_SERVER_URL=cls.server.url,
+            )
+        )
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.translations = [
+            TranslationFactory(user=cls.user, lang="fr", text=text)
+            for text in ["chat", "chien", "cheval"]
+        ]
+
+    def test_autotranslate(self):
+        out = StringIO()
+        call_command(
+            "autotranslate", self.user.username, "es", batch_size=2, stdout=out
+        )
+        self.assertIn(
+            "3 translations translated (3 requested), 3 created and 3 linked.",
+            out.getvalue(),
+        )
+        for translation in self.translations:
+            self.assertEqual(translation.trans.get().text, f"es {translation.text}")
+
+    @override_settings(MIOLINGO_DEEPL_AUTH_KEY="wrong")
+    def test_error(self):
+        with self.assertRaisesMessage(CommandError, "DeepL request failed"):
+            call_command("autotranslate", self.user.username, "es", stdout=StringIO())
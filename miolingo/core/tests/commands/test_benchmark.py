@@ -0,0 +1,83 @@
+import json
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from miolingo.core.models import Translation
+
+OPTIONS = {
+    "translations": 20,
+    "lessons": 1,
+    "words": 5,
+    "trainings": 1,
+    "iterations": 1,
+}
+
+
+class BenchmarkCommandTestCase(TestCase):
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.baseline = Path(self.tmpdir.name) / "baseline.json"
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_update_baseline(self):
+        out = StringIO()
+        call_command(
+            "benchmark",
+            stdout=out,
+            baseline=self.baseline,
+            update_baseline=True,
+            **OPTIONS,
+        )
+        self.assertIn("Baseline updated successfully.", out.getvalue())
+
+        with open(self.baseline) as fp:
+            baseline = json.load(fp)
+        self.assertIn("lessons-list", baseline)
+        self.assertEqual(
+            sorted(baseline["lessons-list"]), ["p50", "p95", "p99", "queries"]
+        )
+
+        # Seeded data are rolled back.
+        self.assertFalse(Translation.objects.exists())
+
+    def test_no_regression(self):
+        call_command(
+            "benchmark",
+            stdout=StringIO(),
+            baseline=self.baseline,
+            update_baseline=True,
+            **OPTIONS,
+        )
+
+        out = StringIO()
+        call_command(
+            "benchmark", stdout=out, baseline=self.baseline, tolerance=0, **OPTIONS
+        )
+        self.assertIn("No regression detected.", out.getvalue())
+
+    def test_regression(self):
+        with open(self.baseline, "w") as fp:
+            json.dump({"users-me": {"p50": 0, "p95": 0, "p99": 0, "queries": 0}}, fp)
+
+        out = StringIO()
+        with self.assertRaises(CommandError):
+            call_command("benchmark", stdout=out, baseline=self.baseline, **OPTIONS)
+        self.assertIn("users-me:", out.getvalue())
+
+    def test_renderers(self):
+        out = StringIO()
+        call_command("benchmark", renderers=True, stdout=out, **OPTIONS)
+        self.assertIn("FastJSONRenderer", out.getvalue())
+        self.assertFalse(self.baseline.exists())
+
+    @mock.patch("miolingo.core.management.commands.benchmark.seed", None)
+    def test_test_dependencies_missing(self):
+        with self.assertRaisesMessage(CommandError, "install the test dependencies"):
+            call_command("benchmark", stdout=StringIO(), **OPTIONS)
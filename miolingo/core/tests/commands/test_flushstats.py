@@ -0,0 +1,51 @@
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError
+from django.test import TestCase, override_settings
+
+from miolingo.core.buffers import get_stat_buffer
+from miolingo.core.factories import TrainingFactory
+from miolingo.core.models import Stat
+
+
+class FlushStatsCommandTestCase(TestCase):
+    def test_flush(self):
+        training = TrainingFactory()
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(MIOLINGO_STATS_BUFFER_DIR=directory):
+                buffer = get_stat_buffer()
+                for translation in training.lesson.translations.all():
+                    buffer.append(training, translation, True)
+
+                out = StringIO()
+                call_command("flushstats", "--max-age=0", stdout=out)
+
+        self.assertIn("3 answers inserted.", out.getvalue())
+        self.assertEqual(Stat.objects.filter(training=training).count(), 3)
+
+    def test_set_aside(self):
+        training = TrainingFactory(finished_at=None)
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(MIOLINGO_STATS_BUFFER_DIR=directory):
+                buffer = get_stat_buffer()
+                buffer.append(training, training.lesson.translations.first(), True)
+
+                err = StringIO()
+                with mock.patch(
+                    "django.db.models.query.QuerySet.bulk_create",
+                    side_effect=IntegrityError,
+                ), self.assertLogs("miolingo.core.buffers", "ERROR"):
+                    call_command(
+                        "flushstats", "--max-age=0", stdout=StringIO(), stderr=err
+                    )
+
+        self.assertIn("cannot be inserted set aside in", err.getvalue())
+        self.assertFalse(Stat.objects.exists())
+
+    @override_settings(MIOLINGO_STATS_BUFFER_DIR=None)
+    def test_disabled(self):
+        with self.assertRaises(CommandError):
+            call_command("flushstats")
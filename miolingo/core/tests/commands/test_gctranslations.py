@@ -0,0 +1,85 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.test import TestCase
+from django.utils.timezone import now
+
+from miolingo.core.factories import (
+    LessonFactory,
+    TrainingFactory,
+    TranslationFactory,
+    TranslationLeafFactory,
+    UserFactory,
+)
+from miolingo.core.models import Translation
+
+
+class GcTranslationsCommandTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.orphans = TranslationLeafFactory.create_batch(3, user=cls.user)
+        cls.other = TranslationLeafFactory()
+        # Not orphans: with trans, in a lesson or with stats.
+        cls.linked = TranslationFactory(user=cls.user, trans__num=1)
+        lesson = LessonFactory(user=cls.user, translations__num=1)
+        cls.in_lesson = lesson.translations.get()
+        training = TrainingFactory(user=cls.user, lesson=lesson, stats=True)
+        cls.with_stats = TranslationLeafFactory(user=cls.user)
+        training.stats.create(translation=cls.with_stats)
+        # Edited recently.
+        cls.recent = TranslationLeafFactory(user=cls.user)
+
+        Translation.objects.exclude(pk=cls.recent.pk).update(
+            modified_at=now() - timedelta(days=2)
+        )
+
+    def test_delete(self):
+        out = StringIO()
+        call_command("gctranslations", batch_size=2, stdout=out)
+        self.assertIn("4 orphan translations deleted.", out.getvalue())
+
+        self.assertQuerysetEqual(
+            Translation.objects.order_by("pk"),
+            sorted(
+                [
+                    self.linked.pk,
+                    self.linked.trans.get().pk,
+                    self.in_lesson.pk,
+                    self.with_stats.pk,
+                    self.recent.pk,
+                ]
+            ),
+            transform=lambda t: t.pk,
+        )
+
+    def test_user(self):
+        out = StringIO()
+        call_command("gctranslations", username=self.user.username, stdout=out)
+        self.assertIn("3 orphan translations deleted.", out.getvalue())
+        self.assertTrue(Translation.objects.filter(pk=self.other.pk).exists())
+
+    def test_min_age(self):
+        out = StringIO()
+        call_command("gctranslations", min_age=0, stdout=out)
+        self.assertIn("5 orphan translations deleted.", out.getvalue())
+        self.assertFalse(Translation.objects.filter(pk=self.recent.pk).exists())
+
+    def test_dry_run(self):
+        out = StringIO()
+        call_command("gctranslations", dry_run=True, batch_size=1, stdout=out)
+        self.assertIn("4 orphan translations found.", out.getvalue())
+        self.assertEqual(Translation.objects.count(), 9)
+
+    def test_linked_meanwhile(self):
+        out = StringIO()
+        with mock.patch(
+            "django.db.models.query.QuerySet.delete", side_effect=IntegrityError
+        ):
+            call_command("gctranslations", stdout=out)
+        self.assertIn("4 translations linked meanwhile skipped.", out.getvalue())
+        self.assertIn("0 orphan translations deleted.", out.getvalue())
+        self.assertEqual(Translation.objects.count(), 9)
@@ -0,0 +1,124 @@
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from miolingo.core.buffers import get_stat_buffer
+from miolingo.core.factories import LessonFactory, TrainingFactory, UserFactory
+from miolingo.core.models import Lesson, Stat, Training, Translation
+
+
+@override_settings(MIOLINGO_SHARD_DATABASES=["default", "shard"])
+class MoveUserCommandTestCase(TestCase):
+    databases = {"default", "shard"}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory(shard="default")
+        cls.lesson = LessonFactory(
+            user=cls.user, translations__num=3, translations__trans__num=1
+        )
+        TrainingFactory(
+            user=cls.user,
+            lesson=cls.lesson,
+            stats=True,
+            deck=list(cls.lesson.translations.values_list("pk", flat=True)),
+        )
+        cls.other = LessonFactory()
+
+    def test_move(self):
+        out = StringIO()
+        call_command("moveuser", self.user.username, "shard", batch_size=2, stdout=out)
+        self.assertIn(
+            "6 translations, 1 lessons, 1 trainings and 3 stats moved from "
+            "'default' to 'shard'",
+            out.getvalue(),
+        )
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.shard, "shard")
+
+        lesson = Lesson.objects.using("shard").get(user=self.user)
+        self.assertEqual(lesson.translations.count(), 3)
+        training = Training.objects.using("shard").get(user=self.user)
+        self.assertEqual(training.lesson, lesson)
+        self.assertCountEqual(
+            training.deck, lesson.translations.values_list("pk", flat=True)
+        )
+        for stat in Stat.objects.using("shard").filter(training=training):
+            self.assertEqual(stat.translation.user, self.user)
+        self.assertEqual(Stat.objects.using("shard").count(), 3)
+        for translation in Translation.objects.using("shard"):
+            self.assertEqual(translation.trans.count(), 1)
+            self.assertEqual(translation.trans.first().trans.first(), translation)
+
+        self.assertFalse(Translation.objects.filter(user=self.user).exists())
+        self.assertFalse(Training.objects.filter(user=self.user).exists())
+        # Other users are left untouched.
+        self.assertTrue(Lesson.objects.filter(pk=self.other.pk).exists())
+
+    def test_timestamps(self):
+        past = timezone.now() - timedelta(days=30)
+        Translation.objects.filter(user=self.user).update(
+            created_at=past, modified_at=past
+        )
+        Lesson.objects.filter(user=self.user).update(created_at=past, modified_at=past)
+        Training.objects.filter(user=self.user).update(started_at=past)
+        Stat.objects.filter(training__user=self.user).update(created_at=past)
+
+        call_command("moveuser", self.user.username, "shard", stdout=StringIO())
+
+        for translation in Translation.objects.using("shard").filter(user=self.user):
+            self.assertEqual(translation.created_at, past)
+            self.assertEqual(translation.modified_at, past)
+        lesson = Lesson.objects.using("shard").get(user=self.user)
+        self.assertEqual(lesson.created_at, past)
+        self.assertEqual(lesson.modified_at, past)
+        training = Training.objects.using("shard").get(user=self.user)
+        self.assertEqual(training.started_at, past)
+        for stat in Stat.objects.using("shard").filter(training=training):
+            self.assertEqual(stat.created_at, past)
+
+    def test_primary_keys_used(self):
+        # Rows of other users on the target shard, under the same primary keys.
+        translation = self.lesson.translations.first()
+        other = UserFactory(shard="shard")
+        Translation.objects.using("shard").create(
+            pk=translation.pk, user=other, lang="fr", text="Autre"
+        )
+        Lesson.objects.using("shard").create(pk=self.lesson.pk, user=other)
+
+        call_command("moveuser", self.user.username, "shard", stdout=StringIO())
+
+        lesson = Lesson.objects.using("shard").get(user=self.user)
+        self.assertNotEqual(lesson.pk, self.lesson.pk)
+        self.assertEqual({t.user_id for t in lesson.translations.all()}, {self.user.pk})
+        self.assertEqual(
+            Translation.objects.using("shard").get(pk=translation.pk).text, "Autre"
+        )
+        lesson = Lesson.objects.using("shard").get(pk=self.lesson.pk)
+        self.assertEqual(lesson.user_id, other.pk)
+
+    def test_buffered_stats(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        training = Training.objects.get(user=self.user)
+
+        with override_settings(MIOLINGO_STATS_BUFFER_DIR=directory.name):
+            get_stat_buffer().append(training, self.lesson.translations.first(), True)
+            call_command("moveuser", self.user.username, "shard", stdout=StringIO())
+
+        self.assertEqual(Stat.objects.using("shard").count(), 4)
+        self.assertEqual(os.listdir(directory.name), [])
+
+    def test_not_a_shard(self):
+        with self.assertRaisesMessage(CommandError, "'replica' is not a shard."):
+            call_command("moveuser", self.user.username, "replica")
+
+    def test_same_shard(self):
+        with self.assertRaisesMessage(CommandError, "already on 'default'"):
+            call_command("moveuser", self.user.username, "default")
@@ -0,0 +1,21 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TransactionTestCase
+
+from miolingo.core.factories import UserFactory
+from miolingo.core.jobs import enqueue
+from miolingo.core.models import Job
+
+
+class RunWorkerCommandTestCase(TransactionTestCase):
+    def test_burst(self):
+        user = UserFactory()
+        enqueue("export", user, src="fr", tgt="es")
+        enqueue("export", user, src="fr", tgt="en")
+        enqueue("import", user, src="fr", tgt="es")  # Missing content.
+
+        out = StringIO()
+        call_command("runworker", threads=1, burst=True, stdout=out)
+        self.assertIn("2 jobs succeeded, 0 failed and 1 to retry.", out.getvalue())
+        self.assertEqual(Job.objects.filter(status=Job.Status.PENDING).count(), 1)
@@ -0,0 +1,86 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from miolingo.core.models import Lesson, Stat, Training, Translation
+from miolingo.core.utils import hash_slug
+
+User = get_user_model()
+
+OPTIONS = {
+    "users": 2,
+    "words": 20,
+    "lessons": 2,
+    "lesson_size": 5,
+    "trainings": 3,
+    "batch_size": 7,
+}
+
+
+class SeedDataCommandTestCase(TestCase):
+    def test_seed(self):
+        out = StringIO()
+        call_command("seeddata", stdout=out, prefix="foo", **OPTIONS)
+        self.assertIn(
+            "2 users, 40 translations, 4 lessons, 6 trainings and 30 stats generated",
+            out.getvalue(),
+        )
+
+        user = User.objects.get(username="foo_0")
+        self.assertTrue(user.check_password("test"))
+        self.assertEqual(user.translations.count(), 20)
+        self.assertEqual(user.lessons.count(), 2)
+        self.assertEqual(user.trainings.count(), 3)
+
+        for translation in user.translations.all():
+            self.assertEqual(translation.slug_hash, hash_slug(translation.slug))
+            self.assertEqual(translation.trans.count(), 1)
+            # Symmetrical relation.
+            self.assertEqual(translation.trans.first().trans.first(), translation)
+
+        lesson = user.lessons.first()
+        self.assertEqual(lesson.translations.count(), 5)
+        self.assertEqual(lesson.translations.filter(lang=user.source_lang).count(), 5)
+
+        training = user.trainings.first()
+        self.assertEqual(training.stats.count(), 5)
+        self.assertEqual(training.score, training.stats.filter(succeed=True).count())
+
+    def test_deterministic(self):
+        call_command("seeddata", stdout=StringIO(), prefix="foo", **OPTIONS)
+        call_command("seeddata", stdout=StringIO(), prefix="bar", **OPTIONS)
+
+        self.assertListEqual(
+            list(
+                Translation.objects.filter(user__username="foo_1")
+                .order_by("pk")
+                .values_list("lang", "text", "priority")
+            ),
+            list(
+                Translation.objects.filter(user__username="bar_1")
+                .order_by("pk")
+                .values_list("lang", "text", "priority")
+            ),
+        )
+
+    def test_prefix_exists(self):
+        call_command("seeddata", stdout=StringIO(), prefix="foo", **OPTIONS)
+        with self.assertRaises(CommandError):
+            call_command("seeddata", stdout=StringIO(), prefix="foo", **OPTIONS)
+
+    def test_no_lessons(self):
+        options = {**OPTIONS, "lessons": 0}
+        call_command("seeddata", stdout=StringIO(), prefix="foo", **options)
+
+        self.assertEqual(Translation.objects.count(), 40)
+        self.assertFalse(Lesson.objects.exists())
+        self.assertFalse(Training.objects.exists())
+        self.assertFalse(Stat.objects.exists())
+
+    @mock.patch("miolingo.core.management.commands.seeddata.Faker", None)
+    def test_test_dependencies_missing(self):
+        with self.assertRaisesMessage(CommandError, "install the test dependencies"):
+            call_command("seeddata", stdout=StringIO(), **OPTIONS)
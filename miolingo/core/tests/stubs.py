@@ -0,0 +1,66 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+
+class DeepLStubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        data = parse_qs(self.rfile.read(length).decode())
+
+        key = self.headers.get("Authorization")
+        if key != f"DeepL-Auth-Key {self.server.auth_key}":
+            return self.respond(403, {"message": "Wrong endpoint or key."})
+
+        texts = data.get("text", [])
+        with self.server.lock:
+            self.server.requests.append(texts)
+
+        target = data["target_lang"][0].lower()
+        translations = [
+            {
+                "detected_source_language": data["source_lang"][0],
+                "text": f"{target} {text}",
+            }
+            for text in texts
+        ]
+        self.respond(200, {"translations": translations})
+
+    def respond(self, status, data):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class DeepLStubServer(ThreadingHTTPServer):
+    """
+    Local server of the DeepL translate API, translating a text into
+    "<target lang> <text>" and recording the texts of each request.
+    """
+
+    auth_key = "stub-key"
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), DeepLStubHandler)
+        self.requests = []
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_port}/"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,241 @@
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.admin.widgets import (
+    AutocompleteSelect,
+    AutocompleteSelectMultiple,
+    ForeignKeyRawIdWidget,
+)
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import DatabaseError
+from django.test import TestCase
+from django.urls import reverse
+
+from miolingo.core import bulk
+from miolingo.core.admin import TRANS_LINK_LIMIT
+from miolingo.core.factories import (
+    LessonFactory,
+    TrainingFactory,
+    TranslationFactory,
+    TranslationLeafFactory,
+    UserFactory,
+)
+from miolingo.core.models import Translation
+from miolingo.core.transfers import bulk_import_translations
+
+
+class AdminTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = UserFactory(is_staff=True, is_superuser=True)
+        cls.user = UserFactory()
+        cls.translation = TranslationFactory(
+            user=cls.user, lang="fr", text="chat noir", trans__num=TRANS_LINK_LIMIT + 2
+        )
+        cls.other = TranslationLeafFactory(user=cls.user, lang="fr", text="xyzzy chat")
+        lesson = LessonFactory(user=cls.user, translations=[cls.translation])
+        cls.training = TrainingFactory(user=cls.user, lesson=lesson)
+        cls.stat = cls.training.stats.create(translation=cls.translation)
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_translation_changelist(self):
+        response = self.client.get(reverse("admin:core_translation_changelist"))
+        self.assertEqual(response.status_code, 200)
+
+        # Trans are capped.
+        trans = Translation.objects.filter(trans=self.translation).order_by("pk")
+        for translation in trans[:TRANS_LINK_LIMIT]:
+            url = reverse("admin:core_translation_change", args=(translation.pk,))
+            self.assertContains(response, f'<li><a href="{url}">')
+        url = reverse("admin:core_translation_change", args=(trans.last().pk,))
+        self.assertNotContains(response, f'<li><a href="{url}">')
+        self.assertContains(response, "<li>…</li>", count=1)
+
+    def test_translation_search(self):
+        response = self.client.get(
+            reverse("admin:core_translation_changelist"), {"q": "Chat "}
+        )
+        self.assertEqual(list(response.context["cl"].result_list), [self.translation])
+
+    def test_translation_search_substring(self):
+        url = reverse("admin:core_translation_changelist")
+        response = self.client.get(url, {"q": "*zzy cha"})
+        self.assertEqual(list(response.context["cl"].result_list), [self.other])
+        response = self.client.get(url, {"q": "*at noi"})
+        self.assertEqual(list(response.context["cl"].result_list), [self.translation])
+
+    def test_stat_search(self):
+        url = reverse("admin:core_stat_changelist")
+        response = self.client.get(url, {"q": "chat-no"})
+        self.assertEqual(list(response.context["cl"].result_list), [self.stat])
+        response = self.client.get(url, {"q": "noir"})
+        self.assertEqual(list(response.context["cl"].result_list), [])
+
+    def test_stat_search_substring(self):
+        url = reverse("admin:core_stat_changelist")
+        response = self.client.get(url, {"q": "*at noi"})
+        self.assertEqual(list(response.context["cl"].result_list), [self.stat])
+
+        name = self.training.lesson.name
+        response = self.client.get(url, {"q": f"*{name[1:]}"})
+        self.assertEqual(list(response.context["cl"].result_list), [self.stat])
+
+    def test_change_forms(self):
+        forms = [
+            ("translation", self.translation.pk, ["trans"], ["user"]),
+            ("lesson", self.training.lesson.pk, ["translations"], ["user"]),
+            ("training", self.training.pk, ["lesson"], ["user"]),
+            ("stat", self.stat.pk, ["translation"], ["training"]),
+        ]
+        # Relations never render all the rows as options.
+        for model_name, pk, autocomplete, raw_id in forms:
+            url = reverse(f"admin:core_{model_name}_change", args=(pk,))
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+
+            fields = response.context["adminform"].form.fields
+            for name in autocomplete:
+                widget = fields[name].widget.widget
+                self.assertIsInstance(
+                    widget, (AutocompleteSelect, AutocompleteSelectMultiple)
+                )
+            for name in raw_id:
+                self.assertIsInstance(fields[name].widget, ForeignKeyRawIdWidget)
+
+    def test_autocomplete(self):
+        response = self.client.get(
+            reverse("admin:autocomplete"),
+            {
+                "app_label": "core",
+                "model_name": "stat",
+                "field_name": "translation",
+                "term": "xyzzy",
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [result["id"] for result in response.json()["results"]],
+            [str(self.other.pk)],
+        )
+
+
+class TranslationImportAdminTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = UserFactory(is_staff=True, is_superuser=True)
+        cls.user = UserFactory()
+        cls.url = reverse("admin:core_translation_import")
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def post(self, filename=None, content=None, **data):
+        if filename:
+            with open(settings.PROJECT_DIR / "core" / "tests" / "data" / filename) as f:
+                content = f.read()
+        data = {
+            "user": self.user.username,
+            "src": "fr",
+            "tgt": "es",
+            "file": SimpleUploadedFile("words.csv", content.encode()),
+            **data,
+        }
+        return self.client.post(self.url, data)
+
+    def read(self, response):
+        self.assertEqual(response.status_code, 200)
+        return b"".join(response.streaming_content).decode()
+
+    def test_form(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'enctype="multipart/form-data"')
+
+        response = self.client.get(reverse("admin:core_translation_changelist"))
+        self.assertContains(response, self.url)
+
+    def test_access_staff(self):
+        self.client.force_login(UserFactory(is_staff=True))
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 403)
+
+    def test_invalid(self):
+        response = self.post(content="chat;gato\n", user="unknown", src="xx")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.context["form"].errors), {"user", "src"})
+        self.assertFalse(Translation.objects.exists())
+
+    def test_import(self):
+        content = self.read(self.post("test_succeed-fr_es.csv"))
+        self.assertIn("20 lines done.", content)
+        self.assertIn("40 translations are imported successfully.", content)
+        self.assertEqual(Translation.objects.filter(user=self.user).count(), 40)
+
+        source = Translation.objects.get(user=self.user, lang="fr", text="Le village")
+        self.assertEqual(
+            list(source.trans.values_list("text", flat=True)), ["el pueblo"]
+        )
+
+    def test_import_duplicate(self):
+        content = self.read(self.post("test_duplicate-fr_es.csv"))
+        self.assertIn("2 duplicate(s) detected.", content)
+        self.assertIn("2 translations are imported successfully.", content)
+
+    def test_import_error(self):
+        content = self.read(
+            self.post(content=f"chat\n{'x' * 2049};gato\nchien;perro\n")
+        )
+        self.assertIn("An error occured on line 1 with: Expected", content)
+        self.assertIn("An error occured on line 2 with: Text longer", content)
+        self.assertIn("2 translations are imported successfully.", content)
+
+    def test_import_encoding(self):
+        response = self.client.post(
+            self.url,
+            {
+                "user": self.user.username,
+                "src": "fr",
+                "tgt": "es",
+                "file": SimpleUploadedFile("words.csv", "chat;gato".encode("utf-16")),
+            },
+        )
+        self.assertIn("not UTF-8 encoded", self.read(response))
+
+    def test_import_batches(self):
+        TranslationFactory(user=self.user, lang="fr", text="chat")
+        lines = ["chat;gato", "chien;perro", "chat;gato", "vache;vaca"]
+        batches = [
+            (counts["lines"], counts["created"], counts["duplicate"])
+            for counts in bulk_import_translations(
+                self.user, lines, "fr", "es", batch_size=2
+            )
+        ]
+        self.assertEqual(batches, [(2, 3, 1), (4, 5, 3)])
+
+    def test_import_batch_error(self):
+        def link_translations(*args, **kwargs):
+            if not calls:
+                calls.append(args)
+                raise DatabaseError("Boom")
+            return bulk.link_translations(*args, **kwargs)
+
+        calls = []
+        lines = ["chat;gato", "chien;perro", "vache;vaca", "cheval;caballo"]
+        with mock.patch("miolingo.core.transfers.link_translations", link_translations):
+            counts = list(
+                bulk_import_translations(self.user, lines, "fr", "es", batch_size=2)
+            )[-1]
+
+        self.assertEqual(counts["errors"], [(1, "Boom"), (2, "Boom")])
+        self.assertEqual((counts["lines"], counts["created"]), (4, 4))
+        # The failing batch is rolled back.
+        self.assertEqual(
+            set(
+                Translation.objects.filter(user=self.user).values_list(
+                    "text", flat=True
+                )
+            ),
+            {"vache", "vaca", "cheval", "caballo"},
+        )
@@ -0,0 +1,148 @@
+from django.core.cache import cache
+from django.urls import include, path
+
+from rest_framework.test import APITestCase, override_settings
+
+from rest_framework_simplejwt.tokens import AccessToken
+
+from miolingo.core.async_views import get_async_urls
+from miolingo.core.factories import (
+    LessonFactory,
+    TrainingFactory,
+    TranslationFactory,
+    UserFactory,
+)
+from miolingo.urls import router
+
+# Async routes in front of the router ones, and the sync ones for parity.
+urlpatterns = [
+    path("api/", include(get_async_urls(router) + router.urls)),
+    path("sync/", include(router.urls)),
+]
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncReadViewTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.lessons = LessonFactory.create_batch(
+            3, user=cls.user, translations__num=2, translations__trans__num=1
+        )
+        LessonFactory(user=cls.user, is_active=False)
+        LessonFactory()
+        cls.training = TrainingFactory(
+            user=cls.user,
+            lesson=cls.lessons[0],
+            deck=[cls.lessons[0].translations.first().pk],
+        )
+        cls.token = AccessToken.for_user(cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+    def assertParity(self, url):
+        sync_response = self.client.get(f"/sync/{url}")
+        response = self.client.get(f"/api/{url}")
+        self.assertEqual(response.status_code, sync_response.status_code)
+        self.assertEqual(
+            response.content, sync_response.content.replace(b"/sync/", b"/api/")
+        )
+        return response
+
+    def test_lessons(self):
+        response = self.assertParity("lessons/")
+        self.assertEqual(response.json()["count"], 4)
+
+    def test_lessons_filter_ordering_pagination(self):
+        response = self.assertParity("lessons/?is_active=true&ordering=name")
+        self.assertEqual(response.json()["count"], 3)
+        response = self.assertParity("lessons/?page_size=2&page=2")
+        self.assertIsNone(response.json()["next"])
+        self.assertIsNotNone(response.json()["previous"])
+
+    def test_invalid_page(self):
+        response = self.client.get("/api/lessons/?page=10")
+        self.assertEqual(response.status_code, 404)
+
+    def test_invalid_filter(self):
+        response = self.client.get("/api/translations/?lang=foo")
+        self.assertEqual(response.status_code, 400)
+
+    def test_lesson(self):
+        self.assertParity(f"lessons/{self.lessons[0].pk}/")
+
+    def test_lesson_not_owner(self):
+        lesson = LessonFactory()
+        response = self.client.get(f"/api/lessons/{lesson.pk}/")
+        self.assertEqual(response.status_code, 404)
+
+    def test_translations(self):
+        TranslationFactory(user=self.user, lang="es")
+        response = self.assertParity("translations/?lang=es&ordering=text")
+        self.assertGreater(response.json()["count"], 0)
+
+    def test_translation(self):
+        translation = self.lessons[0].translations.first()
+        self.assertParity(f"translations/{translation.pk}/")
+
+    def test_users_me(self):
+        self.assertParity("users/me/")
+
+    @override_settings(MIOLINGO_AUTH_STATELESS_READS=True)
+    def test_users_me_stateless(self):
+        response = self.client.get("/api/users/me/")
+        self.assertEqual(response.json()["username"], self.user.username)
+
+    def test_training_deck(self):
+        response = self.assertParity(f"trainings/{self.training.pk}/")
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["deck"], self.training.deck)
+        self.assertEqual(data["lesson"]["id"], self.lessons[0].pk)
+        # Only the translations of the deck.
+        self.assertEqual(
+            [t["id"] for t in data["lesson"]["translations"]], self.training.deck
+        )
+        self.assertEqual(len(data["lesson"]["translations"][0]["trans"]), 1)
+
+    def test_fallback(self):
+        response = self.client.patch(
+            f"/api/lessons/{self.lessons[0].pk}/", data={"name": "foo"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["name"], "foo")
+
+        response = self.client.post(
+            "/api/translations/", data={"lang": "fr", "text": "foo"}
+        )
+        self.assertEqual(response.status_code, 201)
+
+    def test_anonymous(self):
+        self.client.credentials()
+        response = self.client.get("/api/lessons/")
+        self.assertEqual(response.status_code, 401)
+        self.assertIn("Bearer", response["WWW-Authenticate"])
+
+    def test_invalid_token(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer foo")
+        response = self.client.get("/api/users/me/")
+        self.assertEqual(response.status_code, 401)
+
+    def test_not_acceptable(self):
+        response = self.client.get("/api/lessons/", HTTP_ACCEPT="application/xml")
+        self.assertEqual(response.status_code, 406)
+
+    @override_settings(MIOLINGO_SERVER_TIMING=True)
+    async def test_async_client(self):
+        headers = {"Authorization": f"Bearer {self.token}"}
+        response = await self.async_client.get("/api/lessons/", headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["count"], 4)
+        self.assertIn("Server-Timing", response)
+
+        response = await self.async_client.get(
+            f"/api/trainings/{self.training.pk}/", headers=headers
+        )
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,137 @@
+from unittest import mock
+
+from django.core.cache import cache
+
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase, override_settings
+
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from miolingo.core.cache import get_user_version
+from miolingo.core.factories import LessonFactory, TrainingFactory, UserFactory
+
+
+@override_settings(MIOLINGO_AUTH_USER_CACHE_TIMEOUT=60)
+class CachedJWTAuthenticationTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.url = reverse("users-me")
+
+    def setUp(self):
+        cache.clear()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+
+    def test_invalid_token(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer foo")
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 401)
+
+    def test_user_not_found(self):
+        user = UserFactory()
+        token = AccessToken.for_user(user)
+        user.delete()
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 401)
+
+    def test_user_cached(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["id"], self.user.pk)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["id"], self.user.pk)
+
+    def test_user_saved(self):
+        self.client.get(self.url)
+
+        self.user.first_name = "foo"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data["first_name"], "foo")
+
+    def test_user_inactive(self):
+        user = UserFactory()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}"
+        )
+        self.client.get(self.url)
+
+        user.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 401)
+
+    def test_user_updated_by_api(self):
+        self.client.get(self.url)
+
+        url = reverse("users-detail", kwargs={"pk": self.user.pk})
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(url, data={"last_name": "bar"})
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["last_name"], "bar")
+
+    @mock.patch.object(api_settings, "CHECK_REVOKE_TOKEN", True)
+    def test_password_changed(self):
+        user = UserFactory()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}"
+        )
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+        # Password changed without signals, i.e: a queryset update.
+        user.set_password("bar")
+        cache.set(f"miolingo:auth:{user.pk}:{get_user_version(user.pk)}", user)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 401)
+
+    @override_settings(MIOLINGO_AUTH_STATELESS_READS=True)
+    def test_stateless_read(self):
+        lesson = LessonFactory(user=self.user)
+
+        url = reverse("lessons-detail", kwargs={"pk": lesson.pk})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["id"], lesson.pk)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["id"], self.user.pk)
+
+    @override_settings(MIOLINGO_AUTH_STATELESS_READS=True)
+    def test_stateless_read_training(self):
+        training = TrainingFactory(user=self.user)
+
+        url = reverse("trainings-detail", kwargs={"pk": training.pk})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["id"], training.pk)
+
+    @override_settings(MIOLINGO_AUTH_USER_CACHE_TIMEOUT=0)
+    def test_user_not_cached(self):
+        for _ in range(2):
+            with self.assertNumQueries(1):
+                response = self.client.get(self.url)
+            self.assertEqual(response.status_code, 200)
+
+    @override_settings(MIOLINGO_AUTH_STATELESS_READS=True)
+    def test_stateless_write(self):
+        url = reverse("lessons-list")
+        response = self.client.post(url, data={"name": "foo", "translations": []})
+        self.assertEqual(response.status_code, 201)
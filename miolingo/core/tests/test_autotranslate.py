@@ -0,0 +1,180 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from miolingo.core.autotranslate import (
+    AutotranslateError,
+    AutoTranslator,
+    RateLimiter,
+    autotranslate,
+)
+from miolingo.core.factories import TranslationFactory, UserFactory
+from miolingo.core.jobs import claim, run
+from miolingo.core.models import Translation, TranslationMemory
+from miolingo.core.tests.stubs import DeepLStubServer
+
+
+class DeepLStubMixin:
+    @classmethod
+    def setUpClass(cls):
+        cls.server = cls.enterClassContext(DeepLStubServer())
+        cls.enterClassContext(
+            override_settings(
+                MIOLINGO_DEEPL_AUTH_KEY=cls.server.auth_key,
+                MIOLINGO_DEEPL_SERVER_URL=cls.server.url,
+            )
+        )
+        super().setUpClass()
+
+    def setUp(self):
+        self.server.requests.clear()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.chat = TranslationFactory(user=cls.user, lang="fr", text="chat")
+        cls.chien = TranslationFactory(user=cls.user, lang="fr", text="chien")
+        cls.dog = TranslationFactory(user=cls.user, lang="en", text="dog")
+        # Already translated, or in the target language.
+        TranslationFactory(
+            user=cls.user, lang="fr", text="maison", trans__num=1, trans__lang="es"
+        )
+        TranslationFactory(user=cls.user, lang="es", text="gato")
+        # Result already existing, but not linked.
+        cls.existing = TranslationFactory(user=cls.user, lang="es", text="es chien")
+
+
+class AutotranslateTestCase(DeepLStubMixin, TestCase):
+    def test_autotranslate(self):
+        counts = autotranslate(self.user, "es")
+        self.assertEqual(
+            counts, {"translations": 3, "requested": 3, "created": 2, "linked": 3}
+        )
+        self.assertCountEqual(self.server.requests, [["chat", "chien"], ["dog"]])
+
+        self.assertEqual(self.chat.trans.get().text, "es chat")
+        self.assertEqual(self.chien.trans.get(), self.existing)
+        self.assertEqual(self.existing.trans.get(), self.chien)
+        translation = self.dog.trans.get()
+        self.assertEqual(translation.slug, "es-dog")
+        self.assertEqual(translation.user, self.user)
+
+        # Nothing left to translate.
+        self.server.requests.clear()
+        counts = autotranslate(self.user, "es")
+        self.assertEqual(counts["translations"], 0)
+        self.assertEqual(self.server.requests, [])
+
+    def test_src_and_limit(self):
+        counts = autotranslate(self.user, "es", src="fr", limit=1)
+        self.assertEqual(counts["translations"], 1)
+        self.assertEqual(self.server.requests, [["chat"]])
+
+    def test_memory(self):
+        autotranslate(self.user, "es", src="fr")
+        self.assertEqual(TranslationMemory.objects.count(), 2)
+
+        # Same texts are never requested twice, whoever the user.
+        user = UserFactory()
+        translation = TranslationFactory(user=user, lang="fr", text="chat")
+        self.server.requests.clear()
+        counts = autotranslate(user, "es")
+        self.assertEqual(counts["requested"], 0)
+        self.assertEqual(self.server.requests, [])
+        self.assertEqual(translation.trans.get().text, "es chat")
+
+        # But they are per languages.
+        autotranslate(user, "en", src="fr")
+        self.assertEqual(self.server.requests, [["chat"]])
+
+    def test_batches(self):
+        progress = mock.Mock()
+        translator = AutoTranslator(batch_size=1, workers=2, progress=progress)
+        results = translator.translate(["chat", "chien", "chat", "cheval"], "fr", "en")
+        self.assertEqual(
+            results,
+            {"chat": "en-us chat", "chien": "en-us chien", "cheval": "en-us cheval"},
+        )
+        self.assertEqual(translator.requested, 3)
+        self.assertCountEqual(self.server.requests, [["chat"], ["chien"], ["cheval"]])
+        self.assertEqual(progress.call_args_list, [((1,),), ((2,),), ((3,),)])
+
+    def test_not_configured(self):
+        with override_settings(MIOLINGO_DEEPL_AUTH_KEY=None):
+            with self.assertRaises(AutotranslateError):
+                autotranslate(self.user, "es")
+
+    def test_provider_error(self):
+        with override_settings(MIOLINGO_DEEPL_AUTH_KEY="wrong"):
+            with self.assertRaises(AutotranslateError):
+                autotranslate(self.user, "es")
+        self.assertFalse(self.chat.trans.exists())
+
+
+class RateLimiterTestCase(TestCase):
+    @mock.patch("miolingo.core.autotranslate.time")
+    def test_wait(self, mock_time):
+        mock_time.monotonic.return_value = 100
+        limiter = RateLimiter(rate=4)
+        limiter.wait()
+        limiter.wait()
+        limiter.wait()
+        self.assertEqual(
+            mock_time.sleep.call_args_list, [mock.call(0.25), mock.call(0.5)]
+        )
+
+    @mock.patch("miolingo.core.autotranslate.time")
+    def test_unlimited(self, mock_time):
+        mock_time.monotonic.return_value = 100
+        limiter = RateLimiter(rate=0)
+        limiter.wait()
+        limiter.wait()
+        mock_time.sleep.assert_not_called()
+
+
+class AutotranslateAPIViewTestCase(DeepLStubMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.url = reverse("translations-autotranslate")
+
+    def test_access_anonymous(self):
+        response = self.client.post(self.url, data={"lang": "es"})
+        self.assertEqual(response.status_code, 401)
+
+    def test_autotranslate(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.post(self.url, data={"lang": "es", "src": "fr"})
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data["kind"], "autotranslate")
+        self.assertEqual(response.data["status"], "pending")
+        self.assertFalse(self.chat.trans.exists())
+
+        # Done by a worker, then polled.
+        run(claim("worker"))
+        response = self.client.get(response["Location"])
+        self.assertEqual(response.data["status"], "succeeded")
+        self.assertEqual(
+            response.data["result"],
+            {"translations": 2, "requested": 2, "created": 1, "linked": 2},
+        )
+
+        response = self.client.get(reverse("translations-detail", args=[self.chat.pk]))
+        self.assertEqual(response.data["trans"][0]["text"], "es chat")
+
+    def test_invalid(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.post(self.url, data={"lang": "de", "limit": 0})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("lang", response.data)
+        self.assertIn("limit", response.data)
+        self.assertEqual(Translation.objects.count(), 7)
+
+    @override_settings(MIOLINGO_DEEPL_AUTH_KEY=None)
+    def test_not_configured(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.post(self.url, data={"lang": "es"})
+        self.assertEqual(response.status_code, 503)
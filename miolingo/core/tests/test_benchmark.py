@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.test import TestCase
+
+from miolingo.core.benchmark import (
+    compare,
+    load_baseline,
+    percentile,
+    run,
+    run_renderers,
+    seed,
+)
+
+
+class BenchmarkTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = seed(translations=40, lessons=2, words=10, trainings=2)
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([3], 99), 3)
+
+    def test_compare(self):
+        baseline = {"lessons-list": {"p50": 10, "p95": 20, "p99": 30, "queries": 4}}
+        results = {"lessons-list": {"p50": 10, "p95": 50, "p99": 30, "queries": 5}}
+
+        regressions = compare(results, baseline, tolerance=1.5)
+        self.assertEqual(len(regressions), 2)
+        self.assertIn("5 queries (baseline: 4)", regressions[0])
+        self.assertIn("p95 = 50ms (baseline: 20ms)", regressions[1])
+
+        regressions = compare(results, baseline, tolerance=0)
+        self.assertEqual(len(regressions), 1)
+
+    def test_renderers(self):
+        results = run_renderers(self.user, iterations=2)
+        self.assertIn("JSONRenderer", results)
+        self.assertEqual(
+            results["FastJSONRenderer"]["size"], results["JSONRenderer"]["size"]
+        )
+
+    def test_queries_baseline(self):
+        """
+        Queries count must not depend on data volume, neither increase.
+        """
+        baseline = load_baseline(
+            settings.PROJECT_DIR / "core" / "data" / "benchmark.json"
+        )
+        results = run(self.user, iterations=2)
+
+        self.assertListEqual(sorted(results), sorted(baseline))
+        self.assertListEqual(compare(results, baseline, tolerance=0), [])
@@ -0,0 +1,173 @@
+import os
+import tempfile
+import time
+from unittest import mock
+
+from django.db import IntegrityError
+from django.test import TestCase, override_settings
+from django.utils.timezone import now
+
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from miolingo.core.buffers import StatBuffer, get_stat_buffer
+from miolingo.core.factories import LessonFactory, TrainingFactory, UserFactory
+from miolingo.core.models import Stat
+
+
+class StatBufferTestCaseMixin:
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.lesson = LessonFactory(user=cls.user, translations__num=3)
+        cls.translations = list(cls.lesson.translations.order_by("pk"))
+        cls.training = TrainingFactory(
+            user=cls.user, lesson=cls.lesson, finished_at=None
+        )
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        settings = override_settings(
+            MIOLINGO_STATS_BUFFER_DIR=self.directory, MIOLINGO_STATS_BUFFER_SIZE=3
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+
+class StatBufferTestCase(StatBufferTestCaseMixin, TestCase):
+    def test_disabled(self):
+        with override_settings(MIOLINGO_STATS_BUFFER_DIR=None):
+            self.assertIsNone(get_stat_buffer())
+
+    def test_batch(self):
+        buffer = get_stat_buffer()
+        buffer.append(self.training, self.translations[0], True)
+        buffer.append(self.training, self.translations[1], False)
+        self.assertFalse(Stat.objects.exists())
+
+        # Full.
+        buffer.append(self.training, self.translations[2], True)
+        self.assertEqual(
+            list(
+                Stat.objects.order_by("pk").values_list(
+                    "training", "translation", "succeed"
+                )
+            ),
+            [
+                (self.training.pk, self.translations[0].pk, True),
+                (self.training.pk, self.translations[1].pk, False),
+                (self.training.pk, self.translations[2].pk, True),
+            ],
+        )
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_restart(self):
+        get_stat_buffer().append(self.training, self.translations[0], True)
+        # Another worker process, e.g: once restarted.
+        buffer = StatBuffer(self.directory, batch_size=3)
+        self.assertEqual(buffer.flush("default", self.training.pk), 1)
+        self.assertEqual(buffer.flush("default", self.training.pk), 0)
+        self.assertEqual(Stat.objects.count(), 1)
+
+    def test_flush_all(self):
+        buffer = get_stat_buffer()
+        buffer.append(self.training, self.translations[0], True)
+        self.assertEqual(buffer.flush_all(max_age=60), 0)
+        self.assertEqual(buffer.flush_all(), 1)
+        self.assertEqual(Stat.objects.count(), 1)
+
+    @override_settings(MIOLINGO_STATS_BUFFER_LOST_AFTER=60)
+    def test_flush_lost(self):
+        buffer = get_stat_buffer()
+        buffer.append(self.training, self.translations[0], True)
+        path = buffer.get_path("default", self.training.pk)
+        # Claimed by a worker which died before inserting.
+        claimed = buffer.claim(path)
+        self.assertEqual(buffer.flush_all(), 0)
+
+        past = time.time() - 61
+        os.utime(claimed, (past, past))
+        self.assertEqual(buffer.flush_all(), 1)
+        self.assertEqual(Stat.objects.count(), 1)
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_flush_claimed_meanwhile(self):
+        buffer = get_stat_buffer()
+        buffer.append(self.training, self.translations[0], True)
+        path = buffer.get_path("default", self.training.pk)
+
+        def flock(f, operation):
+            # Claimed by another flush, then a new answer is buffered.
+            buffer.claim(path)
+            path.write_text("")
+
+        with mock.patch("miolingo.core.buffers.fcntl.flock", flock):
+            self.assertEqual(buffer.flush("default", self.training.pk), 0)
+        self.assertTrue(path.exists())
+        self.assertFalse(Stat.objects.exists())
+
+    def test_set_aside(self):
+        buffer = get_stat_buffer()
+        buffer.append(self.training, self.translations[0], True)
+
+        with mock.patch(
+            "django.db.models.query.QuerySet.bulk_create", side_effect=IntegrityError
+        ), self.assertLogs("miolingo.core.buffers", "ERROR"):
+            self.assertEqual(buffer.flush("default", self.training.pk), 0)
+
+        self.assertEqual(len(buffer.failed), 1)
+        self.assertTrue(buffer.failed[0].name.endswith(".failed"))
+        self.assertEqual(os.listdir(self.directory), [buffer.failed[0].name])
+        # Not retried.
+        self.assertEqual(buffer.flush_all(), 0)
+        self.assertTrue(buffer.failed[0].exists())
+
+    def test_flush_all_stray_files(self):
+        buffer = get_stat_buffer()
+        buffer.append(self.training, self.translations[0], True)
+        for name in ["README", ".nfs0001", "default.abc.log", "default.1.log.tmp"]:
+            open(os.path.join(self.directory, name), "w").close()
+
+        self.assertEqual(buffer.flush_all(), 1)
+        self.assertEqual(len(os.listdir(self.directory)), 4)
+
+
+class StatBufferAPIViewTestCase(StatBufferTestCaseMixin, APITestCase):
+    def test_create(self):
+        self.client.force_authenticate(self.user)
+        data = {
+            "training": self.training.pk,
+            "translation": self.translations[0].pk,
+            "succeed": True,
+        }
+        response = self.client.post(reverse("stats-list"), data=data)
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data, data)
+        self.assertFalse(Stat.objects.exists())
+
+        # Flushed once finished, before scoring.
+        url = reverse("trainings-detail", kwargs={"pk": self.training.pk})
+        response = self.client.patch(url, data={"finished_at": "2024-01-01T00:00"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Stat.objects.filter(training=self.training).count(), 1)
+        self.training.refresh_from_db()
+        self.assertEqual(self.training.score, 1)
+
+    def test_create_invalid(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.post(reverse("stats-list"), data={"succeed": True})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_create_finished(self):
+        training = TrainingFactory(
+            user=self.user, lesson=self.lesson, finished_at=now()
+        )
+        self.client.force_authenticate(self.user)
+        data = {"training": training.pk, "translation": self.translations[0].pk}
+        response = self.client.post(reverse("stats-list"), data=data)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("training", response.data)
+        self.assertEqual(os.listdir(self.directory), [])
@@ -0,0 +1,364 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.cache.backends.dummy import DummyCache
+from django.db import DatabaseError, transaction
+
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase, override_settings
+
+from miolingo.core.cache import bump_data_version, get_data_version
+from miolingo.core.checks import check_shared_cache
+from miolingo.core.factories import LessonFactory, TranslationFactory, UserFactory
+from miolingo.core.models import DataVersion
+
+
+@override_settings(MIOLINGO_RESPONSE_CACHE_TIMEOUT=60)
+class ResponseCacheTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+
+    def test_data_version(self):
+        version = get_data_version(self.user.pk)
+        self.assertEqual(get_data_version(self.user.pk), version)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_data_version(self.user.pk)
+        self.assertGreater(get_data_version(self.user.pk), version)
+
+    def test_data_version_evicted(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_data_version(self.user.pk)
+        self.assertIsNotNone(get_data_version(self.user.pk))
+
+    def test_data_version_database(self):
+        self.assertFalse(DataVersion.objects.filter(user=self.user).exists())
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_data_version(self.user.pk)
+        version = DataVersion.objects.get(user=self.user).version
+
+        bump_data_version(self.user.pk)
+        self.assertGreater(DataVersion.objects.get(user=self.user).version, version)
+
+    def test_data_version_coalesced(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_data_version(self.user.pk)
+        version = get_data_version(self.user.pk)
+
+        # Once per transaction, by its first change.
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            bump_data_version(self.user.pk)
+            with self.assertNumQueries(0):
+                bump_data_version(self.user.pk)
+                bump_data_version(self.user.pk)
+        self.assertEqual(len(callbacks), 1)
+        self.assertGreater(get_data_version(self.user.pk), version)
+
+        # Other users are bumped on their own.
+        other = UserFactory()
+        with self.captureOnCommitCallbacks() as callbacks:
+            bump_data_version(self.user.pk)
+            bump_data_version(other.pk)
+        self.assertEqual(len(callbacks), 2)
+
+    def test_data_version_coalesced_rollback(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_data_version(self.user.pk)
+        version = DataVersion.objects.get(user=self.user).version
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            try:
+                with transaction.atomic():
+                    bump_data_version(self.user.pk)
+                    raise DatabaseError
+            except DatabaseError:
+                pass
+            # The bump was rolled back along, not pending anymore.
+            bump_data_version(self.user.pk)
+        self.assertEqual(len(callbacks), 1)
+        self.assertGreater(DataVersion.objects.get(user=self.user).version, version)
+
+    def test_data_version_on_commit(self):
+        version = get_data_version(self.user.pk)
+        with self.captureOnCommitCallbacks() as callbacks:
+            TranslationFactory(user=self.user)
+            # Not before the changes are visible to other connections.
+            self.assertEqual(get_data_version(self.user.pk), version)
+
+        for callback in callbacks:
+            callback()
+        self.assertGreater(get_data_version(self.user.pk), version)
+
+    def test_data_version_rollback(self):
+        version = get_data_version(self.user.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    TranslationFactory(user=self.user)
+                    raise DatabaseError
+            except DatabaseError:
+                pass
+        self.assertEqual(get_data_version(self.user.pk), version)
+
+    def test_check_shared_cache(self):
+        self.assertEqual(
+            [error.id for error in check_shared_cache(None)], ["miolingo.E001"]
+        )
+        with override_settings(MIOLINGO_RESPONSE_CACHE_TIMEOUT=0):
+            self.assertEqual(check_shared_cache(None), [])
+        with override_settings(MIOLINGO_AUTH_USER_CACHE_TIMEOUT=60):
+            self.assertEqual(
+                [error.obj for error in check_shared_cache(None)],
+                ["MIOLINGO_RESPONSE_CACHE_TIMEOUT", "MIOLINGO_AUTH_USER_CACHE_TIMEOUT"],
+            )
+        with mock.patch(
+            "miolingo.core.checks.get_cache", return_value=DummyCache("", {})
+        ):
+            self.assertEqual(check_shared_cache(None), [])
+
+    def test_list_cached(self):
+        TranslationFactory(user=self.user)
+        url = reverse("translations-list")
+
+        response = self.client.get(url)
+        with self.assertNumQueries(0):
+            cached_response = self.client.get(url)
+
+        self.assertEqual(cached_response.status_code, 200)
+        self.assertEqual(cached_response.data, response.data)
+
+    def test_query_params(self):
+        TranslationFactory(user=self.user, lang="fr")
+        url = reverse("translations-list")
+
+        self.client.get(url)
+        response = self.client.get(url, data={"lang": "es"})
+        self.assertEqual(response.data["count"], 0)
+
+    def test_per_user(self):
+        TranslationFactory(user=self.user)
+        url = reverse("translations-list")
+        self.client.get(url)
+
+        self.client.force_authenticate(UserFactory())
+        response = self.client.get(url)
+        self.assertEqual(response.data["count"], 0)
+
+    def test_retrieve_cached(self):
+        lesson = LessonFactory(user=self.user)
+        url = reverse("lessons-detail", kwargs={"pk": lesson.pk})
+
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.data["id"], lesson.pk)
+
+    def test_not_found_not_cached(self):
+        url = reverse("lessons-detail", kwargs={"pk": 0})
+        self.client.get(url)
+
+        # Fingerprint and object queries.
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 404)
+
+    def test_invalidate_save(self):
+        # Committed before, its version bump is not pending anymore.
+        with self.captureOnCommitCallbacks(execute=True):
+            translation = TranslationFactory(user=self.user, text="foo")
+        url = reverse("translations-detail", kwargs={"pk": translation.pk})
+        self.client.get(url)
+
+        translation.text = "bar"
+        with self.captureOnCommitCallbacks(execute=True):
+            translation.save()
+
+        response = self.client.get(url)
+        self.assertEqual(response.data["text"], "bar")
+
+    def test_invalidate_delete(self):
+        # Committed before, its version bump is not pending anymore.
+        with self.captureOnCommitCallbacks(execute=True):
+            translation = TranslationFactory(user=self.user)
+        url = reverse("translations-list")
+        self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            translation.delete()
+        response = self.client.get(url)
+        self.assertEqual(response.data["count"], 0)
+
+    def test_invalidate_m2m(self):
+        # Committed before, its version bump is not pending anymore.
+        with self.captureOnCommitCallbacks(execute=True):
+            lesson = LessonFactory(user=self.user, translations__num=2)
+        url = reverse("lessons-detail", kwargs={"pk": lesson.pk})
+        self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            lesson.translations.remove(lesson.translations.first())
+        response = self.client.get(url)
+        self.assertEqual(len(response.data["translations"]), 1)
+
+    def test_invalidate_m2m_trans(self):
+        # Committed before, its version bump is not pending anymore.
+        with self.captureOnCommitCallbacks(execute=True):
+            translation = TranslationFactory(user=self.user, trans__num=1)
+        url = reverse("translations-detail", kwargs={"pk": translation.pk})
+        self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            translation.trans.clear()
+        response = self.client.get(url)
+        self.assertEqual(len(response.data["trans"]), 0)
+
+    def test_invalidate_api_write(self):
+        # Committed before, its version bump is not pending anymore.
+        with self.captureOnCommitCallbacks(execute=True):
+            translation = TranslationFactory(user=self.user, priority=1)
+        url = reverse("translations-detail", kwargs={"pk": translation.pk})
+        self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(url, data={"priority": 2})
+        response = self.client.get(url)
+        self.assertEqual(response.data["priority"], 2)
+
+
+class ConditionalResponseTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+
+    def test_headers(self):
+        LessonFactory(user=self.user)
+        response = self.client.get(reverse("lessons-list"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["ETag"].startswith('"'))
+        self.assertIn("GMT", response["Last-Modified"])
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+        self.assertIn("Authorization", response["Vary"])
+
+    def test_not_modified(self):
+        LessonFactory(user=self.user)
+        url = reverse("lessons-list")
+        etag = self.client.get(url)["ETag"]
+
+        # Only the fingerprint, no serialization.
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_not_modified_since(self):
+        translation = TranslationFactory(user=self.user)
+        url = reverse("translations-detail", kwargs={"pk": translation.pk})
+        last_modified = self.client.get(url)["Last-Modified"]
+
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_modified(self):
+        translation = TranslationFactory(user=self.user, priority=1)
+        url = reverse("translations-detail", kwargs={"pk": translation.pk})
+        etag = self.client.get(url)["ETag"]
+
+        translation.priority = 2
+        with self.captureOnCommitCallbacks(execute=True):
+            translation.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_modified_m2m(self):
+        # Committed before, its version bump is not pending anymore.
+        with self.captureOnCommitCallbacks(execute=True):
+            lesson = LessonFactory(user=self.user, translations__num=2)
+        url = reverse("lessons-detail", kwargs={"pk": lesson.pk})
+        etag = self.client.get(url)["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            lesson.translations.remove(lesson.translations.first())
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["translations"]), 1)
+
+    def test_etag_shared(self):
+        LessonFactory(user=self.user)
+        url = reverse("lessons-list")
+        etag = self.client.get(url)["ETag"]
+
+        # Another worker, with its own cache.
+        cache.clear()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_modified_before_cache_bump(self):
+        # Committed before, its version bump is not pending anymore.
+        with self.captureOnCommitCallbacks(execute=True):
+            lesson = LessonFactory(user=self.user, translations__num=2)
+        url = reverse("lessons-detail", kwargs={"pk": lesson.pk})
+        etag = self.client.get(url)["ETag"]
+
+        # The database version is bumped along the changes.
+        with self.captureOnCommitCallbacks(execute=False):
+            lesson.translations.remove(lesson.translations.first())
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_modified_query_params(self):
+        LessonFactory(user=self.user)
+        url = reverse("lessons-list")
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.get(url, data={"page_size": 1}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_not_found(self):
+        url = reverse("lessons-detail", kwargs={"pk": 0})
+        response = self.client.get(url, HTTP_IF_NONE_MATCH="*")
+        self.assertEqual(response.status_code, 404)
+
+    def test_not_owner(self):
+        lesson = LessonFactory(user=self.user)
+        url = reverse("lessons-detail", kwargs={"pk": lesson.pk})
+        etag = self.client.get(url)["ETag"]
+
+        self.client.force_authenticate(UserFactory())
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(MIOLINGO_RESPONSE_CACHE_TIMEOUT=60)
+    def test_not_modified_cached(self):
+        LessonFactory(user=self.user)
+        url = reverse("lessons-list")
+        etag = self.client.get(url)["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    @override_settings(MIOLINGO_RESPONSE_CACHE_TIMEOUT=60)
+    def test_headers_cached(self):
+        LessonFactory(user=self.user)
+        url = reverse("lessons-list")
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.get(url)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
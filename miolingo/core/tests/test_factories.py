@@ -1,10 +1,13 @@
 from django.test import TestCase
 
 from miolingo.core.factories import (
+    LessonFactory,
+    TrainingFactory,
     TranslationFactory,
     TranslationLeafFactory,
     UserFactory,
 )
+from miolingo.core.models import Lesson, Stat, Translation
 
 
 class UserFactoryTestCase(TestCase):
@@ -29,3 +32,42 @@ class TranslationFactoryTestCase(TestCase):
 
         self.assertEqual(translation.trans.all().count(), 1)
         self.assertEqual(translation.trans.first().pk, trans[0].pk)
+
+
+class BulkFactoryTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+
+    def test_translations(self):
+        with self.assertNumQueries(3):
+            translations = TranslationFactory.create_bulk(
+                5, user=self.user, lang="fr", trans__num=2, trans__lang="es"
+            )
+
+        self.assertEqual(len(translations), 5)
+        self.assertTrue(all(t.pk and t.slug for t in translations))
+        self.assertEqual(Translation.objects.filter(lang="es").count(), 10)
+        for translation in translations:
+            trans = translation.trans.all()
+            self.assertEqual(len(trans), 2)
+            # Symmetrical.
+            self.assertEqual(list(trans[0].trans.all()), [translation])
+
+    def test_lessons(self):
+        lessons = LessonFactory.create_bulk(3, user=self.user, translations__num=4)
+        self.assertEqual(Lesson.objects.filter(user=self.user).count(), 3)
+        for lesson in lessons:
+            self.assertEqual(lesson.translations.filter(user=self.user).count(), 4)
+
+    def test_trainings(self):
+        lesson = LessonFactory(user=self.user, translations__num=3)
+        with self.assertNumQueries(3):
+            trainings = TrainingFactory.create_bulk(
+                2, user=self.user, lesson=lesson, stats=True, stats__num=1
+            )
+
+        for training in trainings:
+            stats = Stat.objects.filter(training=training)
+            self.assertEqual(stats.count(), 3)
+            self.assertEqual(stats.filter(succeed=True).count(), 1)
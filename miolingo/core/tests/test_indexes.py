@@ -0,0 +1,93 @@
+import re
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from miolingo.core.factories import LessonFactory, TrainingFactory, UserFactory
+from miolingo.core.models import Stat, Training, Translation
+from miolingo.core.views import LessonViewset, TrainingViewset, TranslationViewset
+
+SEQ_SCAN_PATTERNS = {
+    "postgresql": re.compile(r"Seq Scan on (?P<table>\w+)"),
+    "sqlite": re.compile(r"\bSCAN (?P<table>\w+)(?! USING)"),
+}
+
+
+@skipUnless(connection.vendor in SEQ_SCAN_PATTERNS, "EXPLAIN format not supported")
+class QueryPlanTestCase(TestCase):
+    """
+    Ensure that the main query of each endpoint is backed by an index.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        users = [UserFactory() for i in range(0, 4)]
+        cls.user = users[0]
+
+        for user in users:
+            for i in range(0, 3):
+                TrainingFactory(
+                    user=user,
+                    lesson=LessonFactory(
+                        user=user, is_active=bool(i), translations__num=5
+                    ),
+                    stats=True,
+                    stats__num=2,
+                )
+
+        cls.training = Training.objects.filter(user=cls.user).first()
+
+    def setUp(self):
+        if connection.vendor == "postgresql":  # pragma: no cover
+            # Seeded dataset is tiny, force the planner to pick an index if any.
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+
+    def get_queryset(self, viewset_class, action, **params):
+        request = Request(APIRequestFactory().get("/", data=params))
+        request.user = self.user
+
+        view = viewset_class(
+            request=request, action=action, format_kwarg=None, kwargs={}
+        )
+        return view.filter_queryset(view.get_queryset())
+
+    def assertNoSeqScan(self, qs):
+        plan = qs.explain()
+        match = SEQ_SCAN_PATTERNS[connection.vendor].search(plan)
+        self.assertIsNone(match, f"Sequential scan detected:\n{plan}")
+
+    def test_translation_list(self):
+        self.assertNoSeqScan(self.get_queryset(TranslationViewset, "list"))
+
+    def test_translation_list_ordering_text(self):
+        qs = self.get_queryset(TranslationViewset, "list", ordering="text")
+        self.assertNoSeqScan(qs)
+
+    def test_translation_list_filter_lang(self):
+        qs = self.get_queryset(TranslationViewset, "list", lang="fr")
+        self.assertNoSeqScan(qs)
+
+    def test_lesson_list(self):
+        self.assertNoSeqScan(self.get_queryset(LessonViewset, "list"))
+
+    def test_lesson_list_filter_is_active(self):
+        qs = self.get_queryset(LessonViewset, "list", is_active="true")
+        self.assertNoSeqScan(qs)
+
+    def test_training(self):
+        qs = self.get_queryset(TrainingViewset, "partial_update")
+        self.assertNoSeqScan(qs.filter(pk=self.training.pk))
+
+    def test_training_score(self):
+        qs = Stat.objects.filter(training=self.training, succeed=True)
+        self.assertNoSeqScan(qs)
+
+    @skipUnless(connection.vendor == "postgresql", "LIKE can't use SQLite indexes")
+    def test_admin_slug_search(self):  # pragma: no cover
+        qs = Translation.objects.filter(slug__startswith="abc")
+        self.assertNoSeqScan(qs)
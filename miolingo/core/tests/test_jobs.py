@@ -0,0 +1,263 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils.timezone import now
+
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from miolingo.core.factories import TranslationFactory, UserFactory
+from miolingo.core.jobs import JOBS, claim, enqueue, register, run
+from miolingo.core.models import Job, Translation
+
+
+@register("test")
+def job_test(job):
+    job.set_progress(1, total=2)
+    if job.payload.get("fail"):
+        raise ValueError("Boom")
+    return {"done": True}
+
+
+@override_settings(MIOLINGO_JOBS_MAX_ATTEMPTS=2, MIOLINGO_JOBS_RETRY_DELAY=10)
+class JobsTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+
+    def test_enqueue_unknown(self):
+        with self.assertRaises(ValueError):
+            enqueue("unknown", self.user)
+
+    def test_claim_order(self):
+        first = enqueue("test", self.user)
+        second = enqueue("test", self.user)
+        Job.objects.filter(pk=second.pk).update(run_at=now() - timedelta(seconds=1))
+        Job.objects.create(kind="test", user=self.user, run_at=now() + timedelta(1))
+
+        job = claim("worker")
+        self.assertEqual(job.pk, second.pk)
+        self.assertEqual(job.status, Job.Status.RUNNING)
+        self.assertEqual(job.worker, "worker")
+        self.assertEqual(job.attempts, 1)
+        self.assertIsNotNone(job.started_at)
+        self.assertIsNotNone(job.heartbeat_at)
+
+        self.assertEqual(claim("worker").pk, first.pk)
+        self.assertIsNone(claim("worker"))
+
+    def test_claim_skip_locked(self):
+        job = enqueue("test", self.user)
+        # SQLite ignores FOR UPDATE, so only the code path is tested.
+        with mock.patch.object(
+            connection.features, "has_select_for_update_skip_locked", True
+        ):
+            self.assertEqual(claim("worker").pk, job.pk)
+            self.assertIsNone(claim("worker"))
+
+    def test_claim_concurrent(self):
+        job = enqueue("test", self.user)
+        queryset = Job.objects.filter(pk=job.pk)
+        candidates = list(queryset.values_list("pk", "status", "heartbeat_at"))
+        # Claimed by another worker once read.
+        queryset.update(status=Job.Status.RUNNING, heartbeat_at=now())
+
+        with mock.patch("miolingo.core.jobs.get_claimable") as mock_claimable:
+            mock_claimable.return_value.using.return_value.values_list.return_value = (
+                candidates
+            )
+            self.assertIsNone(claim("worker"))
+
+    @override_settings(MIOLINGO_JOBS_TIMEOUT=60)
+    def test_claim_lost(self):
+        job = enqueue("test", self.user)
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.Status.RUNNING,
+            started_at=now() - timedelta(seconds=120),
+            heartbeat_at=now() - timedelta(seconds=61),
+        )
+        self.assertEqual(claim("other").worker, "other")
+
+    @override_settings(MIOLINGO_JOBS_TIMEOUT=60)
+    def test_claim_heartbeat(self):
+        enqueue("test", self.user)
+        job = claim("worker")
+        Job.objects.filter(pk=job.pk).update(
+            started_at=now() - timedelta(seconds=120),
+            heartbeat_at=now() - timedelta(seconds=61),
+        )
+
+        # Still alive, long after it started.
+        job.set_progress(1)
+        self.assertIsNone(claim("other"))
+
+    @override_settings(MIOLINGO_JOBS_TIMEOUT=60)
+    def test_run_claimed_again(self):
+        enqueue("test", self.user)
+        job = claim("worker")
+        Job.objects.filter(pk=job.pk).update(heartbeat_at=now() - timedelta(seconds=61))
+        other = claim("other")
+
+        # The lost worker finally ends, after the other one claimed the job.
+        with self.assertLogs("miolingo.core.jobs", "WARNING"):
+            run(job)
+        other.refresh_from_db()
+        self.assertEqual(other.status, Job.Status.RUNNING)
+        self.assertEqual((other.worker, other.progress), ("other", 0))
+
+        run(other)
+        other.refresh_from_db()
+        self.assertEqual(other.status, Job.Status.SUCCEEDED)
+
+    def test_run(self):
+        enqueue("test", self.user)
+        job = run(claim("worker"))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.SUCCEEDED)
+        self.assertEqual(job.result, {"done": True})
+        self.assertEqual((job.progress, job.total), (2, 2))
+        self.assertIsNotNone(job.finished_at)
+
+    def test_retry(self):
+        enqueue("test", self.user, fail=True)
+        job = run(claim("worker"))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.PENDING)
+        self.assertEqual(job.error, "ValueError: Boom")
+        self.assertGreater(job.run_at, now() + timedelta(seconds=9))
+        self.assertIsNone(claim("worker"))
+
+        Job.objects.update(run_at=now())
+        job = run(claim("worker"))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertEqual(job.attempts, 2)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_timed_out(self):
+        job = enqueue("test", self.user)
+        Job.objects.filter(pk=job.pk).update(attempts=2)
+        job = run(claim("worker"))
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertEqual(job.error, "TimeoutError: Job timed out.")
+
+    def test_import_export(self):
+        enqueue(
+            "import", self.user, content="chat;gato\nchien;perro\n", src="fr", tgt="es"
+        )
+        job = run(claim("worker"))
+        self.assertEqual(job.status, Job.Status.SUCCEEDED)
+        self.assertEqual(job.result, {"created": 4, "duplicate": 0, "errors": []})
+        self.assertEqual(job.progress, 2)
+        self.assertEqual(Translation.objects.filter(user=self.user).count(), 4)
+
+        enqueue("export", self.user, src="fr", tgt="es")
+        job = run(claim("worker"))
+        self.assertEqual(
+            job.result, {"count": 2, "content": "chat;gato\nchien;perro\n"}
+        )
+
+    def test_registered(self):
+        self.assertLessEqual({"import", "export", "autotranslate"}, set(JOBS))
+
+
+class JobAPIViewTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.job = enqueue("export", cls.user, src="fr", tgt="es")
+        cls.other = enqueue("export", UserFactory(), src="fr", tgt="es")
+        TranslationFactory(
+            user=cls.user,
+            lang="fr",
+            text="chat",
+            trans__num=1,
+            trans__lang="es",
+            trans__text="gato\nnegro",
+        )
+
+    def work(self):
+        while job := claim("worker"):
+            run(job)
+
+    def test_access_anonymous(self):
+        response = self.client.get(reverse("jobs-list"))
+        self.assertEqual(response.status_code, 401)
+        response = self.client.post(reverse("jobs-export"))
+        self.assertEqual(response.status_code, 401)
+
+    def test_list(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get(reverse("jobs-list"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([job["id"] for job in response.data["results"]], [self.job.pk])
+
+    def test_list_without_result(self):
+        self.work()
+        self.client.force_authenticate(self.user)
+        response = self.client.get(reverse("jobs-list"))
+        self.assertEqual(response.data["results"][0]["status"], "succeeded")
+        self.assertNotIn("result", response.data["results"][0])
+
+        response = self.client.get(reverse("jobs-detail", args=[self.job.pk]))
+        self.assertEqual(response.data["result"]["count"], 1)
+
+    def test_retrieve_other(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get(reverse("jobs-detail", args=[self.other.pk]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_import(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.post(
+            reverse("jobs-import"),
+            data={
+                "src": "fr",
+                "tgt": "es",
+                "file": SimpleUploadedFile("words.csv", "chien;perro\n".encode()),
+            },
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data["kind"], "import")
+        self.assertEqual(response.data["status"], "pending")
+        job = Job.objects.get(pk=response.data["id"])
+        self.assertEqual(
+            job.payload, {"src": "fr", "tgt": "es", "content": "chien;perro\n"}
+        )
+
+        # Done by a worker, then polled.
+        self.work()
+        response = self.client.get(response["Location"])
+        self.assertEqual(response.data["status"], "succeeded")
+        self.assertEqual(response.data["result"]["created"], 2)
+
+    def test_import_invalid(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.post(
+            reverse("jobs-import"),
+            data={
+                "src": "de",
+                "tgt": "es",
+                "file": SimpleUploadedFile("words.csv", "chien;perro".encode("utf-16")),
+            },
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("src", response.data)
+        self.assertIn("file", response.data)
+
+    def test_export(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.post(
+            reverse("jobs-export"), data={"src": "fr", "tgt": "es"}
+        )
+        self.assertEqual(response.status_code, 202)
+
+        self.work()
+        response = self.client.get(response["Location"])
+        self.assertEqual(response.data["status"], "succeeded")
+        self.assertEqual(response.data["result"]["count"], 1)
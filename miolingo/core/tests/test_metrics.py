@@ -0,0 +1,130 @@
+import json
+from tempfile import TemporaryDirectory
+
+from django.test import SimpleTestCase
+
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase, override_settings
+
+from miolingo.core.factories import UserFactory
+from miolingo.core.metrics import MetricsRegistry, render_prometheus
+
+
+class MetricsRegistryTestCase(SimpleTestCase):
+    def test_histogram(self):
+        registry = MetricsRegistry()
+        registry.observe("lessons-list", "GET", 200, 0.002, 0.001)
+        registry.observe("lessons-list", "GET", 200, 0.3, 0.1)
+        registry.observe("lessons-list", "GET", 500, 20, 0.1)
+
+        output = render_prometheus(registry.collect())
+        self.assertIn(
+            'miolingo_http_requests_total{route="lessons-list",method="GET",status="200"} 2',
+            output,
+        )
+        self.assertIn(
+            'miolingo_http_requests_total{route="lessons-list",method="GET",status="500"} 1',
+            output,
+        )
+        self.assertIn(
+            'miolingo_http_request_duration_seconds_bucket{route="lessons-list",method="GET",le="0.005"} 1',
+            output,
+        )
+        self.assertIn(
+            'miolingo_http_request_duration_seconds_bucket{route="lessons-list",method="GET",le="0.5"} 2',
+            output,
+        )
+        self.assertIn(
+            'miolingo_http_request_duration_seconds_bucket{route="lessons-list",method="GET",le="+Inf"} 3',
+            output,
+        )
+        self.assertIn(
+            'miolingo_http_request_duration_seconds_count{route="lessons-list",method="GET"} 3',
+            output,
+        )
+        self.assertIn(
+            'miolingo_http_request_db_seconds_total{route="lessons-list",method="GET"} 0.201',
+            output,
+        )
+
+    def test_multiprocess(self):
+        with TemporaryDirectory() as directory:
+            with override_settings(MIOLINGO_METRICS_DIR=directory):
+                registry = MetricsRegistry()
+                registry.observe("lessons-list", "GET", 200, 0.01)
+
+                # Metrics dumped by another worker.
+                other = MetricsRegistry()
+                other.observe("lessons-list", "GET", 200, 0.01)
+                other.observe("lessons-detail", "GET", 404, 0.01)
+                other.pid = 0
+                other.flush()  # Not the current process, ignored.
+                with open(f"{directory}/1.json", "w") as fp:
+                    json.dump(other.dump(), fp)
+
+                output = render_prometheus(registry.collect())
+
+        self.assertIn(
+            'miolingo_http_requests_total{route="lessons-list",method="GET",status="200"} 2',
+            output,
+        )
+        self.assertIn(
+            'miolingo_http_requests_total{route="lessons-detail",method="GET",status="404"} 1',
+            output,
+        )
+
+    def test_fork_reset(self):
+        registry = MetricsRegistry()
+        registry.observe("lessons-list", "GET", 200, 0.01)
+        registry.pid = 0  # Simulate inherited state from a parent process.
+        registry.observe("lessons-list", "GET", 201, 0.01)
+
+        self.assertEqual(dict(registry.requests), {("lessons-list", "GET", "201"): 1})
+
+
+@override_settings(MIOLINGO_METRICS_TOKEN="secret")
+class MetricsAPIViewTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.admin = UserFactory(is_staff=True)
+        cls.url = reverse("metrics")
+
+    def test_access_anonymous(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 403)
+
+    def test_access_not_staff(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 403)
+
+    def test_access_token_invalid(self):
+        response = self.client.get(self.url, HTTP_AUTHORIZATION="Bearer foo")
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(MIOLINGO_METRICS_TOKEN=None)
+    def test_access_token_disabled(self):
+        response = self.client.get(self.url, HTTP_AUTHORIZATION="Bearer None")
+        self.assertEqual(response.status_code, 403)
+
+    def test_access_token(self):
+        response = self.client.get(self.url, HTTP_AUTHORIZATION="Bearer secret")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+
+    def test_access_staff(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_route_recorded(self):
+        self.client.force_authenticate(self.user)
+        self.client.get(reverse("lessons-list"))
+
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(self.url)
+        self.assertIn(
+            'miolingo_http_requests_total{route="lessons-list",method="GET",status="200"}',
+            response.content.decode(),
+        )
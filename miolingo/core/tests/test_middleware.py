@@ -0,0 +1,100 @@
+from django.utils.log import DEFAULT_LOGGING
+
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase, override_settings
+
+from miolingo.core.factories import LessonFactory, UserFactory
+
+
+class ServerTimingMiddlewareTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        LessonFactory(user=cls.user)
+        cls.url = reverse("lessons-list")
+
+    def get_metrics(self, response):
+        metrics = {}
+        for metric in response["Server-Timing"].split(", "):
+            name, *params = metric.split(";")
+            metrics[name] = dict(p.split("=", 1) for p in params)
+        return metrics
+
+    @override_settings(MIOLINGO_SERVER_TIMING=True)
+    def test_header(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+        metrics = self.get_metrics(response)
+        for name in ["db", "view", "serialize", "render", "total"]:
+            self.assertIn(name, metrics)
+            self.assertGreaterEqual(float(metrics[name]["dur"]), 0)
+        self.assertRegex(metrics["db"]["desc"], r'^"\d+ queries"$')
+
+    @override_settings(MIOLINGO_SERVER_TIMING=True)
+    def test_header_anonymous(self):
+        self.client.force_authenticate(None)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 401)
+
+        metrics = self.get_metrics(response)
+        self.assertIn("total", metrics)
+        self.assertNotIn("serialize", metrics)
+
+    def test_header_not_exposed(self):
+        self.client.force_authenticate(self.user)
+        with self.assertLogs("miolingo.core.middleware", level="INFO"):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Server-Timing", response)
+
+        self.client.force_authenticate(None)
+        response = self.client.get(self.url)
+        self.assertNotIn("Server-Timing", response)
+
+    def test_header_staff(self):
+        self.client.force_authenticate(UserFactory(is_staff=True))
+        response = self.client.get(self.url)
+        self.assertIn("total", self.get_metrics(response))
+
+    @override_settings(DEBUG=True)
+    def test_header_debug(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get(self.url)
+        self.assertIn("total", self.get_metrics(response))
+
+    def test_log(self):
+        self.client.force_authenticate(self.user)
+        with self.assertLogs("miolingo.core.middleware", level="INFO") as cm:
+            self.client.get(self.url)
+
+        self.assertEqual(len(cm.records), 1)
+        self.assertEqual(cm.records[0].status_code, 200)
+        self.assertEqual(cm.records[0].path, self.url)
+        self.assertIn("queries=", cm.output[0])
+
+    def test_log_handler(self):
+        from miolingo.settings import base
+
+        # Not dropped when DEBUG is off, unlike the console handler.
+        handlers = base.LOGGING["loggers"]["miolingo"]["handlers"]
+        for name in handlers:
+            self.assertNotIn("filters", base.LOGGING["handlers"][name])
+        self.assertIn(
+            "require_debug_true", DEFAULT_LOGGING["handlers"]["console"]["filters"]
+        )
+
+    @override_settings(MIOLINGO_QUERY_BUDGET=1)
+    def test_query_budget_exceeded(self):
+        self.client.force_authenticate(self.user)
+        with self.assertLogs("miolingo.core.middleware", level="WARNING") as cm:
+            self.client.get(self.url)
+
+        self.assertIn("Query budget exceeded", cm.output[0])
+
+    @override_settings(MIOLINGO_QUERY_BUDGET=0)
+    def test_query_budget_disabled(self):
+        self.client.force_authenticate(self.user)
+        with self.assertNoLogs("miolingo.core.middleware", level="WARNING"):
+            self.client.get(self.url)
@@ -0,0 +1,60 @@
+from unittest import mock
+
+from django.db import IntegrityError
+from django.test import TestCase
+from django.utils.text import slugify
+
+from miolingo.core.factories import TranslationFactory, UserFactory
+from miolingo.core.models import Translation
+from miolingo.core.utils import hash_slug, hash_text
+from miolingo.core.validators import is_unique_translation_violation
+
+
+class TranslationSlugHashTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+
+    def test_hash_64_bits(self):
+        value = hash_slug("le-village")
+        self.assertGreaterEqual(value, -(2**63))
+        self.assertLess(value, 2**63)
+        self.assertEqual(value, hash_slug("le-village"))
+        self.assertNotEqual(value, hash_slug("el-pueblo"))
+
+    def test_hash_text_normalized(self):
+        self.assertEqual(hash_text("Le Village"), hash_slug(slugify("le village")))
+
+    def test_save(self):
+        translation = Translation.objects.create(
+            user=self.user,
+            lang="fr",
+            text="Le village",
+        )
+        self.assertEqual(translation.slug_hash, hash_slug(translation.slug))
+
+    def test_unique(self):
+        TranslationFactory(user=self.user, lang="fr", text="foo")
+        with self.assertRaises(IntegrityError) as cm:
+            Translation.objects.create(user=self.user, lang="fr", text="FOO")
+        self.assertTrue(is_unique_translation_violation(cm.exception))
+
+    def test_unique_violation_other(self):
+        translation = TranslationFactory(user=self.user)
+        with self.assertRaises(IntegrityError) as cm:
+            Translation.objects.create(
+                pk=translation.pk, user=self.user, lang="fr", text="slug_hash"
+            )
+        self.assertFalse(is_unique_translation_violation(cm.exception))
+
+    def test_unique_violation_postgresql(self):
+        exc = IntegrityError("duplicate key value violates unique constraint")
+        # As wrapped by Django from psycopg.
+        exc.__cause__ = Exception()
+        exc.__cause__.diag = mock.Mock(
+            constraint_name="core_translation_unique_slug_hash"
+        )
+        self.assertTrue(is_unique_translation_violation(exc))
+
+        exc.__cause__.diag.constraint_name = "core_translation_pkey"
+        self.assertFalse(is_unique_translation_violation(exc))
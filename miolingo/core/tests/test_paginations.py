@@ -0,0 +1,109 @@
+from unittest import mock
+
+from django.contrib.admin.sites import site
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from rest_framework.request import Request
+from rest_framework.reverse import reverse
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from asgiref.sync import async_to_sync
+
+from miolingo.core.factories import TranslationFactory, UserFactory
+from miolingo.core.models import Stat, Translation
+from miolingo.core.paginations import (
+    EstimatedCountPaginator,
+    EstimatedPageNumberPagination,
+    get_estimated_count,
+)
+
+
+class EstimatedCountPaginatorTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        TranslationFactory.create_batch(3)
+
+    def test_estimate_not_available(self):
+        self.assertIsNone(get_estimated_count(Translation.objects.all()))
+        self.assertIsNone(get_estimated_count([1, 2, 3]))
+
+    def test_estimate_postgresql(self):
+        cursor = mock.MagicMock()
+        cursor.fetchone.return_value = [[{"Plan": {"Plan Rows": 12345}}]]
+        with mock.patch.object(connection, "vendor", "postgresql"), mock.patch.object(
+            connection, "cursor"
+        ) as mock_cursor:
+            mock_cursor.return_value.__enter__.return_value = cursor
+            count = get_estimated_count(Translation.objects.filter(lang="fr"))
+
+        self.assertEqual(count, 12345)
+        sql = cursor.execute.call_args[0][0]
+        self.assertTrue(sql.startswith("EXPLAIN (FORMAT JSON) SELECT"))
+        self.assertNotIn("ORDER BY", sql)
+
+    @mock.patch("miolingo.core.paginations.get_estimated_count", return_value=10**6)
+    @override_settings(MIOLINGO_PAGINATION_ESTIMATE_THRESHOLD=1000)
+    def test_estimated(self, mock_estimate):
+        paginator = EstimatedCountPaginator(Translation.objects.order_by("pk"), 2)
+        with self.assertNumQueries(0):
+            self.assertEqual(paginator.count, 10**6)
+        self.assertEqual(paginator.num_pages, 5 * 10**5)
+        self.assertEqual(len(paginator.page(1)), 2)
+
+    @mock.patch("miolingo.core.paginations.get_estimated_count", return_value=10)
+    @override_settings(MIOLINGO_PAGINATION_ESTIMATE_THRESHOLD=1000)
+    def test_exact(self, mock_estimate):
+        paginator = EstimatedCountPaginator(Translation.objects.order_by("pk"), 2)
+        self.assertEqual(paginator.count, 3)
+
+    def test_exact_not_available(self):
+        paginator = EstimatedCountPaginator(Translation.objects.order_by("pk"), 2)
+        self.assertEqual(paginator.count, 3)
+
+    def test_admin(self):
+        for model in [Translation, Stat]:
+            model_admin = site._registry[model]
+            self.assertIs(model_admin.paginator, EstimatedCountPaginator)
+            self.assertFalse(model_admin.show_full_result_count)
+
+
+class EstimatedAdminChangelistTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = UserFactory(is_staff=True, is_superuser=True)
+        TranslationFactory.create_batch(3)
+
+    @mock.patch("miolingo.core.paginations.get_estimated_count", return_value=10**6)
+    @override_settings(MIOLINGO_PAGINATION_ESTIMATE_THRESHOLD=1000)
+    def test_changelist(self, mock_estimate):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse("admin:core_translation_changelist"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["cl"].result_count, 10**6)
+        self.assertIsNone(response.context["cl"].full_result_count)
+
+
+class EstimatedPageNumberPaginationTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        TranslationFactory.create_batch(3)
+
+    def paginate(self):
+        pagination = EstimatedPageNumberPagination()
+        request = Request(APIRequestFactory().get("/", {"page_size": 2}))
+        objs = async_to_sync(pagination.apaginate_queryset)(
+            Translation.objects.order_by("pk"), request
+        )
+        return pagination, objs
+
+    @mock.patch("miolingo.core.paginations.get_estimated_count", return_value=10**6)
+    @override_settings(MIOLINGO_PAGINATION_ESTIMATE_THRESHOLD=1000)
+    def test_async_estimated(self, mock_estimate):
+        pagination, objs = self.paginate()
+        self.assertEqual(len(objs), 2)
+        self.assertEqual(pagination.page.paginator.count, 10**6)
+
+    def test_async_exact(self):
+        pagination, objs = self.paginate()
+        self.assertEqual(pagination.page.paginator.count, 3)
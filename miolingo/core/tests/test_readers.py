@@ -0,0 +1,151 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from miolingo.core.factories import LessonFactory, TranslationFactory, UserFactory
+from miolingo.core.models import Lesson, Translation
+from miolingo.core.readers import (
+    LESSON_FIELDS,
+    TRANS_PREFETCH,
+    TRANSLATION_FIELDS,
+    _set_prefetched,
+    build_lessons,
+    build_translations,
+    prefetch_trans,
+    prefetch_translations,
+)
+from miolingo.core.serializers import LessonSerializer, TranslationSerializer
+
+
+class ReadersTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        lessons = LessonFactory.create_batch(
+            3, user=cls.user, translations__num=4, translations__trans__num=2
+        )
+        # Translations shared by lessons, without trans or slug.
+        lessons[1].translations.add(*lessons[0].translations.all()[:2])
+        Translation.objects.filter(pk=lessons[2].translations.first().pk).update(
+            slug=None
+        )
+        LessonFactory(user=cls.user, translations__num=0)
+        TranslationFactory(user=cls.user, text="déjà vu \u2028")
+
+    def assertRenderEqual(self, data, expected):
+        renderer = JSONRenderer()
+        self.assertEqual(renderer.render(data), renderer.render(expected))
+
+    def test_translations(self):
+        queryset = Translation.objects.filter(user=self.user).order_by("-priority")
+        expected = TranslationSerializer(
+            queryset.prefetch_related(TRANS_PREFETCH), many=True
+        ).data
+
+        with self.assertNumQueries(2):
+            data = build_translations(list(queryset.values(*TRANSLATION_FIELDS)))
+        self.assertRenderEqual(data, expected)
+
+    def test_lessons(self):
+        queryset = Lesson.objects.filter(user=self.user).order_by("-priority", "name")
+        lessons = list(queryset)
+        prefetch_translations(lessons)
+        expected = LessonSerializer(lessons, many=True).data
+
+        with self.assertNumQueries(3):
+            data = build_lessons(list(queryset.values(*LESSON_FIELDS)))
+        self.assertRenderEqual(data, expected)
+
+    def test_empty(self):
+        self.assertEqual(build_lessons([]), [])
+        self.assertEqual(build_translations([]), [])
+        with self.assertNumQueries(0):
+            prefetch_translations([])
+            prefetch_trans([])
+
+    def test_prefetch_translations(self):
+        queryset = Lesson.objects.filter(user=self.user).order_by("-priority", "name")
+        lessons = list(queryset)
+
+        with self.assertNumQueries(2):
+            prefetch_translations(lessons)
+            data = LessonSerializer(lessons, many=True).data
+
+        expected = LessonSerializer(
+            queryset.prefetch_related("translations__trans"), many=True
+        ).data
+        self.assertEqual(data, expected)
+
+        # Translations shared by lessons and trans are a single instance.
+        instances = {}
+        count = 0
+        for lesson in lessons:
+            for translation in lesson.translations.all():
+                for obj in [translation, *translation.trans.all()]:
+                    self.assertIs(instances.setdefault(obj.pk, obj), obj)
+                    count += 1
+        self.assertLess(len(instances), count)
+
+        # Only serialized columns are loaded.
+        for obj in instances.values():
+            self.assertEqual(
+                obj.get_deferred_fields(),
+                {"slug_hash", "user_id", "created_at", "modified_at"},
+            )
+
+    def test_set_prefetched(self):
+        pk = Lesson.objects.filter(user=self.user).first().pk
+        # Same private attributes than set by prefetch_related().
+        lesson = Lesson.objects.prefetch_related("translations").get(pk=pk)
+        queryset = lesson._prefetched_objects_cache["translations"]
+        self.assertIs(queryset._prefetch_done, True)
+        self.assertIsInstance(queryset._result_cache, list)
+
+        lesson = Lesson.objects.get(pk=pk)
+        objs = list(Translation.objects.filter(lessons=lesson).order_by("pk"))
+        _set_prefetched(lesson, "translations", objs)
+
+        # Read by the relation manager, without any query.
+        with self.assertNumQueries(0):
+            self.assertEqual(list(lesson.translations.all()), objs)
+            self.assertEqual(lesson.translations.count(), len(objs))
+            self.assertTrue(lesson.translations.exists())
+
+    def test_prefetch_trans(self):
+        translations = list(Translation.objects.filter(user=self.user).order_by("pk"))
+
+        with self.assertNumQueries(1):
+            prefetch_trans(translations)
+            data = TranslationSerializer(translations, many=True).data
+
+        expected = TranslationSerializer(
+            Translation.objects.filter(user=self.user)
+            .order_by("pk")
+            .prefetch_related(TRANS_PREFETCH),
+            many=True,
+        ).data
+        self.assertEqual(data, expected)
+
+    def test_views(self):
+        self.client.force_authenticate(self.user)
+        lesson = Lesson.objects.filter(user=self.user).first()
+
+        response = self.client.get(reverse("lessons-detail", kwargs={"pk": lesson.pk}))
+        self.assertEqual(response.status_code, 200)
+        prefetch_translations([lesson])
+        expected = LessonSerializer(lesson).data
+        self.assertEqual(response.content, JSONRenderer().render(expected))
+
+        response = self.client.get(
+            reverse("translations-list"), {"ordering": "text", "page_size": 50}
+        )
+        expected = TranslationSerializer(
+            Translation.objects.filter(user=self.user)
+            .order_by("text")
+            .prefetch_related(TRANS_PREFETCH),
+            many=True,
+        ).data
+        self.assertEqual(
+            JSONRenderer().render(response.data["results"]),
+            JSONRenderer().render(expected),
+        )
@@ -0,0 +1,108 @@
+import datetime
+import unittest
+from decimal import Decimal
+from io import BytesIO
+
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase
+
+from miolingo.core.factories import LessonFactory, UserFactory
+from miolingo.core.models import Lesson
+from miolingo.core.parsers import FastJSONParser, MessagePackParser
+from miolingo.core.renderers import FastJSONRenderer, MessagePackRenderer, msgpack
+from miolingo.core.serializers import LessonSerializer
+
+
+class FastJSONRendererTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        LessonFactory.create_batch(
+            2, user=cls.user, translations__num=3, translations__trans__num=2
+        )
+
+    def assertSameRender(self, data, accepted_media_type=None):
+        self.assertEqual(
+            FastJSONRenderer().render(data, accepted_media_type),
+            JSONRenderer().render(data, accepted_media_type),
+        )
+
+    def test_lessons(self):
+        lessons = Lesson.objects.filter(user=self.user)
+        self.assertSameRender(LessonSerializer(lessons, many=True).data)
+
+    def test_types(self):
+        self.assertSameRender(
+            {
+                "datetime": datetime.datetime(2023, 1, 2, 3, 4, 5, 123456),
+                "date": datetime.date(2023, 1, 2),
+                "decimal": Decimal("1.5"),
+                "lazy": _("This field is required."),
+                "text": "àé\u2028\u2029",
+                "big": 2**70,
+            }
+        )
+
+    def test_indent(self):
+        self.assertSameRender({"foo": [1, 2]}, "application/json; indent=4")
+
+    def test_api(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.post(
+            reverse("translations-list"), data={"lang": "fr", "text": "déjà"}
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["text"], "déjà")
+
+
+class FastJSONParserTestCase(unittest.TestCase):
+    def test_parse(self):
+        data = FastJSONParser().parse(BytesIO('{"text": "déjà"}'.encode()))
+        self.assertEqual(data, {"text": "déjà"})
+
+    def test_parse_error(self):
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(BytesIO(b'{"text": NaN}'))
+
+
+@unittest.skipIf(msgpack is None, "msgpack is not installed")
+class MessagePackTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        LessonFactory(user=cls.user)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_render(self):
+        data = {"date": datetime.date(2023, 1, 2), "text": "déjà"}
+        content = MessagePackRenderer().render(data)
+        self.assertEqual(
+            MessagePackParser().parse(BytesIO(content)),
+            {"date": "2023-01-02", "text": "déjà"},
+        )
+
+    def test_parse_error(self):
+        with self.assertRaises(ParseError):
+            MessagePackParser().parse(BytesIO(b"\xc1"))
+
+    def test_negotiation(self):
+        response = self.client.get(
+            reverse("lessons-list"), HTTP_ACCEPT="application/msgpack"
+        )
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        data = msgpack.unpackb(response.content, raw=False)
+        self.assertEqual(data["count"], 1)
+
+    def test_request(self):
+        response = self.client.post(
+            reverse("translations-list"),
+            data=msgpack.packb({"lang": "fr", "text": "foo"}),
+            content_type="application/msgpack",
+        )
+        self.assertEqual(response.status_code, 201)
@@ -0,0 +1,112 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.cache.backends.dummy import DummyCache
+
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase, override_settings
+
+from rest_framework_simplejwt.tokens import AccessToken
+
+from miolingo.core.checks import check_replica_cache
+from miolingo.core.factories import LessonFactory, TranslationFactory, UserFactory
+from miolingo.core.models import Lesson, User
+from miolingo.core.routers import ReplicaRouter, use_primary
+
+
+@override_settings(MIOLINGO_REPLICA_DATABASES=["replica"])
+class ReplicaRouterTestCase(APITestCase):
+    databases = {"default", "replica"}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        # Replicated user, but nothing else.
+        User.objects.using("replica").create(
+            pk=cls.user.pk,
+            username=cls.user.username,
+            password=cls.user.password,
+        )
+        LessonFactory(user=cls.user)
+        cls.url = reverse("lessons-list")
+
+    def setUp(self):
+        cache.clear()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+
+    def test_router(self):
+        router = ReplicaRouter()
+        self.assertIsNone(router.db_for_write(Lesson))
+        self.assertIsNone(router.db_for_read(Lesson))
+
+        with use_primary(False):
+            self.assertEqual(router.db_for_read(Lesson), "replica")
+
+            with override_settings(MIOLINGO_REPLICA_DATABASES=[]):
+                self.assertIsNone(router.db_for_read(Lesson))
+
+    def test_allow_relation(self):
+        router = ReplicaRouter()
+        lesson = Lesson.objects.first()
+        user = User.objects.using("replica").get(pk=self.user.pk)
+        self.assertTrue(router.allow_relation(lesson, user))
+
+        user._state.db = "other"
+        self.assertIsNone(router.allow_relation(lesson, user))
+
+    def test_outside_request(self):
+        self.assertEqual(Lesson.objects.filter(user=self.user).count(), 1)
+
+    def test_read_replica(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 0)
+
+    def test_outside_api(self):
+        # Neither the session nor the user are on the replica.
+        self.client.force_login(UserFactory(is_staff=True))
+        with self.assertNumQueries(0, using="replica"):
+            response = self.client.get(reverse("admin:index"))
+        self.assertEqual(response.status_code, 200)
+
+    def test_check_replica_cache(self):
+        self.assertEqual(
+            [error.id for error in check_replica_cache(None)], ["miolingo.E002"]
+        )
+        with mock.patch(
+            "miolingo.core.checks.get_cache", return_value=DummyCache("", {})
+        ):
+            self.assertEqual(check_replica_cache(None), [])
+        with override_settings(MIOLINGO_REPLICA_DATABASES=[]):
+            self.assertEqual(check_replica_cache(None), [])
+
+    def test_read_your_writes(self):
+        translation = TranslationFactory(user=self.user)
+        response = self.client.post(
+            self.url, data={"name": "foo", "translations": [translation.pk]}
+        )
+        self.assertEqual(response.status_code, 201)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["count"], 2)
+
+        # Other clients (i.e: another device) still read from replicas.
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["count"], 0)
+
+    def test_stickiness_expired(self):
+        self.client.patch(reverse("users-detail", kwargs={"pk": self.user.pk}))
+        cache.clear()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["count"], 0)
+
+    def test_anonymous(self):
+        self.client.credentials()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 401)
@@ -0,0 +1,74 @@
+import random
+from collections import Counter
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from miolingo.core.factories import LessonFactory, TranslationFactory, UserFactory
+from miolingo.core.sampling import UNIFORM, AliasTable, get_alias_table, sample_deck
+
+
+class AliasTableTestCase(TestCase):
+    def test_draw(self):
+        table = AliasTable(["a", "b", "c"], [1, 2, 7])
+        rand = random.Random(0)
+        counts = Counter(table.ids[table.draw(rand)] for _ in range(0, 10000))
+        self.assertAlmostEqual(counts["a"] / 10000, 0.1, delta=0.02)
+        self.assertAlmostEqual(counts["b"] / 10000, 0.2, delta=0.02)
+        self.assertAlmostEqual(counts["c"] / 10000, 0.7, delta=0.02)
+
+    def test_uniform(self):
+        table = AliasTable(range(0, 4), [3] * 4)
+        self.assertEqual(table.prob, [1.0] * 4)
+
+    def test_empty(self):
+        self.assertEqual(len(AliasTable([], [])), 0)
+
+
+class SampleDeckTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        # Committed before the tests, version bumps are not pending anymore.
+        with cls.captureOnCommitCallbacks(execute=True):
+            cls.lesson = LessonFactory(user=cls.user, translations__num=0)
+            cls.translations = TranslationFactory.create_bulk(
+                20, user=cls.user, lang="fr", priority=0
+            )
+            cls.heavy = TranslationFactory(user=cls.user, lang="es", priority=1000)
+            cls.lesson.translations.set(cls.translations + [cls.heavy])
+
+    def test_weighted(self):
+        rand = random.Random(0)
+        decks = [sample_deck(self.lesson, 2, rand=rand) for _ in range(0, 50)]
+        for deck in decks:
+            self.assertEqual(len(set(deck)), 2)
+        # Nearly always drawn.
+        self.assertGreater(sum(self.heavy.pk in deck for deck in decks), 45)
+
+    def test_weighted_fallback(self):
+        # Most draws are the heavy one, so the rest is sorted by weight.
+        deck = sample_deck(self.lesson, 15, rand=random.Random(0))
+        self.assertEqual(len(set(deck)), 15)
+        self.assertIn(self.heavy.pk, deck)
+
+    def test_uniform(self):
+        deck = sample_deck(self.lesson, 5, strategy=UNIFORM, rand=random.Random(0))
+        self.assertEqual(len(set(deck)), 5)
+
+    def test_whole_lesson(self):
+        deck = sample_deck(self.lesson, 100)
+        self.assertCountEqual(deck, [t.pk for t in self.translations + [self.heavy]])
+
+    @override_settings(MIOLINGO_DECK_CACHE_TIMEOUT=60)
+    def test_cached(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        with self.assertNumQueries(1):
+            get_alias_table(self.lesson)
+            get_alias_table(self.lesson)
+
+        # Until the lesson is changed.
+        with self.captureOnCommitCallbacks(execute=True):
+            self.lesson.translations.remove(self.heavy)
+        self.assertEqual(len(get_alias_table(self.lesson)), 20)
@@ -0,0 +1,146 @@
+from django.contrib.auth.models import AnonymousUser, Group
+
+from rest_framework.reverse import reverse
+from rest_framework.test import APITestCase, override_settings
+
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.tokens import AccessToken
+
+from miolingo.core.factories import LessonFactory, TrainingFactory, UserFactory
+from miolingo.core.models import Lesson, Stat, Training, Translation, User
+from miolingo.core.routers import ShardRouter
+from miolingo.core.sharding import get_user_shard, pick_shard, use_shard
+
+
+@override_settings(MIOLINGO_SHARD_DATABASES=["default", "shard"])
+class ShardRouterTestCase(APITestCase):
+    databases = {"default", "shard"}
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory(shard="shard")
+        cls.other = UserFactory(shard="default")
+        with use_shard("shard"):
+            cls.lesson = LessonFactory(user=cls.user, translations__num=2)
+        cls.other_lesson = LessonFactory(user=cls.other, translations__num=1)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_pick_shard(self):
+        self.assertEqual(pick_shard("foo"), pick_shard("foo"))
+        shards = {pick_shard(f"user{i}") for i in range(0, 20)}
+        self.assertEqual(shards, {"default", "shard"})
+
+        with override_settings(MIOLINGO_SHARD_DATABASES=[]):
+            self.assertEqual(pick_shard("foo"), "default")
+
+    def test_assign_shard(self):
+        user = UserFactory()
+        self.assertEqual(user.shard, pick_shard(user.username))
+
+    def test_get_user_shard(self):
+        self.assertEqual(get_user_shard(self.user), "shard")
+        self.assertEqual(get_user_shard(AnonymousUser()), "default")
+
+        token = AccessToken.for_user(self.user)
+        self.assertEqual(get_user_shard(TokenUser(token)), "shard")
+
+    def test_db_for_model(self):
+        router = ShardRouter()
+        self.assertEqual(router.db_for_read(Lesson), "default")
+        self.assertIsNone(router.db_for_read(User))
+        with use_shard("shard"):
+            self.assertEqual(router.db_for_write(Translation.trans.through), "shard")
+
+        # Hints of related objects.
+        self.assertEqual(router.db_for_read(Lesson, instance=self.user), "shard")
+        self.assertEqual(router.db_for_read(Stat, instance=self.lesson), "shard")
+        self.assertEqual(router.db_for_read(User, instance=self.lesson), "default")
+
+        with override_settings(MIOLINGO_SHARD_DATABASES=[]):
+            self.assertIsNone(router.db_for_read(Lesson, instance=self.user))
+
+    def test_allow_relation(self):
+        router = ShardRouter()
+        self.assertTrue(router.allow_relation(self.lesson, self.user))
+        self.assertFalse(router.allow_relation(self.lesson, self.other_lesson))
+
+    def test_allow_migrate(self):
+        router = ShardRouter()
+        self.assertIsNone(router.allow_migrate("default", "auth", "group"))
+        self.assertTrue(router.allow_migrate("shard", "core", "lesson_translations"))
+        self.assertFalse(router.allow_migrate("shard", "core", "user"))
+        self.assertFalse(router.allow_migrate("shard", "auth", "group"))
+
+    def test_related_objects(self):
+        self.assertEqual(self.user.lessons.count(), 1)
+        self.assertEqual(self.lesson.user, self.user)
+        self.assertEqual(self.lesson.translations.count(), 2)
+
+    def test_list(self):
+        response = self.client.get(reverse("lessons-list"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(response.data["results"][0]["id"], self.lesson.pk)
+
+        self.client.force_authenticate(self.other)
+        response = self.client.get(reverse("lessons-list"))
+        self.assertEqual(response.data["results"][0]["id"], self.other_lesson.pk)
+
+    def test_stateless_user(self):
+        self.client.force_authenticate(None)
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+        with override_settings(MIOLINGO_AUTH_STATELESS_READS=True):
+            response = self.client.get(reverse("translations-list"))
+        self.assertEqual(response.data["count"], 2)
+
+    def test_create(self):
+        response = self.client.post(
+            reverse("translations-list"),
+            data={
+                "lang": "fr",
+                "text": "foo",
+                "trans": [{"lang": "es", "text": "bar"}],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        translation = Translation.objects.using("shard").get(pk=response.data["id"])
+        self.assertEqual(translation.trans.count(), 1)
+        self.assertFalse(Translation.objects.filter(user=self.user).exists())
+
+        response = self.client.post(
+            reverse("trainings-list"), data={"lesson": self.lesson.pk}
+        )
+        self.assertEqual(response.status_code, 201)
+        training = Training.objects.using("shard").get(pk=response.data["id"])
+
+        response = self.client.post(
+            reverse("stats-list"),
+            data={
+                "training": training.pk,
+                "translation": self.lesson.translations.first().pk,
+                "succeed": True,
+            },
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Stat.objects.using("shard").filter(training=training).exists())
+
+    def test_delete_user(self):
+        with use_shard("shard"):
+            TrainingFactory(user=self.user, lesson=self.lesson, stats=True)
+
+        self.user.delete()
+        self.assertFalse(Lesson.objects.using("shard").exists())
+        self.assertFalse(Translation.objects.using("shard").exists())
+        self.assertFalse(Training.objects.using("shard").exists())
+        self.assertFalse(Stat.objects.using("shard").exists())
+        # Other users data are left untouched.
+        self.assertTrue(Lesson.objects.filter(pk=self.other_lesson.pk).exists())
+
+    def test_shared_models(self):
+        Group.objects.create(name="foo")
+        self.assertEqual(Group.objects.using("default").count(), 1)
@@ -1,3 +1,5 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils.text import slugify
 from django.utils.timezone import now
 
@@ -350,6 +352,55 @@ class TranslationCreateAPIViewTestCase(APITestCase):
             response.data[api_settings.NON_FIELD_ERRORS_KEY][0],
         )
 
+    @override_settings(LANGUAGE_CODE="en")
+    def test_unique_together_insert_first(self):
+        TranslationFactory(user=self.user, lang="fr", text="Foo")
+        TranslationFactory(user=UserFactory(), lang="fr", text="bar")
+
+        self.client.force_authenticate(self.user)
+        # No query to check first, only the insert which fails.
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(self.url, data={"lang": "fr", "text": "foo"})
+        self.assertEqual(response.status_code, 400)
+        for query in ctx.captured_queries:
+            self.assertFalse(query["sql"].startswith("SELECT"), query["sql"])
+        error = response.data[api_settings.NON_FIELD_ERRORS_KEY][0]
+        self.assertEqual(error, "This translation already exists.")
+        self.assertEqual(error.code, "unique")
+
+        # Still usable.
+        response = self.client.post(self.url, data={"lang": "fr", "text": "bar"})
+        self.assertEqual(response.status_code, 201)
+
+    def test_create_list(self):
+        self.client.force_authenticate(self.user)
+        data = [
+            {"lang": "fr", "text": "foo", "trans": [{"lang": "es", "text": "bar"}]},
+            {"lang": "es", "text": "foo"},
+        ]
+        response = self.client.post(self.url, data=data, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([item["lang"] for item in response.data], ["fr", "es"])
+        self.assertEqual(Translation.objects.filter(user=self.user).count(), 3)
+
+    @override_settings(LANGUAGE_CODE="en")
+    def test_create_list_unique_together(self):
+        TranslationFactory(user=self.user, lang="fr", text="foo")
+
+        self.client.force_authenticate(self.user)
+        data = [
+            {"lang": "fr", "text": "Foo"},
+            {"lang": "es", "text": "bar"},
+            {"lang": "es", "text": "bar!"},
+        ]
+        response = self.client.post(self.url, data=data, format="json")
+        self.assertEqual(response.status_code, 400)
+        key = api_settings.NON_FIELD_ERRORS_KEY
+        self.assertEqual(response.data[0][key][0].code, "unique")
+        self.assertEqual(response.data[1], {})
+        self.assertEqual(response.data[2][key][0].code, "unique")
+        self.assertEqual(Translation.objects.filter(user=self.user).count(), 1)
+
     def test_create_without_trans(self):
         self.client.force_authenticate(self.user)
         data = {
@@ -539,6 +590,19 @@ class TranslationPartialUpdateAPIViewTestCase(APITestCase):
         self.assertEqual(obj.text, data["text"])
         self.assertEqual(obj.priority, data["priority"])
 
+    @override_settings(LANGUAGE_CODE="en")
+    def test_update_unique_together(self):
+        TranslationFactory(user=self.user, lang="fr", text="foo")
+
+        self.client.force_authenticate(self.user)
+        response = self.client.patch(self.url, data={"text": "Foo"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data[api_settings.NON_FIELD_ERRORS_KEY][0].code, "unique"
+        )
+        self.obj.refresh_from_db()
+        self.assertEqual(self.obj.text, "test")
+
     def test_update_remove_trans(self):
         self.client.force_authenticate(self.user)
 
@@ -1286,6 +1350,77 @@ class TrainingCreateAPIViewTestCase(APITestCase):
         obj = Training.objects.last()
         self.assertEqual(response.data["lesson"], obj.lesson.pk)
         self.assertEqual(obj.user, self.user)
+        self.assertIsNone(response.data["deck"])
+
+    def test_create_deck(self):
+        lesson = LessonFactory(user=self.user, translations__num=5)
+        self.client.force_authenticate(self.user)
+        for strategy in ["weighted", "uniform"]:
+            data = {"lesson": lesson.pk, "size": 3, "strategy": strategy}
+            response = self.client.post(self.url, data=data)
+            self.assertEqual(response.status_code, 201)
+
+            deck = response.data["deck"]
+            self.assertEqual(len(set(deck)), 3)
+            self.assertEqual(Training.objects.get(pk=response.data["id"]).deck, deck)
+            self.assertLessEqual(
+                set(deck), set(lesson.translations.values_list("pk", flat=True))
+            )
+            self.assertNotIn("size", response.data)
+
+    @override_settings(LANGUAGE_CODE="en")
+    def test_create_deck_invalid(self):
+        self.client.force_authenticate(self.user)
+        data = {"lesson": self.lesson.pk, "size": 0, "strategy": "FOO"}
+        response = self.client.post(self.url, data=data)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.data), {"size", "strategy"})
+
+    def test_create_deck_empty_lesson(self):
+        lesson = LessonFactory(user=self.user, translations__num=0)
+        self.client.force_authenticate(self.user)
+        response = self.client.post(self.url, data={"lesson": lesson.pk, "size": 3})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data["size"][0], "The lesson has no translations to draw."
+        )
+        self.assertFalse(Training.objects.exists())
+
+
+class TrainingRetrieveAPIViewTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = UserFactory()
+        cls.lesson = LessonFactory(user=cls.user, translations__num=3)
+        cls.deck = list(cls.lesson.translations.values_list("pk", flat=True)[:2])
+        cls.training = TrainingFactory(user=cls.user, lesson=cls.lesson, deck=cls.deck)
+        cls.url = reverse("trainings-detail", kwargs={"pk": cls.training.pk})
+
+    def test_access_anonymous(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 401)
+
+    def test_not_owner(self):
+        self.client.force_authenticate(UserFactory())
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 404)
+
+    def test_retrieve(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["deck"], self.deck)
+        self.assertEqual(
+            [t["id"] for t in response.data["lesson"]["translations"]], self.deck
+        )
+
+    def test_retrieve_whole_lesson(self):
+        training = TrainingFactory(user=self.user, lesson=self.lesson)
+        url = reverse("trainings-detail", kwargs={"pk": training.pk})
+        self.client.force_authenticate(self.user)
+        response = self.client.get(url)
+        self.assertIsNone(response.data["deck"])
+        self.assertEqual(len(response.data["lesson"]["translations"]), 3)
 
 
 class TrainingPartialUpdateAPIViewTestCase(APITestCase):
@@ -1370,6 +1505,7 @@ class StatCreateAPIViewTestCase(APITestCase):
         cls.training = TrainingFactory(
             user=cls.user,
             lesson=cls.lesson,
+            finished_at=None,
         )
         cls.url = reverse("stats-list")
 
@@ -1463,6 +1599,42 @@ class StatCreateAPIViewTestCase(APITestCase):
             response.data["translation"][0],
         )  # noqa
 
+    @override_settings(LANGUAGE_CODE="en")
+    def test_translation_not_in_deck(self):
+        translations = list(self.lesson.translations.order_by("pk"))
+        training = TrainingFactory(
+            user=self.user,
+            lesson=self.lesson,
+            finished_at=None,
+            deck=[translations[0].pk],
+        )
+        self.client.force_authenticate(self.user)
+
+        data = {"training": training.pk, "translation": translations[1].pk}
+        response = self.client.post(self.url, data=data)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(
+            "The translation is not in the training deck.",
+            response.data["translation"][0],
+        )
+
+        data = {"training": training.pk, "translation": translations[0].pk}
+        response = self.client.post(self.url, data=data)
+        self.assertEqual(response.status_code, 201)
+
+    @override_settings(LANGUAGE_CODE="en")
+    def test_training_finished(self):
+        training = TrainingFactory(user=self.user, lesson=self.lesson)
+        self.client.force_authenticate(self.user)
+
+        data = {
+            "training": training.pk,
+            "translation": self.lesson.translations.first().pk,
+        }
+        response = self.client.post(self.url, data=data)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("The training is finished.", response.data["training"][0])
+
     def test_create(self):
         translation = self.training.lesson.translations.first()
 
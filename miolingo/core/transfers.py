@@ -0,0 +1,149 @@
+import csv
+import io
+from itertools import islice
+
+from django.db import DatabaseError, router, transaction
+
+from miolingo.core.bulk import get_or_create_translations, link_translations
+from miolingo.core.models import Translation
+from miolingo.core.utils import hash_text
+
+
+def import_translations(user, csvfile, src, tgt, progress=None, step=100):
+    """
+    Import lines "source;translation" of a CSV file as linked translations of
+    the user. Return the counts of created and duplicate translations, with
+    errors as (line, message). Progress is called with the lines done.
+    """
+    count = 0
+    duplicate = 0
+    errors = []
+
+    reader = csv.DictReader(csvfile, fieldnames=["src", "tgt"], delimiter=";")
+    for row in reader:
+        txt_src = row["src"].strip()
+        txt_tgt = row["tgt"].strip()
+
+        try:
+            # A transaction per line: the user data version is bumped once.
+            with transaction.atomic(using=router.db_for_write(Translation)):
+                created = import_line(user, src, txt_src, tgt, txt_tgt)
+            count += created
+            duplicate += 2 - created
+        except DatabaseError as exc:
+            errors.append((reader.line_num, str(exc)))
+
+        if progress is not None and reader.line_num % step == 0:
+            progress(reader.line_num)
+
+    return {"created": count, "duplicate": duplicate, "errors": errors}
+
+
+def import_line(user, src, txt_src, tgt, txt_tgt):
+    """
+    Import a line as linked translations, return the count of those created.
+    """
+    # First proceed original source.
+    source, src_created = Translation.objects.get_or_create(
+        lang=src,
+        slug_hash=hash_text(txt_src),
+        user=user,
+        defaults={
+            "text": txt_src,
+        },
+    )
+
+    # Then proceed translation.
+    trans, tgt_created = Translation.objects.get_or_create(
+        lang=tgt,
+        slug_hash=hash_text(txt_tgt),
+        user=user,
+        defaults={
+            "text": txt_tgt,
+        },
+    )
+
+    # No worry, ORM will prevent duplicate:
+    # @see https://docs.djangoproject.com/en/4.2/topics/db/examples/many_to_many/
+    source.trans.add(trans)
+    return src_created + tgt_created
+
+
+def bulk_import_translations(user, csvfile, src, tgt, batch_size=1000):
+    """
+    Import lines "source;translation" of a CSV file like import_translations,
+    but reading the file lazily and with bulk inserts by batches of lines.
+    Yield the counts after each batch, with the number of lines done.
+    """
+    counts = {"lines": 0, "created": 0, "duplicate": 0, "errors": []}
+    max_length = Translation._meta.get_field("text").max_length
+
+    reader = csv.reader(csvfile, delimiter=";")
+    while True:
+        rows = list(islice(reader, batch_size))
+        if not rows:
+            break
+
+        # Invalid lines are reported instead of failing the whole batch.
+        line = counts["lines"]
+        pairs = []
+        lines = []
+        for row in rows:
+            line += 1
+            texts = [text.strip() for text in row[:2]]
+            if len(texts) < 2 or not all(texts):
+                counts["errors"].append((line, "Expected 'source;translation'"))
+            elif any(len(text) > max_length for text in texts):
+                counts["errors"].append(
+                    (line, f"Text longer than {max_length} characters")
+                )
+            else:
+                pairs.append(texts)
+                lines.append(line)
+
+        # A failing batch is rolled back and reported on its lines, like
+        # import_translations does per line, then the import goes on.
+        try:
+            with transaction.atomic(using=router.db_for_write(Translation)):
+                created, sources = get_or_create_translations(
+                    user, [(src, txt_src) for txt_src, txt_tgt in pairs], batch_size
+                )
+                links = [
+                    (sources[(src, hash_text(txt_src))], tgt, txt_tgt)
+                    for txt_src, txt_tgt in pairs
+                ]
+                created += link_translations(user, links, batch_size)[0]
+        except DatabaseError as exc:
+            counts["errors"] += [(failed, str(exc)) for failed in lines]
+        else:
+            counts["created"] += created
+            # Like get_or_create() for each text: if not created, it is a duplicate.
+            counts["duplicate"] += len(pairs) * 2 - created
+
+        counts["lines"] = line
+        yield counts
+
+
+def export_translations(user, src, tgt):
+    """
+    Return the translations of the user in src linked to others in tgt, as a
+    CSV file content which can be imported back, with the number of rows.
+    """
+    Through = Translation.trans.through
+    rows = (
+        Through.objects.filter(
+            from_translation__user=user.pk,
+            from_translation__lang=src,
+            to_translation__lang=tgt,
+        )
+        .order_by("from_translation__text", "to_translation__text")
+        .values_list("from_translation__text", "to_translation__text")
+    )
+
+    output = io.StringIO()
+    writer = csv.writer(output, delimiter=";", lineterminator="\n")
+    count = 0
+    for row in rows.iterator():
+        writer.writerow(row)
+        count += 1
+    return output.getvalue(), count
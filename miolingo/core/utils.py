@@ -0,0 +1,15 @@
+from hashlib import blake2b
+
+from django.utils.text import slugify
+
+
+def hash_slug(slug):
+    """
+    Return a signed 64-bit digest of the slug, to fit into a BigIntegerField.
+    """
+    digest = blake2b((slug or "").encode(), digest_size=8).digest()
+    return int.from_bytes(digest, byteorder="big", signed=True)
+
+
+def hash_text(text):
+    return hash_slug(slugify(text))
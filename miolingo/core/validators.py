@@ -1,38 +1,93 @@
 from django.utils.text import gettext_lazy as _
-from django.utils.text import slugify
 
 from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
 
 from miolingo.core.models import Translation
+from miolingo.core.utils import hash_text
 
+UNIQUE_TRANSLATION_MESSAGE = _("This translation already exists.")
+
+
+def unique_translation_error():
+    return ValidationError(
+        detail={api_settings.NON_FIELD_ERRORS_KEY: [UNIQUE_TRANSLATION_MESSAGE]},
+        code="unique",
+    )
+
+
+UNIQUE_TRANSLATION_CONSTRAINT = "core_translation_unique_slug_hash"
+
+
+def is_unique_translation_violation(exc):
+    """
+    Whether the integrity error is about the user, lang and slug_hash unique
+    constraint: named by PostgreSQL, SQLite only reports its columns.
+    """
+    diag = getattr(exc.__cause__, "diag", None)
+    if diag is not None:
+        return diag.constraint_name == UNIQUE_TRANSLATION_CONSTRAINT
+
+    opts = Translation._meta
+    constraint = next(
+        c for c in opts.constraints if c.name == UNIQUE_TRANSLATION_CONSTRAINT
+    )
+    columns = ", ".join(
+        f"{opts.db_table}.{opts.get_field(name).column}" for name in constraint.fields
+    )
+    return str(exc) == f"UNIQUE constraint failed: {columns}"
+
+
+class UniqueTogetherTranslationListValidator:
+    """
+    Check the (lang, slug) keys of a list payload, against the translations
+    of the user with a single query and within the list itself. Single
+    translations are inserted first instead, see unique_translation_error().
+    """
 
-class UniqueTogetherTranslationValidator:
     requires_context = True
 
-    def __call__(self, attrs, serializer):
-        qs = Translation.objects.all()
-        lang = attrs.get("lang", None)
-        text = attrs.get("text", None)
+    def __call__(self, items, serializer):
+        user = serializer.context["request"].user
+        keys = [(attrs["lang"], hash_text(attrs["text"])) for attrs in items]
+
+        existing = set(
+            Translation.objects.filter(
+                user=user.pk, slug_hash__in={h for lang, h in keys}
+            ).values_list("lang", "slug_hash")
+        )
+
+        errors = []
+        for key in keys:
+            if key in existing:
+                errors.append(unique_translation_error().detail)
+            else:
+                errors.append({})
+            existing.add(key)
 
-        if serializer.instance:
-            qs = qs.exclude(pk=serializer.instance.pk)
-            lang = lang or serializer.instance.lang
-            text = text or serializer.instance.text
+        if any(errors):
+            raise ValidationError(errors)
 
-        filters = {
-            "user": serializer.context["request"].user,
-            "lang": lang,
-            "slug": slugify(text),
-        }
 
-        exists = qs.filter(**filters).exists()
-        if exists:
+class TrainingDeckValidator:
+    """
+    Check the translation of a stat is in the deck of its training, if any.
+    """
+
+    def __call__(self, attrs):
+        deck = attrs["training"].deck
+        if deck is not None and attrs["translation"].pk not in deck:
             raise ValidationError(
-                detail=_("This translation already exists."),
-                code="unique",
+                {"translation": _("The translation is not in the training deck.")}
             )
 
 
+class IsUnfinishedTrainingValidator:
+    def __call__(self, training):
+        if training.finished_at is not None:
+            raise ValidationError(_("The training is finished."))
+
+
 class IsActiveLessonValidator:
     def __call__(self, lesson):
         if not lesson.is_active:
@@ -1,13 +1,44 @@
 from django.contrib.auth import get_user_model
 
+from rest_framework import status
+from rest_framework.authentication import SessionAuthentication
 from rest_framework.decorators import action
 from rest_framework.generics import get_object_or_404
-from rest_framework.mixins import CreateModelMixin, UpdateModelMixin
+from rest_framework.mixins import (
+    CreateModelMixin,
+    ListModelMixin,
+    RetrieveModelMixin,
+    UpdateModelMixin,
+)
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
+from rest_framework.views import APIView
 from rest_framework.viewsets import GenericViewSet, ModelViewSet
 
-from miolingo.core.models import Lesson, Training, Translation
+from miolingo.core.autotranslate import AutotranslateError, get_translator
+from miolingo.core.buffers import get_stat_buffer
+from miolingo.core.cache import CachedResponseMixin, ConditionalResponseMixin
+from miolingo.core.jobs import enqueue
+from miolingo.core.metrics import registry, render_prometheus
+from miolingo.core.models import Job, Lesson, Training, Translation
+from miolingo.core.permissions import HasMetricsToken
+from miolingo.core.readers import (
+    LESSON_FIELDS,
+    TRANS_PREFETCH,
+    TRANSLATION_FIELDS,
+    ValuesReadMixin,
+    build_lessons,
+    build_translations,
+    prefetch_translations,
+)
+from miolingo.core.renderers import PrometheusRenderer
 from miolingo.core.serializers import (
+    AutotranslateSerializer,
+    ExportJobSerializer,
+    ImportJobSerializer,
+    JobListSerializer,
+    JobSerializer,
     LessonSaveSerializer,
     LessonSerializer,
     StatSaveSerializer,
@@ -19,10 +50,23 @@ from miolingo.core.serializers import (
     UserSaveSerializer,
     UserSerializer,
 )
+from miolingo.core.sharding import ShardedViewMixin
 
 User = get_user_model()
 
 
+def accepted_job_response(job, request):
+    """
+    Answer a job enqueued, to be polled at its Location.
+    """
+    url = reverse("jobs-detail", kwargs={"pk": job.pk}, request=request)
+    return Response(
+        JobSerializer(job).data,
+        status=status.HTTP_202_ACCEPTED,
+        headers={"Location": url},
+    )
+
+
 class UserViewset(UpdateModelMixin, GenericViewSet):
     filter_backends = []
     pagination_class = None
@@ -31,7 +75,7 @@ class UserViewset(UpdateModelMixin, GenericViewSet):
         if getattr(self, "swagger_fake_view", False):  # pragma: no cover
             return User.objects.none()
 
-        return User.objects.filter(username=self.request.user.username)
+        return User.objects.filter(pk=self.request.user.pk)
 
     def get_serializer_class(self):
         if self.action in ["create", "partial_update", "update"]:
@@ -41,43 +85,89 @@ class UserViewset(UpdateModelMixin, GenericViewSet):
 
     @action(detail=False)
     def me(self, request, *args, **kwargs):
-        instance = get_object_or_404(self.get_queryset())
+        # Authenticated user is already loaded, unless stateless.
+        if isinstance(request.user, User):
+            instance = request.user
+        else:
+            instance = get_object_or_404(self.get_queryset())
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
 
 
-class TranslationViewset(ModelViewSet):
+class TranslationViewset(
+    ShardedViewMixin,
+    CachedResponseMixin,
+    ConditionalResponseMixin,
+    ValuesReadMixin,
+    ModelViewSet,
+):
     filterset_fields = ["lang"]
     ordering_fields = ["text", "priority"]
     ordering = ["-priority"]
+    values_fields = TRANSLATION_FIELDS
 
     def get_queryset(self):
         if getattr(self, "swagger_fake_view", False):  # pragma: no cover
             return Translation.objects.none()
 
-        return Translation.objects.filter(user=self.request.user).prefetch_related(
-            "trans"
+        return Translation.objects.filter(user=self.request.user.pk).prefetch_related(
+            TRANS_PREFETCH
         )
 
+    def build(self, rows):
+        return build_translations(rows)
+
+    def get_serializer(self, *args, **kwargs):
+        # Translations can be created by lists.
+        if self.action == "create" and isinstance(kwargs.get("data"), list):
+            kwargs["many"] = True
+        return super().get_serializer(*args, **kwargs)
+
     def get_serializer_class(self):
         if self.action in ["create", "partial_update", "update"]:
             return TranslationSaveSerializer
+        elif self.action == "autotranslate":
+            return AutotranslateSerializer
         else:
             return TranslationSerializer
 
+    @action(detail=False, methods=["post"])
+    def autotranslate(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        # Don't enqueue jobs which cannot succeed.
+        try:
+            get_translator()
+        except AutotranslateError as exc:
+            return Response(
+                {"detail": str(exc)}, status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+
+        job = enqueue("autotranslate", request.user, **serializer.validated_data)
+        return accepted_job_response(job, request)
+
 
-class LessonViewset(ModelViewSet):
+class LessonViewset(
+    ShardedViewMixin,
+    CachedResponseMixin,
+    ConditionalResponseMixin,
+    ValuesReadMixin,
+    ModelViewSet,
+):
     filterset_fields = ["is_active"]
     ordering_fields = ["priority", "name"]
     ordering = ["-priority", "name"]
+    values_fields = LESSON_FIELDS
 
     def get_queryset(self):
         if getattr(self, "swagger_fake_view", False):  # pragma: no cover
             return Lesson.objects.none()
 
-        return Lesson.objects.filter(user=self.request.user).prefetch_related(
-            "translations__trans"
-        )
+        # Reads are served from values(), writes only return translations pks.
+        return Lesson.objects.filter(user=self.request.user.pk)
+
+    def build(self, rows):
+        return build_lessons(rows)
 
     def get_serializer_class(self):
         if self.action in ["create", "partial_update", "update"]:
@@ -86,12 +176,27 @@ class LessonViewset(ModelViewSet):
             return LessonSerializer
 
 
-class TrainingViewset(CreateModelMixin, UpdateModelMixin, GenericViewSet):
+class TrainingViewset(
+    ShardedViewMixin,
+    CreateModelMixin,
+    RetrieveModelMixin,
+    UpdateModelMixin,
+    GenericViewSet,
+):
     def get_queryset(self):
         if getattr(self, "swagger_fake_view", False):  # pragma: no cover
             return Training.objects.none()
 
-        return Training.objects.filter(user=self.request.user)
+        return Training.objects.filter(user=self.request.user.pk).select_related(
+            "lesson"
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        # The training with the translations of its lesson (those of its deck
+        # if drawn), like the async view.
+        instance = self.get_object()
+        prefetch_translations([instance.lesson], decks=[instance.deck])
+        return Response(self.get_serializer(instance).data)
 
     def get_serializer_class(self):
         if self.action == "create":
@@ -100,10 +205,77 @@ class TrainingViewset(CreateModelMixin, UpdateModelMixin, GenericViewSet):
         elif self.action in ["partial_update", "update"]:
             return TrainingUpdateSerializer
 
-        else:  # pragma: no cover
+        else:
             return TrainingSerializer
 
 
-class StatViewset(CreateModelMixin, GenericViewSet):
+class StatViewset(ShardedViewMixin, CreateModelMixin, GenericViewSet):
     def get_serializer_class(self):
         return StatSaveSerializer
+
+    def create(self, request, *args, **kwargs):
+        buffer = get_stat_buffer()
+        if buffer is None:
+            return super().create(request, *args, **kwargs)
+
+        # Inserted later, so without id yet.
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        buffer.append(**serializer.validated_data)
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
+
+class JobViewset(ListModelMixin, RetrieveModelMixin, GenericViewSet):
+    """
+    Enqueue heavy operations as background jobs, then poll their status.
+    """
+
+    filterset_fields = ["kind", "status"]
+    ordering_fields = ["created_at"]
+    ordering = ["-created_at"]
+
+    def get_queryset(self):
+        if getattr(self, "swagger_fake_view", False):  # pragma: no cover
+            return Job.objects.none()
+
+        queryset = Job.objects.filter(user=self.request.user.pk)
+        if self.action == "list":
+            # Not listed, they may be large (i.e: contents of files).
+            queryset = queryset.defer("payload", "result")
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action == "list":
+            return JobListSerializer
+        elif self.action == "import_file":
+            return ImportJobSerializer
+        elif self.action == "export_file":
+            return ExportJobSerializer
+        else:
+            return JobSerializer
+
+    def enqueue(self, kind, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        job = enqueue(kind, request.user, **serializer.validated_data)
+        return accepted_job_response(job, request)
+
+    @action(detail=False, methods=["post"], url_path="import", url_name="import")
+    def import_file(self, request, *args, **kwargs):
+        return self.enqueue("import", request)
+
+    @action(detail=False, methods=["post"], url_path="export", url_name="export")
+    def export_file(self, request, *args, **kwargs):
+        return self.enqueue("export", request)
+
+
+class MetricsView(APIView):
+    # Scrapers use a static token, not a JWT one.
+    authentication_classes = [SessionAuthentication]
+    permission_classes = [IsAdminUser | HasMetricsToken]
+    renderer_classes = [PrometheusRenderer]
+    swagger_schema = None
+
+    def get(self, request, *args, **kwargs):
+        return Response(render_prometheus(registry.collect()))
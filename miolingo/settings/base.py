@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+from importlib.util import find_spec
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -47,6 +48,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'miolingo.core.middleware.MetricsMiddleware',
+    'miolingo.core.middleware.ServerTimingMiddleware',
+    'miolingo.core.middleware.ReplicaRoutingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
 
     'django.middleware.security.SecurityMiddleware',
@@ -81,6 +85,11 @@ WSGI_APPLICATION = 'miolingo.wsgi.application'
 
 AUTH_USER_MODEL = "core.User"
 
+DATABASE_ROUTERS = [
+    'miolingo.core.routers.ShardRouter',
+    'miolingo.core.routers.ReplicaRouter',
+]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -129,20 +138,41 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Logging
 
-LOGGING = DEFAULT_LOGGING.copy()
+LOGGING = {
+    **DEFAULT_LOGGING,
+    'handlers': {
+        **DEFAULT_LOGGING['handlers'],
+        # Unlike 'console', also when DEBUG is off (request logs, warnings).
+        'miolingo': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        **DEFAULT_LOGGING['loggers'],
+        'miolingo': {
+            'handlers': ['miolingo'],
+            'level': 'INFO',
+        },
+    },
+}
 
 # Rest framework
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'miolingo.core.authentication.CachedJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',  # For swagger UI
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_RENDERER_CLASSES': (  # Remove Browsable API renderer by default for security
-        'rest_framework.renderers.JSONRenderer',
+        'miolingo.core.renderers.FastJSONRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'miolingo.core.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ),
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
@@ -153,6 +183,11 @@ REST_FRAMEWORK = {
     'TEST_REQUEST_DEFAULT_FORMAT': 'json',
 }
 
+# MessagePack is optional.
+if find_spec('msgpack'):  # pragma: no cover
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] += ('miolingo.core.renderers.MessagePackRenderer',)
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'] += ('miolingo.core.parsers.MessagePackParser',)
+
 SWAGGER_SETTINGS = {
     'USE_SESSION_AUTH': True,
     'LOGIN_URL': 'rest_framework:login',
@@ -180,3 +215,80 @@ MIOLINGO_LANGUAGES = (
 )
 
 MIOLINGO_PAGINATION_MAX_PAGE_SIZE = 50
+# Estimated count paginators (PostgreSQL) count exactly below this estimate.
+MIOLINGO_PAGINATION_ESTIMATE_THRESHOLD = 100000
+
+# Log a warning when a request runs more SQL queries than that (0 to disable).
+MIOLINGO_QUERY_BUDGET = 20
+
+# Expose timings of requests with the Server-Timing header to all clients,
+# not only to staff users (and in DEBUG). Timings are logged anyway.
+MIOLINGO_SERVER_TIMING = False
+
+# Bearer token allowed to scrape the /metrics endpoint (staff users can too).
+MIOLINGO_METRICS_TOKEN = None
+# Shared directory to aggregate metrics of multiple worker processes.
+MIOLINGO_METRICS_DIR = None
+# Min delay in seconds between two dumps of a process metrics.
+MIOLINGO_METRICS_FLUSH_INTERVAL = 1
+
+# Cache of lessons and translations read responses, per user data version.
+# The cache must be shared by all the processes (e.g: Redis, not the default
+# local memory), otherwise their versions differ: disabled (0) by default.
+MIOLINGO_RESPONSE_CACHE_ALIAS = 'default'
+MIOLINGO_RESPONSE_CACHE_TIMEOUT = 0  # i.e: 60 * 5
+
+# Authenticated users of JWT are cached, until saved. Like responses, it
+# requires a shared cache: disabled (0) by default.
+MIOLINGO_AUTH_USER_CACHE_TIMEOUT = 0  # i.e: 60
+# Use a stateless user built from the JWT claims for safe methods.
+MIOLINGO_AUTH_STATELESS_READS = False
+
+# Database aliases of read replicas, used by safe methods of the API. Clients
+# which just wrote are marked in a cache shared by all the processes.
+MIOLINGO_REPLICA_DATABASES = []
+# Delay in seconds for a client to read from the primary after a write.
+MIOLINGO_REPLICA_STICKINESS = 10
+
+# Database aliases sharing learner data by user (including 'default' if it
+# should still receive new users). Empty to disable sharding. Learner data do
+# not reference users with a foreign key in the database, even then.
+MIOLINGO_SHARD_DATABASES = []
+
+# Serve the main read routes with native async views (for ASGI deployments).
+MIOLINGO_ASYNC_READS = False
+
+# DeepL API to translate words automatically (autotranslate). The default
+# server depends on the key (free or pro).
+MIOLINGO_DEEPL_AUTH_KEY = None
+MIOLINGO_DEEPL_SERVER_URL = None
+# Texts per request, concurrent requests and max requests per second.
+MIOLINGO_AUTOTRANSLATE_BATCH_SIZE = 50
+MIOLINGO_AUTOTRANSLATE_WORKERS = 4
+MIOLINGO_AUTOTRANSLATE_RATE = 5
+# Max translations translated by a request of the API.
+MIOLINGO_AUTOTRANSLATE_LIMIT = 500
+
+# Background jobs (see runworker command). Failed jobs are retried after a
+# delay in seconds, doubled at each attempt. Running jobs without heartbeat
+# (progress) for longer than the timeout (i.e: lost worker) are claimed again.
+MIOLINGO_JOBS_MAX_ATTEMPTS = 3
+MIOLINGO_JOBS_RETRY_DELAY = 30
+MIOLINGO_JOBS_TIMEOUT = 60 * 60
+MIOLINGO_JOBS_POLL_INTERVAL = 1
+
+# Trainings can draw a deck of words from their lesson, at most this size.
+# Lessons words and weights are cached per user data version, in the response
+# cache which must be shared too: disabled (0) by default.
+MIOLINGO_DECK_MAX_SIZE = 500
+MIOLINGO_DECK_CACHE_TIMEOUT = 0  # i.e: 60 * 60 * 24
+
+# Write-behind buffer of training answers: directory shared by the workers
+# where stats are logged, then inserted by batches of this size, when the
+# training is finished or by the flushstats command. None to insert each one.
+MIOLINGO_STATS_BUFFER_DIR = None
+MIOLINGO_STATS_BUFFER_SIZE = 50
+# Logs older than that are flushed by the flushstats command (seconds), and
+# those claimed by a flush for longer are flushed again (lost worker).
+MIOLINGO_STATS_BUFFER_MAX_AGE = 60
+MIOLINGO_STATS_BUFFER_LOST_AFTER = 60 * 10
@@ -10,6 +10,13 @@ PASSWORD_HASHERS = (
     'django.contrib.auth.hashers.MD5PasswordHasher',
 )
 
+# Keep tests output clean, assertLogs() still captures logs.
+LOGGING['handlers']['miolingo']['class'] = 'logging.NullHandler'
+
+# Cached responses are not rolled back between tests.
+MIOLINGO_RESPONSE_CACHE_TIMEOUT = 0
+MIOLINGO_DECK_CACHE_TIMEOUT = 0
+
 STATIC_ROOT = Path(gettempdir(), 'miolingo', 'static')
 MEDIA_ROOT = Path(gettempdir(), 'miolingo', 'media')
 
@@ -17,3 +24,16 @@ try:
     from .local import *
 except ImportError:  # pragma: no cover
     pass
+
+# Local stand-in of a read replica (a second SQLite file), to exercise the
+# replica router. Only used by tests which require it.
+DATABASES['replica'] = {
+    'ENGINE': 'django.db.backends.sqlite3',
+    'NAME': Path(gettempdir(), 'miolingo', 'replica.sqlite3'),
+}
+
+# Second shard of learner data.
+DATABASES['shard'] = {
+    'ENGINE': 'django.db.backends.sqlite3',
+    'NAME': Path(gettempdir(), 'miolingo', 'shard.sqlite3'),
+}
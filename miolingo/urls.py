@@ -9,8 +9,11 @@ from drf_yasg import openapi
 from drf_yasg.views import get_schema_view
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
+from miolingo.core.async_views import get_async_urls
 from miolingo.core.views import (
+    JobViewset,
     LessonViewset,
+    MetricsView,
     StatViewset,
     TrainingViewset,
     TranslationViewset,
@@ -18,6 +21,7 @@ from miolingo.core.views import (
 )
 
 router = DefaultRouter()
+router.register(r"jobs", JobViewset, basename="jobs")
 router.register(r"lessons", LessonViewset, basename="lessons")
 router.register(r"stats", StatViewset, basename="stats")
 router.register(r"trainings", TrainingViewset, basename="trainings")
@@ -25,6 +29,8 @@ router.register(r"translations", TranslationViewset, basename="translations")
 router.register(r"users", UserViewset, basename="users")
 
 api_urls = router.urls
+if settings.MIOLINGO_ASYNC_READS:  # pragma: no cover
+    api_urls = get_async_urls(router) + api_urls
 api_urls += [
     path("token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
@@ -33,6 +39,7 @@ api_urls += [
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include(api_urls)),
+    path("metrics", MetricsView.as_view(), name="metrics"),
 ]
 
 if settings.DEBUG:  # pragma: no cover